@@ -1,45 +1,79 @@
-"""Analyze execution_report.json for success/failure stats."""
+"""Analyze deployment results for success/failure stats.
+
+  summary                  status and method breakdown (default command)
+  failures [--mod NAME]    failed files with their errors
+
+Reads the deployment table of manifest_index.sqlite; without an index, execution_report.json
+is loaded into a temporary in-memory index instead.
+"""
+import sys
 import json
-from collections import Counter
-
-print("[*] Loading execution report...")
-with open('execution_report.json', 'r', encoding='utf-8') as f:
-    report = json.load(f)
-
-print(f"[+] Total entries: {len(report)}")
-
-# Count by status
-status_counts = Counter(v["status"] for v in report.values())
-print(f"\n=== STATUS SUMMARY ===")
-for status, count in status_counts.items():
-    print(f"  {status}: {count}")
-
-# Count by method (for successful ones)
-method_counts = Counter(v.get("method", "N/A") for v in report.values() if v["status"] == "SUCCESS")
-print(f"\n=== METHOD BREAKDOWN (SUCCESS only) ===")
-for method, count in method_counts.items():
-    print(f"  {method}: {count}")
-
-# Find failures and their reasons
-failures = {k: v for k, v in report.items() if v["status"] == "FAILED"}
-print(f"\n=== FAILURES ({len(failures)} total) ===")
-
-if failures:
-    # Group by error type
-    error_counts = Counter(v["error"] for v in failures.values())
-    print("Error breakdown:")
-    for error, count in error_counts.most_common(10):
-        # Truncate long error messages
-        error_short = error[:100] + "..." if len(error) > 100 else error
-        print(f"  [{count}x] {error_short}")
-    
-    # Show first 10 failed files
-    print("\nFirst 10 failed files:")
-    for i, (path, info) in enumerate(list(failures.items())[:10]):
+import argparse
+from pathlib import Path
+from manifest_db import ManifestDatabase, DB_FILENAME
+
+def open_db(db_path, report_path):
+    if Path(db_path).exists():
+        return ManifestDatabase(db_path)
+    if not Path(report_path).exists():
+        print(f"[!] Neither {db_path} nor {report_path} found.")
+        sys.exit(1)
+
+    print(f"[*] Loading execution report into a temporary index...")
+    with open(report_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    db = ManifestDatabase(":memory:")
+    db.write_report(report)
+    return db
+
+def summary(db):
+    status_counts = db.deployment_counts("status")
+    print(f"[+] Total entries: {sum(count for _, count in status_counts)}")
+
+    print(f"\n=== STATUS SUMMARY ===")
+    for status, count in status_counts:
+        print(f"  {status}: {count}")
+
+    print(f"\n=== METHOD BREAKDOWN (SUCCESS only) ===")
+    for method, count in db.deployment_counts("method", status="SUCCESS"):
+        print(f"  {method or 'N/A'}: {count}")
+
+    error_counts = db.error_counts(10)
+    failed = sum(count for status, count in status_counts if status == "FAILED")
+    print(f"\n=== FAILURES ({failed} total) ===")
+    if error_counts:
+        print("Error breakdown:")
+        for error, count in error_counts:
+            # Truncate long error messages
+            error_short = error[:100] + "..." if len(error) > 100 else error
+            print(f"  [{count}x] {error_short}")
+        failures(db, limit=10)
+    else:
+        print("  No failures! 🎉")
+
+def failures(db, mod=None, limit=10):
+    rows = db.failures(mod=mod, limit=limit)
+    print(f"\nFirst {len(rows)} failed files:")
+    for i, (path, mod_name, error) in enumerate(rows):
         print(f"  {i+1}. {path}")
-        print(f"     Error: {info['error'][:80]}...")
-        print(f"     Mod: {info['mod']}")
-else:
-    print("  No failures! 🎉")
+        print(f"     Error: {error[:80]}...")
+        print(f"     Mod: {mod_name}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze deployment results")
+    parser.add_argument("--db", default=DB_FILENAME, help="Path to manifest_index.sqlite")
+    parser.add_argument("--report", default="execution_report.json", help="Fallback execution report")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("summary", help="Status and method breakdown")
+    p_fail = sub.add_parser("failures", help="List failed files")
+    p_fail.add_argument("--mod", help="Only failures of this mod")
+    p_fail.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    with open_db(args.db, args.report) as db:
+        if args.command == "failures":
+            failures(db, mod=args.mod, limit=args.limit)
+        else:
+            summary(db)
 
-print("\n[SUCCESS] Analysis complete!")
+    print("\n[SUCCESS] Analysis complete!")
@@ -1,8 +1,12 @@
 import os
 import shutil
+import subprocess
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
+from deploy_state import DeployState, state_path_for, remove_tracked
+from trash_bin import move_contents_to_trash, remove_tree
+from snapshot_backup import SnapshotStore, restore_tree
 
 class CleanerEngine:
     def __init__(self, sa_path, mo2_path, steam_path=None, docs_name="Skyrim Special Edition", appdata_name="Skyrim Special Edition", game_name="Skyrim SE", profile_name="Default", portable_mode=True):
@@ -65,38 +69,162 @@ class CleanerEngine:
 
     def restore_profiles(self):
         print("\n[*] Attempting to restore original Windows profiles...")
-        
+
+        # Backups are snapshots (snapshot_backup); only files that differ are copied back.
+        # Backups made before snapshots: INIs in the backup root (or Documents), AppData beside them.
+        store = SnapshotStore(self.backup_root)
+        doc_backup = store.latest("Documents")
+        doc_backup = doc_backup / "Documents" if doc_backup else self.backup_root / "Documents"
+        if not doc_backup.exists() and any(self.backup_root.glob("*.ini")):
+            doc_backup = self.backup_root
+        # AppData is restored from the first backup ever made: later ones hold what the tool deployed
+        app_backup = self.backup_root / "AppData"
+        if not app_backup.exists() and store.pinned("AppData"):
+            app_backup = store.pinned("AppData") / "AppData"
+
         # Restore Documents (Only INI files, keep Saves untouched)
-        doc_backup = self.backup_root / "Documents"
         if doc_backup.exists():
             print("    -> Restoring original INI files...")
             for ini in doc_backup.iterdir():
-                if ini.is_file():
+                if ini.is_file() and ini.suffix.lower() == ".ini":
                     dst = self.win_docs / ini.name
+                    if dst.exists() and dst.stat().st_size == ini.stat().st_size and dst.stat().st_mtime_ns == ini.stat().st_mtime_ns:
+                        continue
                     shutil.copy2(ini, dst)
                     print(f"       [Restored] {ini.name}")
-            
+
         # Restore AppData
-        app_backup = self.backup_root / "AppData"
         if app_backup.exists():
-            if self.win_appdata.exists():
-                shutil.rmtree(self.win_appdata)
-            shutil.copytree(app_backup, self.win_appdata)
-            print("[SUCCESS] Original AppData/Plugins data restored.")
+            copied, unchanged, deleted = restore_tree(app_backup, self.win_appdata, mirror=True)
+            print(f"[SUCCESS] Original AppData/Plugins data restored ({copied} copied, {unchanged} unchanged, {deleted} removed).")
 
         if not doc_backup.exists() and not app_backup.exists():
             print("[!] No backup found to restore. Skipping...")
 
-    def total_cleanup(self):
+    def restore_hijacked_executables(self):
+        """Undoes the executable hijack: removes the wrappers and renames '_X_original.exe' back to 'X.exe'."""
+        restored = 0
+        for original in self.sa_path.glob("_*_original.exe"):
+            exe_stem = original.name[1:-len("_original.exe")]
+            try:
+                for wrapper in (f"{exe_stem}.exe", f"{exe_stem}.bat", f"Wrapper_{exe_stem}.py"):
+                    wrapper_path = self.sa_path / wrapper
+                    if wrapper_path.exists():
+                        wrapper_path.unlink()
+                restored_path = self.sa_path / f"{exe_stem}.exe"
+                original.rename(restored_path)
+                try:
+                    subprocess.run(['attrib', '-h', str(restored_path)], check=True)
+                except: pass
+                print(f"  [Restored] {restored_path.name}")
+                restored += 1
+            except Exception as e:
+                print(f"  [Failed] {original.name}: {e}")
+        return restored
+
+    def incremental_cleanup(self):
+        """Prepares the standalone folder for an incremental rebuild.
+
+        Deployed game and mod files stay in place. Only what the build adds on top is reset:
+        hijacked executables are restored and the portable '_profile' folder is removed.
+        """
+        print(f"\n[*] PREPARING STANDALONE DIRECTORY FOR INCREMENTAL REBUILD: {self.sa_path}")
+        self.restore_hijacked_executables()
+
+        profile_dir = self.sa_path / "_profile"
+        if profile_dir.exists():
+            try:
+                shutil.rmtree(profile_dir)
+                print(f"  [Deleted] {profile_dir.name}")
+            except Exception as e:
+                print(f"  [Failed] {profile_dir.name}: {e}")
+
+        print(f"\n[CLEAN] Deployed files kept; hijack and profile reset.")
+
+    def tracked_cleanup(self):
+        """Deletes only what the builds put into the standalone folder, using the deploy state index.
+
+        Tracked game and mod files and directory links are removed (links are unlinked, never
+        followed), then the build's own files (_profile, metadata, launch files) and the folders
+        that became empty. Files added by hand stay. Returns False if the folder has no index.
+        """
+        state_file = state_path_for(self.sa_path)
+        if not state_file.exists():
+            print("[!] No deploy state index found in this standalone folder.")
+            return False
+        print(f"\n[*] REMOVING TRACKED BUILD FILES FROM: {self.sa_path}")
+        self.restore_hijacked_executables()
+
+        with DeployState(state_file) as state:
+            tracked = state.tracked()
+        removed = failed = 0
+        folders = set()
+        for target_rel_path, origin, method in tracked:
+            target = self.sa_path / target_rel_path
+            try:
+                if remove_tracked(target, method):
+                    removed += 1
+                folders.add(target.parent)
+            except Exception as e:
+                failed += 1
+                print(f"  [Failed] {target_rel_path}: {e}")
+        print(f"  [Deleted] {removed} of {len(tracked)} tracked files and links")
+
+        for name in ("_profile", "How to Launch.txt", "steam_appid.txt", "standalone_metadata"):
+            item = self.sa_path / name
+            try:
+                if item.is_dir() and not item.is_symlink():
+                    shutil.rmtree(item)
+                elif item.exists():
+                    item.unlink()
+                else:
+                    continue
+                print(f"  [Deleted] {name}")
+            except Exception as e:
+                failed += 1
+                print(f"  [Failed] {name}: {e}")
+
+        # Deepest first, so parents empty out before they are tried
+        for folder in sorted(folders, key=lambda f: len(f.parts), reverse=True):
+            while folder != self.sa_path and self.sa_path in folder.parents:
+                try:
+                    folder.rmdir()
+                except OSError:
+                    break
+                folder = folder.parent
+
+        if failed:
+            print(f"\n[CLEAN] Build files removed, {failed} could not be deleted. Files you added were kept.")
+        else:
+            print(f"\n[CLEAN] Build files removed. Files you added were kept.")
+        return True
+
+    def total_cleanup(self, background=False):
+        """Empties the standalone folder.
+
+        With background, everything is first moved to a sibling trash folder (instant on the same
+        drive), so the folder is empty right away; the trash is deleted by a background thread.
+        """
         print(f"\n[*] CLEANING STANDALONE DIRECTORY: {self.sa_path}")
-        
+        if background:
+            moved, failed = move_contents_to_trash(self.sa_path)
+            for item in failed:
+                print(f"  [Failed] {item}")
+            print(f"  [Trash] {moved} items moved out, deleting them in the background")
+            if not failed:
+                print(f"\n[CLEAN] Standalone folder is now 100% clean (Absolute Fresh Start).")
+                return
+            print("[*] Deleting what could not be moved...")
+
         # Absolute Wipe (Safety is now handled at path selection in main script)
         for item in self.sa_path.iterdir():
             try:
                 if item.is_file() or item.is_symlink():
                     item.unlink()
                 elif item.is_dir():
-                    shutil.rmtree(item)
+                    errors = remove_tree(item)
+                    if errors:
+                        raise OSError(f"{len(errors)} items could not be deleted (first: {errors[0]})")
                 print(f"  [Deleted] {item.name}")
             except Exception as e:
                 print(f"  [Failed] {item.name}: {e}")
@@ -0,0 +1,76 @@
+"""Mod-to-mod conflict graph built from a scan.
+
+An edge (winner -> loser) counts the files the loser provides that ship from the winner,
+and the bytes of the loser's copies that are hidden that way. Mods that provide files but
+win none of them, and mods that provide no deployable files at all, are listed as dead weight.
+"""
+import json
+
+CONFLICT_GRAPH_FILENAME = "conflict_graph.json"
+
+def build_conflict_graph(manifest, conflicts):
+    """Returns the graph as a JSON-ready dict.
+
+    manifest: CompactManifest of the winners, conflicts: target -> [(losing mod, size_bytes)].
+    A size of None means the loser was not statted (winner-first scan); its bytes are not counted.
+    """
+    wins = [0] * len(manifest.mod_names)
+    win_bytes = [0] * len(manifest.mod_names)
+    for entry in manifest.entries.values():
+        wins[entry.mod] += 1
+        win_bytes[entry.mod] += entry.size_bytes
+
+    edges = {}     # (winner, loser) -> [files, bytes]
+    lost = {}      # loser -> [files, bytes]
+    bytes_complete = True
+    for target, losers in conflicts.items():
+        winner = manifest.mod_names[manifest.entries[target].mod]
+        for loser, size_bytes in losers:
+            if size_bytes is None:
+                bytes_complete = False
+                size_bytes = 0
+            edge = edges.setdefault((winner, loser), [0, 0])
+            edge[0] += 1
+            edge[1] += size_bytes
+            total = lost.setdefault(loser, [0, 0])
+            total[0] += 1
+            total[1] += size_bytes
+
+    hidden_mods = []
+    empty_mods = []
+    for index, mod_name in enumerate(manifest.mod_names):
+        if wins[index]:
+            continue
+        if mod_name not in lost:
+            empty_mods.append(mod_name)
+            continue
+        hidden_by = sorted(((w, e[0]) for (w, l), e in edges.items() if l == mod_name), key=lambda item: -item[1])
+        hidden_mods.append({
+            "mod": mod_name,
+            "files": lost[mod_name][0],
+            "bytes": lost[mod_name][1],
+            "hidden_by": [w for w, _ in hidden_by]
+        })
+
+    return {
+        "bytes_complete": bytes_complete,
+        "mods": {
+            name: {"winning_files": wins[i], "winning_bytes": win_bytes[i],
+                   "lost_files": lost.get(name, [0, 0])[0], "lost_bytes": lost.get(name, [0, 0])[1]}
+            for i, name in enumerate(manifest.mod_names)
+        },
+        "edges": [
+            {"winner": winner, "loser": loser, "files": files, "bytes": size}
+            for (winner, loser), (files, size) in sorted(edges.items(), key=lambda item: (-item[1][0], item[0]))
+        ],
+        "hidden_mods": sorted(hidden_mods, key=lambda m: -m["files"]),
+        "empty_mods": empty_mods
+    }
+
+def write_conflict_graph(path, graph):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(graph, f, indent=4)
+
+def load_conflict_graph(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,211 @@
+"""Parallel, zero-copy file copier for cross-drive deployments.
+
+Copies use os.copy_file_range (kernel-side, may share extents) or os.sendfile where the platform
+has them, and large readinto() buffers elsewhere (Windows). Work runs in two bounded lanes: many
+threads for small files, where per-file latency dominates, and a few for large files, where
+more parallel streams only make the disks seek. Progress is reported in bytes. Optionally a
+content hash is computed from the copied data itself, so nothing has to be read twice.
+"""
+import os
+import sys
+import errno
+import shutil
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+
+# Files of at least this size go to the large-file lane
+LARGE_FILE_BYTES = 16 * 1024 * 1024
+
+# Bytes per copy_file_range/sendfile call and size of the read buffer
+COPY_BUFFER_BYTES = 8 * 1024 * 1024
+
+DEFAULT_SMALL_COPY_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_LARGE_COPY_WORKERS = 4
+
+# Small files per lane task, so hundreds of thousands of files do not become as many futures
+SMALL_FILES_PER_TASK = 64
+
+# Kernel copy errors after which the next method is tried (cross-filesystem, unsupported)
+_ZERO_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL}
+
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+_HAS_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+class TaskStop:
+    """Stop signal for pool tasks that also knows when none of them is running any more.
+
+    Tasks run inside 'with stop:' and check is_set() between files. After an interrupt, set()
+    plus wait_idle() ends the running ones, even those of a worker thread whose start the
+    interrupt cut short (the pool's own shutdown does not know those threads).
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._idle = threading.Condition()
+        self._running = 0
+
+    def set(self):
+        self._event.set()
+
+    def clear(self):
+        self._event.clear()
+
+    def is_set(self):
+        return self._event.is_set()
+
+    def __enter__(self):
+        with self._idle:
+            self._running += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._idle:
+            self._running -= 1
+            self._idle.notify_all()
+
+    def wait_idle(self):
+        with self._idle:
+            while self._running:
+                self._idle.wait()
+
+class CopyEngine:
+    def __init__(self, small_workers=DEFAULT_SMALL_COPY_WORKERS, large_workers=DEFAULT_LARGE_COPY_WORKERS,
+                 large_file_bytes=LARGE_FILE_BYTES, hash_algo=None):
+        """hash_algo: a hashlib name ('sha1', 'blake2b', ...) to hash every copied file, or None."""
+        if hash_algo:
+            hashlib.new(hash_algo)  # Fail early on an unknown algorithm
+        self.small_workers = max(small_workers, 1)
+        self.large_workers = max(large_workers, 1)
+        self.large_file_bytes = large_file_bytes
+        self.hash_algo = hash_algo
+        self.digests = {}        # target path -> hex digest (only with hash_algo)
+        self._pbar = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = TaskStop()  # set when map is interrupted: lane tasks stop after their current file
+
+    def _advance(self, n):
+        self._local.done = getattr(self._local, "done", 0) + n
+        if self._pbar is not None:
+            with self._lock:
+                self._pbar.update(n)
+
+    def copy_file(self, source, target):
+        """Copies content and metadata like shutil.copy2. Returns the content digest (or None)."""
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            if self.hash_algo:
+                digest = self._copy_buffered(src, dst, hashlib.new(self.hash_algo))
+            else:
+                digest = None
+                self._copy_zero(src, dst)
+        shutil.copystat(source, target)
+        if digest is not None:
+            self.digests[str(target)] = digest
+        return digest
+
+    def _copy_zero(self, src, dst):
+        """Kernel-side copy; falls back method by method while nothing has been written yet."""
+        infd, outfd = src.fileno(), dst.fileno()
+        if _HAS_COPY_FILE_RANGE:
+            copied = 0
+            try:
+                while True:
+                    n = os.copy_file_range(infd, outfd, COPY_BUFFER_BYTES)
+                    if n == 0:
+                        return
+                    copied += n
+                    self._advance(n)
+            except OSError as e:
+                if copied or e.errno not in _ZERO_COPY_FALLBACK_ERRNOS:
+                    raise
+        if _HAS_SENDFILE:
+            offset = 0
+            try:
+                while True:
+                    n = os.sendfile(outfd, infd, offset, COPY_BUFFER_BYTES)
+                    if n == 0:
+                        return
+                    offset += n
+                    self._advance(n)
+            except OSError as e:
+                if offset or e.errno not in _ZERO_COPY_FALLBACK_ERRNOS:
+                    raise
+        self._copy_buffered(src, dst, None)
+
+    def _copy_buffered(self, src, dst, hasher):
+        buf = bytearray(COPY_BUFFER_BYTES)
+        view = memoryview(buf)
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            chunk = view[:n]
+            if hasher is not None:
+                hasher.update(chunk)
+            dst.write(chunk)
+            self._advance(n)
+        return hasher.hexdigest() if hasher is not None else None
+
+    def _run_items(self, func, items, done):
+        """Lane task: func(item) for every (size_bytes, item), appending each result to done.
+
+        Bytes not reported while copying are added after each file. Stops early once map was interrupted.
+        """
+        with self._stop:
+            for size_bytes, item in items:
+                if self._stop.is_set():
+                    break
+                self._local.done = 0
+                done.append(func(item))
+                remaining = (size_bytes or 0) - self._local.done
+                if remaining > 0:
+                    self._advance(remaining)
+
+    def map(self, func, items, desc="Copying"):
+        """Runs func(item) for (size_bytes, item) pairs in the small/large lanes.
+
+        Yields func's results as they complete. func should copy through copy_file so that
+        progress advances while large files are copied. When the caller is interrupted (Ctrl+C),
+        queued tasks are dropped and running ones stop after their current file; the results of
+        everything that did complete are still yielded before the exception is raised again.
+        """
+        small = [pair for pair in items if (pair[0] or 0) < self.large_file_bytes]
+        large = [pair for pair in items if (pair[0] or 0) >= self.large_file_bytes]
+        total = sum(size_bytes or 0 for size_bytes, _ in items)
+        done = deque()  # results in completion order (deque appends are thread-safe)
+
+        with ThreadPoolExecutor(max_workers=self.small_workers) as small_pool, \
+                ThreadPoolExecutor(max_workers=self.large_workers) as large_pool, \
+                tqdm(total=total, desc=desc, unit="B", unit_scale=True, unit_divisor=1024, smoothing=0.1, dynamic_ncols=True, leave=False) as pbar:
+            self._pbar = pbar
+            self._stop.clear()
+            futures = []
+            try:
+                # Largest files first, so the big lane does not end with one straggler
+                for pair in sorted(large, key=lambda p: -p[0]):
+                    futures.append(large_pool.submit(self._run_items, func, [pair], done))
+                for i in range(0, len(small), SMALL_FILES_PER_TASK):
+                    futures.append(small_pool.submit(self._run_items, func, small[i:i + SMALL_FILES_PER_TASK], done))
+                for future in as_completed(futures):
+                    future.result()
+                    while done:
+                        yield done.popleft()
+            except GeneratorExit:
+                # The caller stopped reading (its own loop was interrupted): drop the queued work
+                self._stop.set()
+                for pool in (small_pool, large_pool):
+                    pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            except BaseException:
+                # Leaving the with-block would otherwise run every queued copy to completion
+                self._stop.set()
+                for pool in (small_pool, large_pool):
+                    pool.shutdown(wait=False, cancel_futures=True)
+                self._stop.wait_idle()
+                while done:
+                    yield done.popleft()
+                raise
+            finally:
+                self._pbar = None
@@ -0,0 +1,96 @@
+"""Write-ahead journal of a running deployment, so an interrupted deploy can be resumed.
+
+Every completed file operation is appended to deploy_journal.ndjson (next to the execution
+report) as one JSON line: [target, source, size_bytes, st_mtime_ns, method, fallback]. Lines are
+written in batches and flushed to disk per batch, so a crash loses at most the batch in flight.
+A finished deployment deletes its journal.
+
+A resumed run trusts a journaled target only while it still exists and the manifest still maps
+it to the same source, size and mtime. Everything else, including the operation that was in
+flight, is done again.
+"""
+import os
+import json
+import time
+
+JOURNAL_FILENAME = "deploy_journal.ndjson"
+JOURNAL_VERSION = 1
+
+# Completed operations per flush (write + fsync); slow copies are flushed at least this often
+JOURNAL_FLUSH_RECORDS = 256
+JOURNAL_FLUSH_SECONDS = 2.0
+
+class DeployJournal:
+    def __init__(self, path, standalone_path):
+        self.path = str(path)
+        self.standalone_path = str(standalone_path)
+        self._file = None
+        self._pending = []
+        self._last_sync = 0.0
+
+    def load(self):
+        """{target: [source, size_bytes, st_mtime_ns, method, fallback]} of the journal on disk.
+
+        Empty if there is none or it belongs to another folder. A torn last line (the crash
+        happened while writing it) is ignored.
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return records
+            if header.get("journal") != JOURNAL_VERSION or header.get("standalone") != self.standalone_path:
+                print(f"[!] Ignoring a deploy journal of another folder: {self.path}")
+                return records
+            for line in f:
+                try:
+                    target, *record = json.loads(line)
+                except ValueError:
+                    break
+                records[target] = record
+        return records
+
+    def open(self, records=None):
+        """Starts the journal, keeping the given records of an interrupted run (rewritten without a torn tail)."""
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({"journal": JOURNAL_VERSION, "standalone": self.standalone_path}) + "\n")
+        for target, record in (records or {}).items():
+            self._file.write(json.dumps([target, *record]) + "\n")
+        self._sync()
+
+    def add(self, target, source, size_bytes, st_mtime_ns, method, fallback=None):
+        """Records one completed operation (main thread only); flushes per JOURNAL_FLUSH_RECORDS or JOURNAL_FLUSH_SECONDS."""
+        self._pending.append(json.dumps([target, source, size_bytes, st_mtime_ns, method, fallback]))
+        if len(self._pending) >= JOURNAL_FLUSH_RECORDS or time.monotonic() - self._last_sync >= JOURNAL_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._file is None or not self._pending:
+            return
+        self._file.write("\n".join(self._pending) + "\n")
+        self._pending = []
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Flushes what is pending and closes the file; the journal stays for a resume."""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """Closes and deletes the journal of a deployment that completed."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,93 @@
+"""Persistent index of the files the deployments created in a Standalone folder.
+
+deploy_state.sqlite (in the build's standalone_metadata) has one row per file the linker placed
+and per directory link, with its origin ('vanilla' or 'mod'), mod and method. Rows only change
+together with the files: deployed targets are added, removed targets are deleted. Orphans
+(tracked targets that left the plan) are therefore found with a query instead of walking the
+tree, and files the tool never created are never candidates for deletion.
+"""
+import os
+import sqlite3
+from pathlib import Path
+
+STATE_FILENAME = "deploy_state.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked (
+    target TEXT PRIMARY KEY,
+    origin TEXT NOT NULL,
+    mod TEXT,
+    method TEXT NOT NULL
+);
+"""
+
+def state_path_for(standalone_path):
+    """Location of the state index of a Standalone folder."""
+    return Path(standalone_path) / "standalone_metadata" / STATE_FILENAME
+
+def remove_tracked(path, method):
+    """Deletes one tracked target: a file or file link, or the directory link itself (never what it points to).
+
+    A real folder found where a file was tracked is left alone. Returns True if something was deleted.
+    """
+    if os.path.islink(path) or (method != "dirlink" and os.path.isfile(path)):
+        os.unlink(path)
+        return True
+    return False
+
+class DeployState:
+    def __init__(self, db_path):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM tracked").fetchone()[0]
+
+    def track(self, rows):
+        """Adds or updates (target, origin, mod, method) rows. Method 'unchanged' keeps the recorded method."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO tracked (target, origin, mod, method) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(target) DO UPDATE SET origin = excluded.origin, mod = excluded.mod, "
+                "method = CASE WHEN excluded.method = 'unchanged' THEN tracked.method ELSE excluded.method END",
+                rows
+            )
+
+    def untrack(self, targets):
+        with self.conn:
+            self.conn.executemany("DELETE FROM tracked WHERE target = ?", ((target,) for target in targets))
+
+    def tracked(self):
+        """[(target, origin, method)] of every tracked file and directory link."""
+        return self.conn.execute("SELECT target, origin, method FROM tracked").fetchall()
+
+    def orphans(self, plan_targets, origins=None):
+        """Tracked rows whose target is not in plan_targets (compared with os.path.normcase, like the linker).
+
+        A directory link stays while the plan still has files below its folder. origins limits the
+        result to rows of those origins (e.g. ('mod',) to leave vanilla files alone).
+        """
+        plan = set()
+        folders = set()
+        for target in plan_targets:
+            target = os.path.normcase(target)
+            plan.add(target)
+            pos = target.rfind("/")
+            while pos != -1 and target[:pos] not in folders:
+                folders.add(target[:pos])
+                pos = target.rfind("/", 0, pos)
+        return [
+            (target, origin, method) for target, origin, method in self.tracked()
+            if os.path.normcase(target) not in (folders if method == "dirlink" else plan)
+            and (origins is None or origin in origins)
+        ]
@@ -0,0 +1,128 @@
+"""Single-provider subtrees that can be deployed as one directory symlink.
+
+The manifest targets are arranged into a path trie (case-insensitive, like the game sees them).
+A target folder qualifies when every file below it comes from one mod, the files sit in the
+same relative layout inside one source folder, and that source folder holds nothing else: no
+files excluded by the scan rules, no overridden files, no empty folders. The last condition
+is checked against the disk, since a directory link exposes the source folder as it is. Only
+the highest qualifying folder of a subtree is listed.
+"""
+import os
+import json
+
+DIR_LINKS_FILENAME = "dir_links.json"
+
+# Folders closer to the game root than 'Data/<type>/<name>' are shared by too many tools to be linked
+MIN_LINK_DEPTH = 3
+
+class _Node:
+    __slots__ = ("name", "children", "files", "mod", "source_dir", "count")
+
+    def __init__(self, name):
+        self.name = name          # original case of the first target seen
+        self.children = {}        # lower name -> _Node
+        self.files = {}           # lower file name -> ManifestEntry
+        self.mod = None
+        self.source_dir = None
+        self.count = 0
+
+def _build_trie(manifest):
+    root = _Node("")
+    for target, entry in manifest.entries.items():
+        parts = target.split("/")
+        node = root
+        for part in parts[:-1]:
+            lower = part.lower()
+            child = node.children.get(lower)
+            if child is None:
+                child = node.children[lower] = _Node(part)
+            node = child
+        node.files[parts[-1].lower()] = entry
+    return root
+
+def _resolve(node, manifest):
+    """Post-order: sets mod/source_dir when the whole subtree is one mod in one source layout (-1 otherwise)."""
+    mods = set()
+    source_dirs = set()
+    node.count = len(node.files)
+    for entry in node.files.values():
+        mods.add(entry.mod if not entry.is_root else -1)
+        rel_dir, _, _ = entry.rel_source.rpartition("/")
+        source_dirs.add(f"{manifest.mod_roots[entry.mod]}/{rel_dir}".rstrip("/") if manifest.mod_roots[entry.mod] else None)
+    for lower, child in node.children.items():
+        _resolve(child, manifest)
+        node.count += child.count
+        mods.add(child.mod)
+        parent, _, name = (child.source_dir or "").rpartition("/")
+        # The child's source folder must be a sub-folder of ours with the same (case-insensitive) name
+        source_dirs.add(parent if child.source_dir and name.lower() == lower else None)
+    if len(mods) == 1 and -1 not in mods and len(source_dirs) == 1 and None not in source_dirs:
+        node.mod = mods.pop()
+        node.source_dir = source_dirs.pop()
+    else:
+        node.mod = -1
+
+def _matches_disk(node, source_dir, found, depth, path):
+    """True when source_dir holds exactly the node's subtree. Clean sub-folders deep enough are collected in found."""
+    try:
+        with os.scandir(source_dir) as it:
+            listing = list(it)
+    except OSError:
+        return False
+
+    clean = True
+    seen_dirs = set()
+    for e in listing:
+        lower = e.name.lower()
+        if e.is_symlink():
+            clean = False
+        elif e.is_dir():
+            if lower not in node.children:
+                clean = False
+            seen_dirs.add(lower)
+        elif lower not in node.files:
+            clean = False
+    if len(listing) != len(node.files) + len(node.children) or len(seen_dirs) != len(node.children):
+        clean = False
+
+    clean_children = []
+    for lower, child in node.children.items():
+        child_path = f"{path}/{child.name}"
+        if child.mod != -1 and _matches_disk(child, child.source_dir, found, depth + 1, child_path):
+            clean_children.append((child_path, child))
+        else:
+            clean = False
+    if not clean:
+        for child_path, child in clean_children:
+            if depth + 1 >= MIN_LINK_DEPTH:
+                found.append((child_path, child))
+    return clean
+
+def _collect(node, depth, path, found):
+    """Finds the highest single-provider folders at MIN_LINK_DEPTH or deeper and verifies them on disk."""
+    for lower, child in node.children.items():
+        child_path = f"{path}/{child.name}" if path else child.name
+        if child.mod != -1 and depth + 1 >= MIN_LINK_DEPTH:
+            if _matches_disk(child, child.source_dir, found, depth + 1, child_path):
+                found.append((child_path, child))
+        else:
+            _collect(child, depth + 1, child_path, found)
+
+def find_dir_links(manifest):
+    """Returns [{target, source, mod, files}] for the folders that can be linked as a whole."""
+    root = _build_trie(manifest)
+    _resolve(root, manifest)
+    found = []
+    _collect(root, 0, "", found)
+    return sorted(
+        ({"target": target, "source": node.source_dir, "mod": manifest.mod_names[node.mod], "files": node.count} for target, node in found),
+        key=lambda item: item["target"].lower()
+    )
+
+def write_dir_links(path, links):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(links, f, indent=4)
+
+def load_dir_links(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,234 @@
+"""Device-aware choice between reflinking, hardlinking and copying deployed files.
+
+Hardlinks only work when source and target live on the same filesystem. Instead of guessing
+from drive letters, sources are grouped by st_dev and every (source device -> target device)
+pair is probed once by linking one real source file next to the target; the answer is cached.
+A link that still fails with EXDEV, EPERM or EMLINK during deployment falls back to a copy for
+that file. Decisions and fallback counts are written to link_strategy.json next to the
+execution report.
+
+In reflink mode (Linux, btrfs/XFS) files are cloned with the FICLONE ioctl instead: the clone
+shares the source's extents like a hardlink (no extra space, near-link speed), but writes to
+the standalone copy never reach the MO2 mod file. Devices that cannot clone fall back to
+hardlinks, then copies.
+
+Devices that cannot hardlink are copied by default; with cross_device="symlink" their files
+become file symlinks to the MO2 sources instead (no extra space, one operation per file). The
+optional small-file policy still copies small and config-like files, which tools tend to edit
+in place and which cost next to nothing to copy.
+"""
+import os
+import sys
+import json
+import errno
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LINK_STRATEGY_FILENAME = "link_strategy.json"
+
+# Link errors that mean "this cannot be a hardlink", not "this file is broken"
+FALLBACK_ERRNOS = {errno.EXDEV: "EXDEV", errno.EPERM: "EPERM", errno.EMLINK: "EMLINK"}
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+REFLINK_SUPPORTED = fcntl is not None and sys.platform.startswith("linux")
+
+# Clone errors that mean "this filesystem pair cannot share extents"
+REFLINK_FALLBACK_ERRNOS = {errno.EOPNOTSUPP: "EOPNOTSUPP", errno.ENOTTY: "ENOTTY", errno.EINVAL: "EINVAL",
+                           errno.EXDEV: "EXDEV", errno.EPERM: "EPERM", errno.ENOSYS: "ENOSYS"}
+
+# Small-file policy of the symlink mode: files up to this size, or with these extensions, are copied
+SYMLINK_COPY_MAX_BYTES = 64 * 1024
+SYMLINK_COPY_EXTENSIONS = ('.ini', '.json', '.toml', '.yaml', '.yml', '.cfg', '.txt', '.xml', '.exe', '.dll')
+
+def remove_existing(target):
+    """Removes whatever occupies a target path, so nothing is ever written through an old hardlink."""
+    if os.path.isdir(target) and not os.path.islink(target):
+        shutil.rmtree(target)
+    else:
+        os.remove(target)
+
+def reflink(source, target):
+    """Clones source to a new target file sharing its extents, keeping the source's timestamps."""
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, target)
+
+def device_of(path):
+    """st_dev of a path, or None when it cannot be statted."""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+class LinkStrategy:
+    def __init__(self, target_root, link_mode="hardlink", copy_file=shutil.copy2, cross_device="copy", copy_small_files=False, layer="mods"):
+        """link_mode: 'hardlink' (hardlink, else copy) or 'reflink' (reflink, else hardlink, else copy).
+
+        copy_file(source, target) performs copies (CopyEngine.copy_file for the parallel deploy).
+        cross_device: 'copy' or 'symlink' for devices that cannot hardlink; copy_small_files
+        applies the small/config-file copy policy to symlinked devices. layer ('mods' or
+        'vanilla') labels the decisions in the summary.
+        """
+        if link_mode == "reflink" and not REFLINK_SUPPORTED:
+            print("[!] Reflinks are not supported on this platform, using hardlinks.")
+            link_mode = "hardlink"
+        self.link_mode = link_mode
+        self.copy_file = copy_file
+        self.cross_device = cross_device
+        self.copy_small_files = copy_small_files
+        self.layer = layer
+        self.target_root = str(target_root)
+        self.target_dev = device_of(self.target_root)
+        # source st_dev -> {"method", "reason", "probe", "files", "fallbacks", "policy_copies"}
+        self.decisions = {}
+
+    def method_for(self, source, src_dev, size_bytes=None):
+        """'reflink', 'hardlink', 'symlink' or 'copy' for a file on src_dev; the first call per device probes with source."""
+        decision = self.decisions.get(src_dev)
+        if decision is None:
+            reasons = []
+            method = None
+            if self.link_mode == "reflink":
+                works, reason = self._probe(reflink, source, REFLINK_FALLBACK_ERRNOS)
+                if works is None:
+                    # The probe file itself is unusable; decide on the next file of this device
+                    return "reflink"
+                if works:
+                    method = "reflink"
+                else:
+                    reasons.append(f"no reflink: {reason}")
+            if method is None:
+                works, reason = self._probe(os.link, source, FALLBACK_ERRNOS)
+                if works is None:
+                    return "hardlink"
+                if works:
+                    method = "hardlink"
+                else:
+                    method = "copy"
+                    reasons.append(f"no hardlink: {reason}")
+                    if self.cross_device == "symlink":
+                        works, reason = self._probe(os.symlink, source, None)
+                        if works:
+                            method = "symlink"
+                        else:
+                            reasons.append(f"no symlink: {reason}")
+            decision = self.decisions[src_dev] = {"method": method, "reason": ", ".join(reasons) or None,
+                                                  "probe": source, "files": 0, "fallbacks": 0, "policy_copies": 0}
+        if decision["method"] == "symlink" and self.copy_small_files and \
+                ((size_bytes or 0) <= SYMLINK_COPY_MAX_BYTES or os.path.splitext(source)[1].lower() in SYMLINK_COPY_EXTENSIONS):
+            return "copy"
+        return decision["method"]
+
+    def _probe(self, make, source, fallback_errnos):
+        """Links/clones source next to the target root once.
+
+        Returns (works, reason); works is None when the attempt failed for an unrelated reason.
+        fallback_errnos None means every error except a missing source counts as "cannot".
+        """
+        probe = os.path.join(self.target_root, f".link_probe_{os.getpid()}")
+        try:
+            if os.path.lexists(probe):
+                os.remove(probe)
+            make(source, probe)
+            return True, None
+        except OSError as e:
+            if fallback_errnos is None and not isinstance(e, FileNotFoundError):
+                return False, errno.errorcode.get(e.errno, str(e))
+            if fallback_errnos and e.errno in fallback_errnos:
+                return False, fallback_errnos[e.errno]
+            return None, None
+        finally:
+            try:
+                if os.path.lexists(probe):
+                    os.remove(probe)
+            except OSError:
+                pass
+
+    def place(self, source, target, method):
+        """Reflinks, hardlinks, symlinks or copies one file, replacing an existing target.
+
+        Returns (method used, fallback reason or None). A hardlink refused with EXDEV/EPERM/EMLINK,
+        a clone the filesystem refuses or a failed symlink is copied instead.
+        """
+        fallback = None
+        if method == "symlink":
+            if os.path.lexists(target):
+                remove_existing(target)
+            try:
+                os.symlink(source, target)
+                return "symlink", None
+            except FileNotFoundError:
+                raise
+            except OSError as e:
+                fallback = errno.errorcode.get(e.errno, "symlink failed")
+        elif method == "reflink":
+            if os.path.lexists(target):
+                remove_existing(target)
+            try:
+                reflink(source, target)
+                return "reflink", None
+            except OSError as e:
+                if e.errno not in REFLINK_FALLBACK_ERRNOS:
+                    raise
+                fallback = REFLINK_FALLBACK_ERRNOS[e.errno]
+        elif method == "hardlink":
+            try:
+                try:
+                    os.link(source, target)
+                except FileExistsError:
+                    remove_existing(target)
+                    os.link(source, target)
+                return "hardlink", None
+            except OSError as e:
+                if e.errno not in FALLBACK_ERRNOS:
+                    raise
+                fallback = FALLBACK_ERRNOS[e.errno]
+
+        if os.path.lexists(target):
+            remove_existing(target)
+        self.copy_file(source, target)
+        return "copy", fallback
+
+    def record(self, src_dev, fallback=None, method=None):
+        """Counts one deployed file of a device (called from the main thread only)."""
+        decision = self.decisions.get(src_dev)
+        if decision is None:
+            return
+        decision["files"] += 1
+        if fallback:
+            decision["fallbacks"] += 1
+        elif decision["method"] == "symlink" and method == "copy":
+            decision["policy_copies"] += 1
+
+    def summary(self):
+        """JSON-ready list of the per-device decisions."""
+        return [
+            {"layer": self.layer, "source_device": src_dev, "target_device": self.target_dev, **decision}
+            for src_dev, decision in self.decisions.items()
+        ]
+
+    def print_summary(self):
+        for item in self.summary():
+            reason = f" ({item['reason']})" if item["reason"] else ""
+            fallbacks = f", {item['fallbacks']} fell back to copy" if item["fallbacks"] else ""
+            if item.get("policy_copies"):
+                fallbacks += f", {item['policy_copies']} small/config files copied"
+            print(f"[*] {item['layer'].capitalize()} device {item['source_device']} -> {item['target_device']}: "
+                  f"{item['method']}{reason}, {item['files']} files{fallbacks}")
+
+    def write(self, path):
+        write_link_strategy(path, [self])
+
+def write_link_strategy(path, strategies):
+    """Writes the decisions of several strategies (mod and vanilla layer) to one file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([item for strategy in strategies if strategy for item in strategy.summary()], f, indent=4)
+
+def load_link_strategy(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -1,11 +1,32 @@
 import os
 import sys
 import json
+import stat
+import time
 import shutil
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
+from manifest_io import iter_manifest, find_manifest
+from manifest_model import CompactManifest, ManifestEntry
+from manifest_db import ManifestDatabase, db_path_for
+from link_strategy import LinkStrategy, LINK_STRATEGY_FILENAME, remove_existing, device_of, write_link_strategy
+from copy_engine import CopyEngine, TaskStop
+from dir_links import DIR_LINKS_FILENAME, load_dir_links
+from deploy_journal import DeployJournal, JOURNAL_FILENAME
+from deploy_state import DeployState, state_path_for, remove_tracked
+
+# Worker count for parallel deployment (mirrors ThreadPoolExecutor's default)
+DEFAULT_DEPLOY_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Files per deploy task; larger folders are split so one huge folder does not serialize the pool
+DEPLOY_BATCH_SIZE = 256
+
+# Report 'mod' of the game files deployed as the lowest layer
+VANILLA_MOD_NAME = "Vanilla"
 
 class LinkerExecutor:
     def __init__(self, standalone_path, original_game_path):
@@ -20,11 +41,32 @@ class LinkerExecutor:
 
         # Manifest and Report are in 'output' folder
         self.output_dir = base_path / "output"
-        self.manifest_file = self.output_dir / "mapping_manifest.json"
+        self.manifest_file = find_manifest(self.output_dir)
         self.report_file = self.output_dir / "execution_report.json"
+        # Index of the files the deployments created in this Standalone folder (see deploy_state)
+        self.state_file = state_path_for(self.standalone_path)
+        # Number of FAILED entries of the last execute_mapping run (None until it ran)
+        self.failed_count = None
+        # LinkStrategy of the last execute_mapping run (per-device hardlink/copy decisions)
+        self.strategy = None
+        # Hardlink/copy decisions of the vanilla layer (vanilla_mode 'link' only)
+        self.vanilla_strategy = None
+        # Live build whose identical copies are hardlinked instead of copied again (shadow builds)
+        self.reuse_root = None
+        # Write-ahead journal of the running execute_mapping (None outside of it)
+        self.journal = None
+        # Copy lanes for cross-drive files (vanilla clone and mods); hash_algo set -> digests recorded
+        self.copy_engine = CopyEngine()
+        # Set when a deploy is interrupted: running batches stop after their current file
+        self._stop = TaskStop()
+        # Mod indexes whose manifest stats came from the scan cache (they may be stale)
+        self.cached_mods = set()
+
+    def _recursive_vanilla_deploy(self, src_root, dst_root, mode='copy', copy_jobs=None):
+        """Internal recursive function to copy or link vanilla files with interactive fallback.
 
-    def _recursive_vanilla_deploy(self, src_root, dst_root, mode='copy'):
-        """Internal recursive function to copy or link vanilla files with interactive fallback."""
+        With copy_jobs (a list), copies are queued as (size, (source, target)) for the copy engine.
+        """
         for item in src_root.iterdir():
             if item.name.lower() == '_commonredist': 
                 continue
@@ -33,7 +75,7 @@ class LinkerExecutor:
             
             if item.is_dir():
                 target.mkdir(exist_ok=True)
-                self._recursive_vanilla_deploy(item, target, mode)
+                self._recursive_vanilla_deploy(item, target, mode, copy_jobs)
             else:
                 if not target.exists():
                     if mode == 'link':
@@ -54,34 +96,69 @@ class LinkerExecutor:
                             root.destroy()
 
                             if choice is True: # User chose Copy
-                                shutil.copy2(item, target)
+                                self._queue_vanilla_copy(item, target, copy_jobs)
                             elif choice is None: # User chose Cancel
                                 print("[!] Process forcefully aborted by user.")
+                                if self.journal is not None:
+                                    self.journal.close() # os._exit skips finally blocks
                                 os._exit(1)
                             else: # User chose No
                                 continue
                     else:
-                        shutil.copy2(item, target)
+                        self._queue_vanilla_copy(item, target, copy_jobs)
+
+    def _queue_vanilla_copy(self, source, target, copy_jobs):
+        if copy_jobs is None:
+            shutil.copy2(source, target)
+        else:
+            copy_jobs.append((source.stat().st_size, (source, target)))
+
+    def _copy_vanilla_file(self, job):
+        source, target = job
+        try:
+            self.copy_engine.copy_file(source, target)
+            return None
+        except Exception as e:
+            return f"{target}: {e}"
 
     def initial_vanilla_clone(self, mode='copy'):
-        """Clones or links the root game folder from the original path to Standalone."""
+        """Clones or links the root game folder from the original path to Standalone.
+
+        The folder tree is walked (and linked) first; copies then run in the copy engine's lanes.
+        """
         print(f"\n[*] STARTING FULL VANILLA CLONING (Mode: {mode.upper()})...")
         try:
-            self._recursive_vanilla_deploy(self.game_path, self.standalone_path, mode)
-            print("[SUCCESS] Vanilla Cloning finished with all core game libraries.")
+            copy_jobs = []
+            self._recursive_vanilla_deploy(self.game_path, self.standalone_path, mode, copy_jobs)
+            errors = [e for e in self.copy_engine.map(self._copy_vanilla_file, copy_jobs, desc="Copying Vanilla") if e]
+            if errors:
+                for error in errors[:10]:
+                    print(f"[!] Copy failed: {error}")
+                print(f"[ERROR] Cloning incomplete: {len(errors)} of {len(copy_jobs)} vanilla files could not be copied.")
+            else:
+                print("[SUCCESS] Vanilla Cloning finished with all core game libraries.")
         except Exception as e:
             print(f"[ERROR] Cloning failed: {e}")
 
-    def clean_orphaned_files(self, dry_run=False):
-        """Deletes files in standalone that are not in the manifest and are not core vanilla files."""
+    def clean_orphaned_files(self, dry_run=False, vanilla_mode='copy'):
+        """Deletes the files of earlier deployments that are no longer in the manifest.
+
+        The deploy state index knows every file and directory link the linker created, so only
+        those that left the plan are deleted (links are unlinked, never followed) and the tree is
+        not walked. Game files a deleted target had replaced are restored (vanilla_mode). Files
+        the tool did not create are never touched. Without an index (builds made before it
+        existed), the folder is walked and every file outside the manifest that is not a core
+        vanilla file is deleted.
+        """
         if not self.manifest_file.exists():
             print("[!] Skip Cleaning: manifest not found.")
             return
+        if self.state_file.exists():
+            self._clean_tracked_orphans(dry_run, vanilla_mode)
+            return
+        print("[*] No deploy state index found, scanning the whole folder for orphans...")
 
-        with open(self.manifest_file, 'r') as f:
-            manifest = json.load(f)
-        
-        manifest_targets = {k.lower().replace("\\", "/") for k in manifest.keys()}
+        manifest_targets = {k.lower().replace("\\", "/") for k, _ in iter_manifest(self.manifest_file)}
         
         # List of folders/files that MUST NOT be deleted (Vanilla Core / Engine)
         # Note: Broadened to capture standard Bethesda master files
@@ -117,58 +194,638 @@ class LinkerExecutor:
 
         print(f"[SUCCESS] Cleaning finished. Total files deleted: {deleted_count}")
 
-    def execute_mapping(self, clean=False):
-        """Reads JSON and overwrites files in Standalone with mod files."""
+    def _clean_tracked_orphans(self, dry_run, vanilla_mode):
+        """clean_orphaned_files for a Standalone folder with a deploy state index."""
+        manifest_targets = (target for target, _ in iter_manifest(self.manifest_file))
+        with DeployState(self.state_file) as state:
+            # Vanilla files are the game's; they leave with the game folder, not with the mod list
+            orphans = state.orphans(manifest_targets, origins=("mod",))
+            print(f"[*] Cleaning up orphan files in: {self.standalone_path} ({len(orphans)} of {len(state)} tracked targets left the plan)")
+            deleted, restored_rows = [], []
+            for target_rel_path, origin, method in orphans:
+                target = self.standalone_path / target_rel_path
+                if dry_run:
+                    print(f"[DRY RUN] Would delete: {target_rel_path}")
+                    deleted.append(target_rel_path)
+                    continue
+                try:
+                    remove_tracked(target, method)
+                    print(f"[-] Deleted orphan: {target_rel_path}")
+                    deleted.append(target_rel_path)
+                    restored = self._restore_vanilla_file(target_rel_path, target, vanilla_mode) if method != "dirlink" else None
+                    if restored:
+                        restored_rows.append((target_rel_path, "vanilla", VANILLA_MOD_NAME, restored))
+                except Exception as e:
+                    print(f"[!] Failed to delete {target_rel_path}: {e}")
+            if not dry_run:
+                state.untrack(deleted)
+                state.track(restored_rows)
+        restored_note = f" ({len(restored_rows)} vanilla files restored)" if restored_rows else ""
+        print(f"[SUCCESS] Cleaning finished. Total files deleted: {len(deleted)}{restored_note}")
+
+    def _is_in_place(self, target, source, method, entry):
+        """True when the target already is the manifest source.
+
+        Hardlinks must share the source's device and inode; copies and reflinks must match its size
+        and mtime (both preserve the mtime) without being a hardlink of it; symlinks must point at it.
+        The source is statted instead of trusting the manifest when the scan did not record inode and
+        device (0), and for mods taken from the scan cache: a file edited in place keeps its folder's
+        signature, so the cached size and mtime may describe an older version of it.
+        """
+        try:
+            target_stat = os.lstat(target)
+        except OSError:
+            return False
+        if method == "symlink":
+            return stat.S_ISLNK(target_stat.st_mode) and os.readlink(target) == source
+        if not stat.S_ISREG(target_stat.st_mode):
+            return False
+        if entry.mod in self.cached_mods or not entry.st_ino or not entry.st_dev:
+            source_stat = os.stat(source)
+            st_ino, st_dev = source_stat.st_ino, source_stat.st_dev
+            size_bytes, mtime_ns = source_stat.st_size, source_stat.st_mtime_ns
+        else:
+            st_ino, st_dev = entry.st_ino, entry.st_dev
+            size_bytes, mtime_ns = entry.size_bytes, entry.st_mtime_ns
+        is_link = target_stat.st_ino == st_ino and target_stat.st_dev == st_dev
+        if method == "hardlink":
+            return is_link
+        return not is_link and target_stat.st_size == size_bytes and target_stat.st_mtime_ns == mtime_ns
+
+    def _deploy_one(self, item, skip_unchanged=True):
+        """Deploys one (index, target, source, method, entry). Returns (index, method used, fallback, error)."""
+        index, target, source, method, entry = item
+        try:
+            if skip_unchanged and self._is_in_place(target, source, method, entry):
+                return index, "unchanged", None, None
+            if method == "copy" and self.reuse_root is not None and self._reuse_copy(target, source, entry):
+                return index, "reused", None, None
+            return (index, *self.strategy.place(source, target, method), None)
+        except Exception as e:
+            return index, None, None, str(e)
+
+    def _reuse_copy(self, target, source, entry):
+        """Hardlinks the live build's copy of the same source file to target instead of copying it again."""
+        live = self.reuse_root + target[len(str(self.standalone_path)):]
+        if not self._is_in_place(live, source, "copy", entry):
+            return False
+        try:
+            os.link(live, target)
+            return True
+        except OSError:
+            return False
+
+    def _deploy_batch(self, batch, skip_unchanged, done):
+        """Deploys files that share one target folder, appending (index, method used, fallback, error) to done.
+
+        Stops early once the deploy was interrupted.
+        """
+        with self._stop:
+            for item in batch:
+                if self._stop.is_set():
+                    break
+                done.append(self._deploy_one(item, skip_unchanged))
+
+    def _plan_vanilla(self, manifest):
+        """Lists the game files that no manifest target overrides: the lowest deployment layer.
+
+        Returns ([(target_rel_path, ManifestEntry)], [folder rel paths]); the entries carry the
+        absolute game file as rel_source. _CommonRedist is skipped, as in the vanilla clone.
+        """
+        overridden = {os.path.normcase(target) for target in manifest.entries}
+        files = []
+        folders = []
+        stack = [("", str(self.game_path))]
+        while stack:
+            rel_dir, src_dir = stack.pop()
+            try:
+                with os.scandir(src_dir) as it:
+                    for e in it:
+                        if e.name.lower() == '_commonredist':
+                            continue
+                        rel_path = f"{rel_dir}/{e.name}" if rel_dir else e.name
+                        if e.is_dir():
+                            folders.append(rel_path)
+                            stack.append((rel_path, e.path))
+                        elif os.path.normcase(rel_path) not in overridden:
+                            st = e.stat()
+                            files.append((rel_path, ManifestEntry(-1, e.path, not rel_dir, st.st_size,
+                                                                  st.st_ino, st.st_dev, st.st_mtime_ns)))
+            except OSError as e:
+                print(f"[!] Warning: Could not read game folder {src_dir}: {e}")
+        return files, folders
+
+    def _restore_vanilla_file(self, target_rel_path, target, vanilla_mode):
+        """Puts the original game file back at a target a mod no longer provides.
+
+        Returns the method used ('hardlink' or 'copy'), or None if the game has no such file.
+        """
+        if target_rel_path.split("/", 1)[0].lower() == "_commonredist":
+            return None
+        vanilla = self.game_path / target_rel_path
+        if not vanilla.is_file():
+            return None
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if vanilla_mode == 'link':
+            try:
+                os.link(vanilla, target)
+                return "hardlink"
+            except OSError as e:
+                print(f"[!] Hardlink failed for vanilla {target_rel_path}, copying instead: {e}")
+        self.copy_engine.copy_file(vanilla, target)
+        return "copy"
+
+    def _apply_dir_links(self, links, old_links):
+        """Replaces whole single-mod folders with one directory symlink each.
+
+        links: entries of dir_links.json (empty to use none), old_links: target folders linked by
+        the previous run. Old links that are no longer wanted are unlinked first (never deleted
+        recursively, that would delete mod files). A folder that already exists as a real folder,
+        or whose link cannot be created, is deployed file by file instead.
+        Returns {lower target folder: target folder} of the folders that are linked now.
+        """
+        wanted = {link["target"].lower(): link for link in links}
+        unlinked = []
+        for target_dir in old_links:
+            full = os.path.join(self.standalone_path, target_dir)
+            if target_dir.lower() not in wanted and os.path.islink(full):
+                os.unlink(full)
+                unlinked.append(target_dir)
+        if unlinked:
+            with DeployState(self.state_file) as state:
+                state.untrack(unlinked)
+
+        linked = {}
+        failed = []
+        for lower, link in wanted.items():
+            full = os.path.join(self.standalone_path, link["target"])
+            try:
+                if os.path.islink(full):
+                    if os.readlink(full) == link["source"]:
+                        linked[lower] = link["target"]
+                        continue
+                    os.unlink(full)
+                elif os.path.lexists(full):
+                    continue
+                os.makedirs(os.path.dirname(full), exist_ok=True)
+                os.symlink(link["source"], full, target_is_directory=True)
+                linked[lower] = link["target"]
+            except OSError as e:
+                failed.append(f"{link['target']}: {e}")
+        if failed:
+            print(f"[!] {len(failed)} directory links could not be created, deploying their files instead (first: {failed[0]})")
+        return linked
+
+    def _keep_hash(self, result, prev_result):
+        """Carries the recorded hash of a copy this run left untouched over to its new report entry."""
+        if prev_result and prev_result.get("hash") and prev_result.get("method") in ("copy", "unchanged"):
+            result["hash"] = prev_result["hash"]
+            result["hash_algo"] = prev_result.get("hash_algo")
+
+    def _dir_link_of(self, target_rel_path, linked):
+        """The linked folder a target lies in, or None."""
+        path = target_rel_path.lower()
+        pos = path.find("/")
+        while pos != -1:
+            target_dir = linked.get(path[:pos])
+            if target_dir is not None:
+                return target_dir
+            pos = path.find("/", pos + 1)
+        return None
+
+    def _stale_targets(self, previous, manifest, linked=None, vanilla_targets=None):
+        """Targets of the previous build the new manifest no longer has, minus those inside a directory link."""
+        current = {os.path.normcase(target) for target in manifest.entries}
+        if vanilla_targets:
+            current |= vanilla_targets
+        return [
+            target_rel_path for target_rel_path in previous.entries
+            if os.path.normcase(target_rel_path) not in current
+            and not (linked and self._dir_link_of(target_rel_path, linked) is not None)
+        ]
+
+    def _remove_stale_targets(self, previous, manifest, vanilla_mode, linked=None, vanilla_targets=None):
+        """Deletes targets of the previous build that the new manifest no longer has.
+
+        Vanilla files that those targets had replaced are restored from the game folder. Targets
+        inside a directory link are skipped: deleting them would delete the mod's own files.
+        Targets in vanilla_targets (normcased) are left for the vanilla layer to overwrite.
+        """
+        removed = restored = 0
+        gone, restored_rows = [], []
+        for target_rel_path in self._stale_targets(previous, manifest, linked, vanilla_targets):
+            target = self.standalone_path / target_rel_path
+            try:
+                if os.path.lexists(target):
+                    remove_existing(target)
+                    removed += 1
+                gone.append(target_rel_path)
+                method = self._restore_vanilla_file(target_rel_path, target, vanilla_mode)
+                if method:
+                    restored += 1
+                    restored_rows.append((target_rel_path, "vanilla", VANILLA_MOD_NAME, method))
+            except Exception as e:
+                print(f"[!] Failed to remove stale target {target_rel_path}: {e}")
+        with DeployState(self.state_file) as state:
+            state.untrack(gone)
+            state.track(restored_rows)
+        print(f"[*] Removed {removed} stale targets ({restored} vanilla files restored).")
+
+    def _is_unchanged(self, previous, prev_entry, manifest, entry):
+        """True when a target still ships the very same source file as in the previous build."""
+        return (prev_entry is not None
+                and previous.source(prev_entry) == manifest.source(entry)
+                and prev_entry.size_bytes == entry.size_bytes
+                and prev_entry.st_mtime_ns == entry.st_mtime_ns
+                and prev_entry.st_ino == entry.st_ino)
+
+    def _plan_targets(self, manifest, vanilla_files=(), linked=None, previous=None, previous_results=None, unlinked_dirs=None, journaled=None):
+        """Decides what a deployment does with every target, before anything is written.
+
+        Targets differing only in case are the same file on case-insensitive filesystems: only the
+        last one is deployed, as in a serial run. Vanilla files follow the manifest entries
+        (indexes from len(manifest) on). Returns a dict:
+            planned    [(target_rel_path, target, entry)] by index
+            shadowed   {index: index of the later target that replaces it}
+            dirlinked  {index: linked folder that already provides the target}
+            kept       {indexes the previous build already deployed from the same source (incremental)}
+            resumed    {index: (method, fallback) journaled by an interrupted run}
+            todo       [(index, source)] of the targets to deploy
+        """
+        standalone_root = str(self.standalone_path)
+        mod_count = len(manifest)
+        previous_results = previous_results or {}
+        planned = []
+        last_index = {}
+        for index, (target_rel_path, entry) in enumerate(list(manifest.entries.items()) + list(vanilla_files)):
+            target = os.path.join(standalone_root, target_rel_path)
+            planned.append((target_rel_path, target, entry))
+            last_index[os.path.normcase(target)] = index
+
+        plan = {"planned": planned, "shadowed": {}, "dirlinked": {}, "kept": set(), "resumed": {}, "todo": []}
+        for index, (target_rel_path, target, entry) in enumerate(planned):
+            winner = last_index[os.path.normcase(target)]
+            if winner != index:
+                plan["shadowed"][index] = winner
+                continue
+            if linked:
+                target_dir = self._dir_link_of(target_rel_path, linked)
+                if target_dir is not None:
+                    plan["dirlinked"][index] = target_dir
+                    continue
+            if index >= mod_count:
+                source = entry.rel_source
+            else:
+                if previous is not None:
+                    # Unchanged source and deployed successfully last time: leave the file alone.
+                    # A file the previous build provided through a (now removed) directory link is not on disk.
+                    prev_result = previous_results.get(target_rel_path)
+                    if prev_result and prev_result.get("status") == "SUCCESS" and prev_result.get("method") != "dirlink" and \
+                            not (unlinked_dirs and self._dir_link_of(target_rel_path, unlinked_dirs) is not None) and \
+                            self._is_unchanged(previous, previous.entries.get(target_rel_path), manifest, entry):
+                        plan["kept"].add(index)
+                        continue
+                source = manifest.source(entry)
+            if journaled:
+                # Completed by the interrupted run from the very same source: replay it
+                done = journaled.get(target_rel_path)
+                if done is not None and done[0] == source and done[1] == entry.size_bytes and \
+                        done[2] == entry.st_mtime_ns and os.path.lexists(target):
+                    plan["resumed"][index] = (done[3], done[4])
+                    continue
+            plan["todo"].append((index, source))
+        return plan
+
+    def _build_report(self, manifest, plan, results, previous_results, copy_hash=None, live_results=None):
+        """Execution report of a deployment plan and its results ([(method, fallback, error)] by index).
+
+        The report lists the layers bottom-up: vanilla files first, then the manifest order.
+        live_results is the report of the live build that reused copies were hardlinked from.
+        Returns (report, [(target, origin, mod, method)] rows for the deploy state index).
+        """
+        planned, shadowed, dirlinked, kept = plan["planned"], plan["shadowed"], plan["dirlinked"], plan["kept"]
+        standalone_root = str(self.standalone_path)
+        mod_count = len(manifest)
+        report = {}
+        tracked_rows = []
+        for index in list(range(mod_count, len(planned))) + list(range(mod_count)):
+            target_rel_path, _, entry = planned[index]
+            if index >= mod_count:
+                mod_name, origin = VANILLA_MOD_NAME, "vanilla"
+            else:
+                mod_name, origin = manifest.mod_names[entry.mod], "mod"
+            target_dir = dirlinked.get(shadowed.get(index, index))
+            if target_dir is not None:
+                report[target_rel_path] = {"status": "SUCCESS", "method": "dirlink", "mod": mod_name, "origin": origin, "dirlink": target_dir}
+                continue
+            if shadowed.get(index, index) in kept:
+                # Not even looked at this run: the previous build already deployed it
+                report[target_rel_path] = {"status": "SUCCESS", "method": "unchanged", "mod": mod_name, "origin": origin}
+                self._keep_hash(report[target_rel_path], previous_results.get(target_rel_path))
+                if index not in shadowed:
+                    tracked_rows.append((target_rel_path, origin, mod_name, "unchanged"))
+                continue
+            method, fallback, error = results[index]
+            if error is None:
+                reused = method == "reused"
+                if reused:
+                    method = "copy"
+                report[target_rel_path] = {"status": "SUCCESS", "method": method, "mod": mod_name, "origin": origin}
+                if reused:
+                    report[target_rel_path]["reused"] = True
+                if fallback:
+                    report[target_rel_path]["fallback"] = fallback
+                digest = self.copy_engine.digests.get(os.path.join(standalone_root, target_rel_path))
+                if digest and method == "copy":
+                    report[target_rel_path]["hash"] = digest
+                    report[target_rel_path]["hash_algo"] = copy_hash
+                elif reused:
+                    # Same file as the live build's copy: its recorded hash still applies
+                    self._keep_hash(report[target_rel_path], (live_results or previous_results).get(target_rel_path))
+                elif method == "unchanged":
+                    self._keep_hash(report[target_rel_path], previous_results.get(target_rel_path))
+                if index not in shadowed:
+                    tracked_rows.append((target_rel_path, origin, mod_name, method))
+            else:
+                print(f"[!] Failed to process {target_rel_path}: {error}")
+                report[target_rel_path] = {"status": "FAILED", "error": error, "mod": mod_name, "origin": origin}
+        return report, tracked_rows
+
+    def _write_results(self, report, tracked_rows):
+        """Writes the report, the deploy state index, the link strategy and the query index; ends the journal.
+
+        Returns the number of tracked files and links.
+        """
+        with open(self.report_file, 'w') as f:
+            json.dump(report, f, indent=4)
+        # Rows are only added here and removed with their files, so the index lists every file
+        # this tool put into Standalone, including ones a later, non-cleaning run left behind
+        with DeployState(self.state_file) as state:
+            state.track(tracked_rows)
+            tracked_count = len(state)
+        # The report now records every operation: nothing left to resume
+        self.journal.finish()
+        self.journal = None
+        write_link_strategy(self.report_file.with_name(LINK_STRATEGY_FILENAME), [self.strategy, self.vanilla_strategy])
+
+        # Keep the query index (if the scan wrote one) in sync with this deployment
+        db_path = db_path_for(self.manifest_file)
+        if db_path.exists():
+            with ManifestDatabase(db_path) as db:
+                db.write_report(report)
+        return tracked_count
+
+    def execute_mapping(self, clean=False, workers=DEFAULT_DEPLOY_WORKERS, previous_manifest=None, previous_report=None, vanilla_mode='copy', skip_unchanged=True, link_mode='hardlink', copy_hash=None, dir_links=False, cross_device='copy', copy_small_files=False, include_vanilla=False, reuse_from=None, resume=False):
+        """Reads the manifest and overwrites files in Standalone with mod files.
+
+        Target folders are created once up front; files are then linked (or copied) by a bounded
+        thread pool in batches grouped by target folder. The report keeps manifest order.
+
+        With skip_unchanged, targets that already are their source (same inode for hardlinks,
+        same size and mtime for copies) are not touched and reported with method "unchanged",
+        so re-running a deploy over an up-to-date Standalone writes almost nothing.
+
+        link_mode 'reflink' clones mod files (copy-on-write) where the filesystem supports it, so
+        writes in Standalone never reach the mod folders; see LinkStrategy.
+
+        cross_device 'symlink' deploys files of devices that cannot hardlink as file symlinks to
+        the MO2 sources instead of copies; copy_small_files still copies small and config-like
+        files there (see LinkStrategy).
+
+        Files that are copied (other drive) bypass the folder batches and go through CopyEngine's
+        small/large lanes with byte progress. copy_hash (a hashlib name) records the content hash
+        of every copied file in its report entry ("hash", "hash_algo"), which VerificationEngine
+        checks; untouched copies keep the hash of the previous report.
+
+        dir_links (opt-in) deploys the single-mod folders the scanner listed in dir_links.json with
+        one directory symlink each (method "dirlink"); writes into those folders reach the mod.
+
+        include_vanilla plans the game folder as the lowest layer of the same pass: game files no
+        mod overrides are linked or copied (vanilla_mode) alongside the mod files, so every target
+        is written exactly once and no separate vanilla clone is needed. Report entries record
+        their "origin" ('vanilla' or 'mod').
+
+        reuse_from (the live Standalone, when building a new generation next to it): files that
+        would be copied and whose copy there is still identical are hardlinked from it instead
+        (reported as copies with "reused"), so a shadow build copies only what changed.
+
+        Completed operations are journaled to deploy_journal.ndjson next to the report while the
+        deploy runs. resume replays the journal of an interrupted run: targets it completed from
+        the same source are not touched again. The journal is deleted once the report is written.
+
+        Incremental mode (previous_manifest/previous_report of the build already in Standalone):
+        targets the new manifest dropped are deleted (restoring vanilla files, linked or copied per
+        vanilla_mode), targets whose source changed are relinked and everything else is left alone.
+        """
         if clean:
-            self.clean_orphaned_files()
+            self.clean_orphaned_files(vanilla_mode=vanilla_mode)
 
         if not self.manifest_file.exists():
             print(f"[!] Error: {self.manifest_file.name} not found!")
             return
 
-        with open(self.manifest_file, 'r') as f:
-            manifest = json.load(f)
-
         print(f"[*] Starting Mod Deployment to: {self.standalone_path}")
-        report = {}
+        start_time = time.perf_counter()
+        manifest = CompactManifest.load(self.manifest_file)
+        self.cached_mods = {index for index, name in enumerate(manifest.mod_names) if name in manifest.cached_mods}
 
-        for target_rel_path, info in tqdm(manifest.items(), desc="Deploying Mods", unit="file", smoothing=0.1, miniters=1, dynamic_ncols=True, leave=False, bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]"):
-            source_path = Path(info['source'])
-            target_full_path = self.standalone_path / target_rel_path
-            
+        previous = None
+        # The report of the build currently in Standalone tells which folders are directory links
+        old_report_file = previous_report if previous_report else self.report_file
+        previous_results = {}
+        if old_report_file and Path(old_report_file).exists():
             try:
-                # 1. OVERWRITE LOGIC: Remove old file to replace with new link/copy
-                if target_full_path.exists():
-                    if target_full_path.is_file() or target_full_path.is_symlink():
-                        os.remove(target_full_path)
-                    elif target_full_path.is_dir():
-                        shutil.rmtree(target_full_path)
-
-                # 2. Ensure Target Directory Exists
-                if not target_full_path.parent.exists():
-                    target_full_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # 3. Execution (Hardlink if same drive, Copy if different)
-                source_drive = source_path.anchor.lower()
-                target_drive = self.standalone_path.anchor.lower()
-                
-                if source_drive == target_drive:
-                    os.link(source_path, target_full_path)
-                    method = "hardlink"
-                else:
-                    shutil.copy2(source_path, target_full_path)
-                    method = "copy"
+                with open(old_report_file, 'r') as f:
+                    previous_results = json.load(f)
+            except Exception as e:
+                print(f"[!] Warning: Could not read the previous report: {e}")
+        old_links = {r["dirlink"] for r in previous_results.values() if r.get("dirlink")}
+
+        vanilla_files, vanilla_folders = self._plan_vanilla(manifest) if include_vanilla else ([], [])
+        if include_vanilla:
+            print(f"[*] Vanilla layer: {len(vanilla_files)} game files not overridden by mods (Mode: {vanilla_mode.upper()}).")
 
-                report[target_rel_path] = {"status": "SUCCESS", "method": method, "mod": info['mod_origin']}
+        links_file = self.manifest_file.with_name(DIR_LINKS_FILENAME)
+        links = load_dir_links(links_file) if dir_links and links_file.exists() else []
+        if vanilla_folders and links:
+            # A game folder is a real folder in Standalone: vanilla files must never land in a mod
+            blocked = {folder.lower() for folder in vanilla_folders}
+            links = [link for link in links if link["target"].lower() not in blocked]
+        linked = self._apply_dir_links(links, old_links) if links or old_links else {}
+        link_mods = {link["target"].lower(): link["mod"] for link in links}
+        tracked_rows = [(target_dir, "mod", link_mods[lower], "dirlink") for lower, target_dir in linked.items()]
+        if dir_links:
+            print(f"[*] Directory links: {len(linked)} of {len(links)} single-mod folders linked.")
+        # Folders that were links until now: their files must be deployed one by one again
+        unlinked_dirs = {target_dir.lower(): target_dir for target_dir in old_links if target_dir.lower() not in linked}
 
+        if previous_manifest and Path(previous_manifest).exists():
+            previous = CompactManifest.load(previous_manifest)
+            if not previous_report:
+                previous_results = {}
+            print(f"[*] Incremental deploy against the previous build ({len(previous)} targets).")
+            self._remove_stale_targets(previous, manifest, vanilla_mode, linked,
+                                       {os.path.normcase(target) for target, _ in vanilla_files})
+        standalone_root = str(self.standalone_path)
+        self.copy_engine = CopyEngine(hash_algo=copy_hash)
+        self.reuse_root = str(reuse_from) if reuse_from and Path(reuse_from).is_dir() else None
+        live_results = {}
+        live_report_file = Path(reuse_from) / "standalone_metadata" / "execution_report.json" if self.reuse_root else None
+        if live_report_file and live_report_file.exists():
+            try:
+                with open(live_report_file, 'r') as f:
+                    live_results = json.load(f)
             except Exception as e:
-                print(f"[!] Failed to process {target_rel_path}: {str(e)}")
-                report[target_rel_path] = {"status": "FAILED", "error": str(e), "mod": info['mod_origin']}
+                print(f"[!] Warning: Could not read the report of the live build: {e}")
+        self.journal = DeployJournal(self.report_file.with_name(JOURNAL_FILENAME), self.standalone_path)
+        journaled = self.journal.load() if resume else {}
+        if resume:
+            print(f"[*] Resuming: the interrupted deployment journaled {len(journaled)} completed operations.")
+        self.journal.open(journaled)
+        self.strategy = LinkStrategy(self.standalone_path, link_mode, copy_file=self.copy_engine.copy_file,
+                                     cross_device=cross_device, copy_small_files=copy_small_files)
+        # Vanilla files are hardlinked where the game drive allows it (vanilla_mode 'link'), else copied
+        self.vanilla_strategy = LinkStrategy(self.standalone_path, "hardlink", copy_file=self.copy_engine.copy_file,
+                                             layer="vanilla") if vanilla_files and vanilla_mode == 'link' else None
+        plan = self._plan_targets(manifest, vanilla_files, linked, previous, previous_results, unlinked_dirs, journaled)
+        planned, shadowed, dirlinked, kept, resumed = (plan[key] for key in ("planned", "shadowed", "dirlinked", "kept", "resumed"))
+        mod_count = len(manifest)
 
-        with open(self.report_file, 'w') as f:
-            json.dump(report, f, indent=4)
+        # 1. Group the files to deploy by target folder; hardlink or copy is decided per source device
+        # (probed once per device pair): the device of a mod is that of its folder, absolute sources use their own
+        mod_devices = [device_of(root) if root else None for root in manifest.mod_roots]
+        devices = [None] * len(planned)
+        sources = [None] * len(planned)
+        groups = {}
+        for index, source in plan["todo"]:
+            _, target, entry = planned[index]
+            if index >= mod_count:
+                src_dev = entry.st_dev or device_of(source)
+                strategy = self.vanilla_strategy
+            else:
+                src_dev = mod_devices[entry.mod]
+                if src_dev is None:
+                    src_dev = entry.st_dev or device_of(source)
+                strategy = self.strategy
+            sources[index] = source
+            devices[index] = src_dev
+            method = strategy.method_for(source, src_dev, entry.size_bytes) if strategy else "copy"
+            groups.setdefault(os.path.normcase(os.path.dirname(target)), []).append((index, target, source, method, entry))
+
+        # 2. Create every target folder once (sorted, so parents come first); empty game folders too
+        folder_errors = {}
+        for folder in vanilla_folders:
+            try:
+                os.makedirs(os.path.join(standalone_root, folder), exist_ok=True)
+            except Exception as e:
+                print(f"[!] Failed to create vanilla folder {folder}: {e}")
+        for folder in sorted(groups):
+            try:
+                os.makedirs(os.path.dirname(groups[folder][0][1]), exist_ok=True)
+            except Exception as e:
+                folder_errors[folder] = str(e)
+
+        # 3. Link in parallel, one task per folder batch; copies go to the copy engine's lanes
+        results = [None] * len(planned)
+        batches = []
+        copy_items = []
+        for folder, items in groups.items():
+            if folder in folder_errors:
+                for index, _, _, _, _ in items:
+                    results[index] = (None, None, folder_errors[folder])
+                continue
+            links = []
+            for item in items:
+                if item[3] == "copy":
+                    copy_items.append((item[4].size_bytes, item))
+                else:
+                    links.append(item)
+            for i in range(0, len(links), DEPLOY_BATCH_SIZE):
+                batches.append(links[i:i + DEPLOY_BATCH_SIZE])
+
+        for index, (method, fallback) in resumed.items():
+            results[index] = (method, fallback, None)
+
+        def store(index, method, fallback, error):
+            results[index] = (method, fallback, error)
+            if error is None:
+                strategy = self.strategy if index < mod_count else self.vanilla_strategy
+                if strategy is not None:
+                    strategy.record(devices[index], fallback, "copy" if method == "reused" else method)
+                entry = planned[index][2]
+                self.journal.add(planned[index][0], sources[index], entry.size_bytes, entry.st_mtime_ns, method, fallback)
+
+        # The journal is flushed per batch of operations and on any way out (Ctrl+C, errors)
+        try:
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool, \
+                    tqdm(total=len(planned) - len(copy_items), desc="Deploying Files" if vanilla_files else "Deploying Mods", unit="file", smoothing=0.1, dynamic_ncols=True, leave=False, bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}{postfix}]") as pbar:
+                pbar.update(len(kept) + len(shadowed) + len(dirlinked) + len(resumed) + sum(len(items) for folder, items in groups.items() if folder in folder_errors))
+                self._stop.clear()
+                done = deque()  # results in completion order (deque appends are thread-safe)
+                futures = []
+                try:
+                    for batch in batches:
+                        futures.append(pool.submit(self._deploy_batch, batch, skip_unchanged, done))
+                    for future in as_completed(futures):
+                        future.result()
+                        stored = 0
+                        while done:
+                            store(*done.popleft())
+                            stored += 1
+                        pbar.update(stored)
+                        self.journal.flush()
+                except BaseException:
+                    # Ctrl+C: drop the queued batches (leaving the with-block would run them all),
+                    # let the running ones stop after their current file and journal everything
+                    # that completed, so a resume does not redo it
+                    self._stop.set()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._stop.wait_idle()
+                    while done:
+                        store(*done.popleft())
+                    raise
+
+            if copy_items:
+                print(f"[*] Copying {len(copy_items)} files ({sum(size for size, _ in copy_items) / 1024 / 1024:.1f} MB)...")
+                copies = self.copy_engine.map(lambda item: self._deploy_one(item, skip_unchanged), copy_items, desc="Copying Files")
+                try:
+                    for result in copies:
+                        store(*result)
+                finally:
+                    copies.close()  # An interrupted loop cancels the queued copies at once
+        finally:
+            self.journal.close()
+
+        for index, winner in shadowed.items():
+            results[index] = results[winner]
+
+        report, report_rows = self._build_report(manifest, plan, results, previous_results, copy_hash, live_results)
+        tracked_rows += report_rows
+        elapsed = time.perf_counter() - start_time
+
+        tracked_count = self._write_results(report, tracked_rows)
+        self.failed_count = sum(1 for r in report.values() if r["status"] == "FAILED")
         
         print(f"\n[SUCCESS] Deployment complete.")
+        unchanged = sum(1 for r in report.values() if r.get("method") == "unchanged")
+        written = len(report) - self.failed_count - unchanged
+        print(f"Deployed {written} files ({self.failed_count} failed, {unchanged} left unchanged) in {elapsed:.1f}s "
+              f"({written / elapsed if elapsed > 0 else 0:.0f} files/s, {max(workers, 1)} workers).")
+        if vanilla_files:
+            print(f"[*] {sum(1 for r in report.values() if r['origin'] == 'vanilla')} of these are vanilla game files.")
+        if resumed:
+            print(f"[*] {len(resumed)} operations were completed by the interrupted run and not redone.")
+        if self.reuse_root:
+            print(f"[*] {sum(1 for r in report.values() if r.get('reused'))} copies reused from the live build (hardlinked, not copied).")
+        self.strategy.print_summary()
+        if self.vanilla_strategy:
+            self.vanilla_strategy.print_summary()
+        if linked:
+            linked_files = sum(1 for r in report.values() if r.get("method") == "dirlink")
+            operations = len(report) - linked_files + len(linked)
+            print(f"[*] Directory links: {len(linked)} folders provide {linked_files} files. "
+                  f"{operations} filesystem operations instead of {len(report)} file links.")
+        print(f"[*] Deploy state index: {tracked_count} tracked files and links ({self.state_file}).")
         print(f"Execution details can be viewed at: {self.report_file}")
 
 def get_folder(title):
@@ -184,13 +841,19 @@ if __name__ == "__main__":
     if len(sys.argv) > 3:
         standalone_p, steam_p, mode_p = sys.argv[1], sys.argv[2], sys.argv[3]
         clean_flag = "--clean" in sys.argv
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else DEFAULT_DEPLOY_WORKERS
+        force_flag = "--force" in sys.argv
+        link_mode = "reflink" if "--reflink" in sys.argv else "hardlink"
+        copy_hash = sys.argv[sys.argv.index("--hash") + 1] if "--hash" in sys.argv else None
+        dir_links = "--dir-links" in sys.argv
+        cross_device = "symlink" if "--symlink" in sys.argv else "copy"
+        copy_small_files = "--copy-small" in sys.argv
+        resume = "--resume" in sys.argv
         
         executor = LinkerExecutor(standalone_p, steam_p)
         
-        if "--clone" in sys.argv:
-            executor.initial_vanilla_clone(mode=mode_p)
-            
-        executor.execute_mapping(clean=clean_flag)
+        # --clone deploys the game folder as the lowest layer of the same pass
+        executor.execute_mapping(clean=clean_flag, workers=workers, vanilla_mode=mode_p, skip_unchanged=not force_flag, link_mode=link_mode, copy_hash=copy_hash, dir_links=dir_links, cross_device=cross_device, copy_small_files=copy_small_files, include_vanilla="--clone" in sys.argv, resume=resume)
     else:
         # UI for manual execution
         try:
@@ -211,11 +874,11 @@ if __name__ == "__main__":
             executor = LinkerExecutor(standalone_p, game_p)
             
             do_clone = messagebox.askyesno("Clone Vanilla", "Would you like to clone Vanilla files now?")
+            mode = "copy"
             if do_clone:
                 mode = "link" if messagebox.askyesno("Mode", "Use Hardlinks for Vanilla?") else "copy"
-                executor.initial_vanilla_clone(mode=mode)
             
-            executor.execute_mapping()
+            executor.execute_mapping(vanilla_mode=mode, include_vanilla=do_clone)
             
         except Exception as e:
             print(f"\n[CRITICAL ERROR] {str(e)}")
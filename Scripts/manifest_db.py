@@ -0,0 +1,161 @@
+"""SQLite index of a scan (targets, providers, mods) and of its deployment results.
+
+Written next to the manifest so conflicts and deploy outcomes can be queried without
+loading the manifest or the execution report into Python.
+"""
+import sqlite3
+from pathlib import Path
+
+DB_FILENAME = "manifest_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mods (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    priority INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS targets (
+    target TEXT PRIMARY KEY,
+    winner_id INTEGER NOT NULL REFERENCES mods(id),
+    source TEXT NOT NULL,
+    is_root INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS providers (
+    target TEXT NOT NULL COLLATE NOCASE,
+    mod_id INTEGER NOT NULL REFERENCES mods(id),
+    priority INTEGER NOT NULL,
+    is_winner INTEGER NOT NULL,
+    size_bytes INTEGER
+);
+CREATE TABLE IF NOT EXISTS deployment (
+    target TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    method TEXT,
+    mod TEXT,
+    error TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_targets_winner ON targets(winner_id);
+CREATE INDEX IF NOT EXISTS idx_providers_target ON providers(target);
+CREATE INDEX IF NOT EXISTS idx_providers_mod ON providers(mod_id, is_winner);
+CREATE INDEX IF NOT EXISTS idx_deployment_status ON deployment(status);
+"""
+
+def db_path_for(manifest_path):
+    """Location of the index that belongs to a manifest."""
+    return Path(manifest_path).with_name(DB_FILENAME)
+
+class ManifestDatabase:
+    def __init__(self, db_path):
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_scan(self, mod_order, manifest, conflicts):
+        """Replaces the scan tables.
+
+        mod_order: mod names from lowest to highest priority, manifest: CompactManifest of the
+        winners, conflicts: target -> [(losing mod name, size_bytes)].
+        """
+        conn = self.conn
+        # Recreated rather than emptied so files written by older versions pick up schema changes.
+        # Dropping the tables drops their indexes too: bulk load without them, then build them once.
+        conn.executescript("DROP TABLE IF EXISTS providers; DROP TABLE IF EXISTS targets; DROP TABLE IF EXISTS mods;" + SCHEMA)
+        with conn:
+            # The mod id is its priority (0 = lowest)
+            mod_ids = {name: priority for priority, name in enumerate(mod_order)}
+            conn.executemany("INSERT INTO mods (id, name, priority) VALUES (?, ?, ?)",
+                             ((priority, name, priority) for name, priority in mod_ids.items()))
+
+            winner_ids = [mod_ids[name] for name in manifest.mod_names]
+            conn.executemany(
+                "INSERT INTO targets (target, winner_id, source, is_root, size_bytes) VALUES (?, ?, ?, ?, ?)",
+                ((target, winner_ids[e.mod], manifest.source(e), int(e.is_root), e.size_bytes)
+                 for target, e in manifest.entries.items())
+            )
+            conn.executemany(
+                "INSERT INTO providers (target, mod_id, priority, is_winner, size_bytes) VALUES (?, ?, ?, 1, ?)",
+                ((target, winner_ids[e.mod], winner_ids[e.mod], e.size_bytes) for target, e in manifest.entries.items())
+            )
+            conn.executemany(
+                "INSERT INTO providers (target, mod_id, priority, is_winner, size_bytes) VALUES (?, ?, ?, 0, ?)",
+                ((target, mod_ids[name], mod_ids[name], size_bytes)
+                 for target, losers in conflicts.items() for name, size_bytes in losers)
+            )
+            conn.executescript(INDEXES)
+
+    def write_report(self, report):
+        """Replaces the deployment table with an execution report ({target: result})."""
+        with self.conn:
+            self.conn.execute("DELETE FROM deployment")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO deployment (target, status, method, mod, error) VALUES (?, ?, ?, ?, ?)",
+                ((target, r.get("status"), r.get("method"), r.get("mod"), r.get("error")) for target, r in report.items())
+            )
+            self.conn.executescript(INDEXES)
+
+    # --- Queries ---
+
+    def providers(self, target_prefix):
+        """All mods providing targets under a path prefix (case-insensitive), winners first."""
+        pattern = target_prefix.replace("\\", "/").replace("%", r"\%").replace("_", r"\_") + "%"
+        return self.conn.execute(
+            "SELECT p.target, m.name, p.priority, p.is_winner FROM providers p JOIN mods m ON m.id = p.mod_id "
+            "WHERE p.target LIKE ? ESCAPE '\\' ORDER BY p.target, p.priority DESC", (pattern,)
+        ).fetchall()
+
+    def losses(self, loser, winner):
+        """(files, bytes of the loser's copies) that mod 'loser' provides but that ship from mod 'winner'."""
+        return self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(p.size_bytes), 0) FROM providers p "
+            "JOIN mods l ON l.id = p.mod_id JOIN targets t ON t.target = p.target JOIN mods w ON w.id = t.winner_id "
+            "WHERE p.is_winner = 0 AND l.name = ? AND w.name = ?", (loser, winner)
+        ).fetchone()
+
+    def overridden_by(self, loser, limit=20):
+        """Mods that win the files of 'loser', with file counts."""
+        return self.conn.execute(
+            "SELECT w.name, COUNT(*) AS files FROM providers p "
+            "JOIN mods l ON l.id = p.mod_id JOIN targets t ON t.target = p.target JOIN mods w ON w.id = t.winner_id "
+            "WHERE p.is_winner = 0 AND l.name = ? GROUP BY w.name ORDER BY files DESC LIMIT ?", (loser, limit)
+        ).fetchall()
+
+    def top_mods(self, limit=10):
+        """Mods with the most winning files, with their total size."""
+        return self.conn.execute(
+            "SELECT m.name, COUNT(*) AS files, SUM(t.size_bytes) FROM targets t JOIN mods m ON m.id = t.winner_id "
+            "GROUP BY m.name ORDER BY files DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def deployment_counts(self, column, status=None):
+        """Deployment rows grouped by 'status' or 'method', optionally only rows with one status."""
+        if column not in ("status", "method"):
+            raise ValueError(f"Cannot group deployment by {column}")
+        where, params = ("WHERE status = ?", (status,)) if status else ("", ())
+        return self.conn.execute(
+            f"SELECT {column}, COUNT(*) FROM deployment {where} GROUP BY {column} ORDER BY COUNT(*) DESC", params
+        ).fetchall()
+
+    def failures(self, mod=None, limit=10):
+        query = "SELECT target, mod, error FROM deployment WHERE status = 'FAILED'"
+        params = []
+        if mod:
+            query += " AND mod = ?"
+            params.append(mod)
+        return self.conn.execute(query + " ORDER BY target LIMIT ?", params + [limit]).fetchall()
+
+    def error_counts(self, limit=10):
+        return self.conn.execute(
+            "SELECT error, COUNT(*) FROM deployment WHERE status = 'FAILED' GROUP BY error ORDER BY COUNT(*) DESC LIMIT ?", (limit,)
+        ).fetchall()
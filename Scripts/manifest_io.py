@@ -0,0 +1,93 @@
+"""Streaming reader/writer for mapping manifests.
+
+A manifest is NDJSON: a header line followed by one JSON object per target file.
+Paths ending in '.gz' are transparently gzip-compressed. Legacy manifests written as a
+single indented JSON object are still readable.
+"""
+import gzip
+import json
+from pathlib import Path
+
+MANIFEST_FORMAT = "mo2hb-manifest"
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "mapping_manifest.ndjson"
+
+def find_manifest(folder):
+    """The manifest in folder: the gzip one (scanner --gzip) when it is newer or the only one, else the plain one."""
+    plain = Path(folder) / MANIFEST_FILENAME
+    compressed = plain.with_name(MANIFEST_FILENAME + ".gz")
+    try:
+        compressed_mtime = compressed.stat().st_mtime_ns
+    except OSError:
+        return plain
+    try:
+        plain_mtime = plain.stat().st_mtime_ns
+    except OSError:
+        return compressed
+    return compressed if compressed_mtime > plain_mtime else plain
+
+def _open_text(path, mode):
+    if str(path).lower().endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def _is_legacy(first_line):
+    # Old manifests were written with json.dump(indent=4): the first line is a lone '{'
+    return first_line.strip() in ("{", "{}")
+
+def write_manifest(path, items, count=None, mod_roots=None, cached_mods=None):
+    """Writes (target, info) pairs line by line without building the whole document in memory.
+
+    mod_roots ({mod name: mod folder}) is stored in the header so readers can keep sources relative.
+    cached_mods lists the mods whose file stats came from the scan cache instead of the disk.
+    """
+    header = {"format": MANIFEST_FORMAT, "version": MANIFEST_VERSION, "count": count}
+    if mod_roots:
+        header["mod_roots"] = mod_roots
+    if cached_mods:
+        header["cached_mods"] = cached_mods
+    with _open_text(path, 'w') as f:
+        f.write(json.dumps(header) + "\n")
+        for target, info in items:
+            record = {"target": target}
+            record.update(info)
+            f.write(json.dumps(record) + "\n")
+
+def read_manifest_header(path):
+    """Returns the header dict of a manifest ({} for legacy manifests)."""
+    with _open_text(path, 'r') as f:
+        first_line = f.readline()
+    if not first_line or _is_legacy(first_line):
+        return {}
+    header = json.loads(first_line)
+    if header.get("format") != MANIFEST_FORMAT:
+        raise ValueError(f"{Path(path).name} is not a mapping manifest.")
+    return header
+
+def iter_manifest(path):
+    """Yields (target, info) pairs in manifest order, one line at a time."""
+    with _open_text(path, 'r') as f:
+        first_line = f.readline()
+        if not first_line:
+            return
+        if _is_legacy(first_line):
+            f.seek(0)
+            yield from json.load(f).items()
+            return
+
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record.pop("target"), record
+
+def count_manifest(path):
+    """Number of entries, taken from the header when available."""
+    count = read_manifest_header(path).get("count")
+    if count is None:
+        count = sum(1 for _ in iter_manifest(path))
+    return count
+
+def load_manifest(path):
+    """Loads a whole manifest as a {target: info} dict."""
+    return dict(iter_manifest(path))
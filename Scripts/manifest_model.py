@@ -0,0 +1,98 @@
+"""Compact in-memory manifest model.
+
+A dict-of-dicts manifest repeats the absolute source path, the mod name and four field names
+for every file. CompactManifest keeps one __slots__ record per target instead, interns mod
+names into an index table and stores sources relative to their mod folder.
+"""
+from manifest_io import iter_manifest, read_manifest_header
+
+class ManifestEntry:
+    """One target file. 'mod' is an index into CompactManifest.mod_names."""
+    __slots__ = ("mod", "rel_source", "is_root", "size_bytes", "st_ino", "st_dev", "st_mtime_ns")
+
+    def __init__(self, mod, rel_source, is_root, size_bytes, st_ino=0, st_dev=0, st_mtime_ns=0):
+        self.mod = mod
+        self.rel_source = rel_source
+        self.is_root = is_root
+        self.size_bytes = size_bytes
+        self.st_ino = st_ino
+        self.st_dev = st_dev
+        self.st_mtime_ns = st_mtime_ns
+
+class CompactManifest:
+    def __init__(self):
+        self.mod_names = []   # mod index -> mod name
+        self.mod_roots = []   # mod index -> mod folder ('/' separators, '' if sources are absolute)
+        self._mod_index = {}
+        self.entries = {}     # target -> ManifestEntry
+        self.cached_mods = set()  # names of the mods whose file stats came from the scan cache
+
+    def intern_mod(self, mod_name, mod_root=""):
+        """Returns the index of a mod, registering it on first use."""
+        index = self._mod_index.get(mod_name)
+        if index is None:
+            index = self._mod_index[mod_name] = len(self.mod_names)
+            self.mod_names.append(mod_name)
+            self.mod_roots.append(mod_root)
+        return index
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, target):
+        return target in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def get(self, target):
+        return self.entries.get(target)
+
+    def mod_name(self, entry):
+        return self.mod_names[entry.mod]
+
+    def source(self, entry):
+        root = self.mod_roots[entry.mod]
+        return f"{root}/{entry.rel_source}" if root else entry.rel_source
+
+    def to_info(self, entry):
+        """Expands an entry to the manifest's dict layout."""
+        return {
+            "source": self.source(entry),
+            "mod_origin": self.mod_names[entry.mod],
+            "is_root": entry.is_root,
+            "size_bytes": entry.size_bytes,
+            "st_ino": entry.st_ino,
+            "st_dev": entry.st_dev,
+            "st_mtime_ns": entry.st_mtime_ns
+        }
+
+    def items(self):
+        """Yields (target, info dict) pairs, built on the fly for writing or streaming."""
+        for target, entry in self.entries.items():
+            yield target, self.to_info(entry)
+
+    def roots_by_name(self):
+        return {name: root for name, root in zip(self.mod_names, self.mod_roots) if root}
+
+    @classmethod
+    def load(cls, path):
+        """Reads a manifest file into the compact model (legacy manifests included).
+
+        Sources are stored relative to the mod folders listed in the header; manifests without
+        that table keep absolute sources.
+        """
+        manifest = cls()
+        header = read_manifest_header(path)
+        roots = header.get("mod_roots") or {}
+        manifest.cached_mods = set(header.get("cached_mods") or [])
+        for target, info in iter_manifest(path):
+            mod_name = info["mod_origin"]
+            root = roots.get(mod_name, "")
+            index = manifest.intern_mod(mod_name, root)
+            rel_source = info["source"][len(root) + 1:] if root else info["source"]
+            manifest.entries[target] = ManifestEntry(
+                index, rel_source, info["is_root"], info["size_bytes"],
+                info.get("st_ino", 0), info.get("st_dev", 0), info.get("st_mtime_ns", 0)
+            )
+        return manifest
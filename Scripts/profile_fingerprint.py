@@ -0,0 +1,86 @@
+"""Merkle-style fingerprint of everything a standalone build is made from.
+
+Leaves are the profile's .txt/.ini files (content hash), every active mod's tree signature
+(in priority order), the game folder's tree signature and the build options. Each group is
+hashed into a branch and the branches into one root, so an unchanged root means an unchanged
+build input, and comparing leaves names exactly what changed.
+"""
+import json
+import hashlib
+
+FINGERPRINT_VERSION = 1
+
+# Profile files that feed the build (modlist, plugins, load order, INIs); saves are not included
+PROFILE_FILE_SUFFIXES = ('.txt', '.ini')
+
+def hash_leaves(leaves):
+    """Branch hash of an ordered list of (name, hash) leaves."""
+    digest = hashlib.sha1()
+    for name, value in leaves:
+        digest.update(f"{name}\0{value}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def hash_profile_files(profile_path):
+    """{file name: sha1 of its content} for the top-level config files of an MO2 profile."""
+    files = {}
+    if profile_path.exists():
+        for item in sorted(profile_path.iterdir(), key=lambda p: p.name.lower()):
+            if item.is_file() and item.suffix.lower() in PROFILE_FILE_SUFFIXES:
+                files[item.name] = hashlib.sha1(item.read_bytes()).hexdigest()
+    return files
+
+def make_fingerprint(profile_files, mod_signatures, game_signature, options):
+    """Assembles the fingerprint dict. mod_signatures must be in priority order."""
+    options_hash = hashlib.sha1(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()
+    root = hash_leaves([
+        ("profile", hash_leaves(sorted(profile_files.items()))),
+        ("mods", hash_leaves(mod_signatures.items())),
+        ("game", game_signature),
+        ("options", options_hash)
+    ])
+    return {
+        "version": FINGERPRINT_VERSION,
+        "root": root,
+        "profile": profile_files,
+        "mods": mod_signatures,
+        "game": game_signature,
+        "options": options
+    }
+
+def diff_fingerprints(old, new):
+    """Names the leaves that differ between two fingerprints."""
+    old_profile, new_profile = old.get("profile", {}), new["profile"]
+    old_mods, new_mods = old.get("mods", {}), new["mods"]
+    old_options, new_options = old.get("options", {}), new["options"]
+    return {
+        "profile_files": sorted(name for name in set(old_profile) | set(new_profile) if old_profile.get(name) != new_profile.get(name)),
+        "mods_changed": [name for name in new_mods if name in old_mods and old_mods[name] != new_mods[name]],
+        "mods_added": [name for name in new_mods if name not in old_mods],
+        "mods_removed": [name for name in old_mods if name not in new_mods],
+        "mod_order_changed": [name for name in new_mods if name in old_mods] != [name for name in old_mods if name in new_mods],
+        "game_changed": old.get("game") != new["game"],
+        "options_changed": sorted(key for key in set(old_options) | set(new_options) if old_options.get(key) != new_options.get(key))
+    }
+
+def describe_diff(diff, limit=10):
+    """Human-readable lines for a fingerprint diff."""
+    lines = []
+    def names(items):
+        shown = ", ".join(items[:limit])
+        return shown + (f" (+{len(items) - limit} more)" if len(items) > limit else "")
+
+    if diff["profile_files"]:
+        lines.append(f"Profile files changed: {names(diff['profile_files'])}")
+    if diff["mods_changed"]:
+        lines.append(f"Mods changed on disk ({len(diff['mods_changed'])}): {names(diff['mods_changed'])}")
+    if diff["mods_added"]:
+        lines.append(f"Mods enabled ({len(diff['mods_added'])}): {names(diff['mods_added'])}")
+    if diff["mods_removed"]:
+        lines.append(f"Mods disabled ({len(diff['mods_removed'])}): {names(diff['mods_removed'])}")
+    if diff["mod_order_changed"]:
+        lines.append("Mod priority order changed")
+    if diff["game_changed"]:
+        lines.append("Game folder changed")
+    if diff["options_changed"]:
+        lines.append(f"Build options changed: {names(diff['options_changed'])}")
+    return lines
@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
 from datetime import datetime
+from snapshot_backup import SnapshotStore
 
 class ProfileSync:
     def __init__(self, mo2_path, profile_name, sa_path, docs_name="Skyrim Special Edition", appdata_name="Skyrim Special Edition", ini_prefix="Skyrim", game_name="Skyrim SE", portable_mode=True):
@@ -223,43 +224,28 @@ class ProfileSync:
             print(f"[ERROR] Failed to clean {custom_ini_name}: {e}")
 
     def backup_original_windows_data(self):
-        """Backs up original Windows Save/INI data to the internal backup folder for safety."""
+        """Backs up original Windows Save/INI data to the internal backup folder for safety.
+
+        Each backup is a snapshot (see snapshot_backup): files unchanged since the previous
+        snapshot are hardlinked from it, only new or changed ones are copied.
+        """
         print("[*] Backing up original game data for safety...")
-        
-        # Ensure backup root directory exists
-        self.backup_root.mkdir(parents=True, exist_ok=True)
 
-        # 1. Backup INIs
-        for ini in [f'{self.ini_prefix}.ini', f'{self.ini_prefix}Prefs.ini', f'{self.ini_prefix}Custom.ini']:
-            src = self.win_docs / ini
-            dst = self.backup_root / ini
-            if self._safe_copy(src, dst):
-                print(f"    -> Backed up: {ini}")
-
-        # 2. Backup Saves folder
-        src_saves = self.win_docs / "Saves"
-        dst_saves = self.backup_root / "Saves"
-        if src_saves.exists():
-            if dst_saves.exists():
-                shutil.rmtree(dst_saves) # Clear existing backup to ensure fresh copy
-            shutil.copytree(src_saves, dst_saves)
-            print("    -> Backed up Saves folder.")
-        else:
+        # 1. INIs, 2. Saves folder, 3. AppData (Plugins.txt, Loadorder.txt)
+        inis = [f'{self.ini_prefix}.ini', f'{self.ini_prefix}Prefs.ini', f'{self.ini_prefix}Custom.ini']
+        snapshot, stats = SnapshotStore(self.backup_root).create([
+            ("Documents", self.win_docs, inis),
+            ("Saves", self._get_saves_folder(self.win_docs), None),
+            ("AppData", self.win_appdata, None),
+        ], pin=("AppData",))  # the first AppData backup is the original the cleaner restores
+        if snapshot is None:
+            print("    -> Nothing found to backup.")
+            return
+        for part, (linked, copied) in stats.items():
+            print(f"    -> Backed up {part}: {copied} files copied, {linked} unchanged (linked)")
+        if "Saves" not in stats:
             print("    -> No Saves folder found to backup.")
-
-        # 3. Backup AppData (Plugins.txt, Loadorder.txt)
-        # Note: This part of the original code was backing up the entire AppData folder,
-        # which might be too broad. The instruction focused on INIs and Saves.
-        # For plugins/loadorder, it's usually just the .txt files.
-        # Keeping the original AppData backup logic for now, as the instruction didn't explicitly change it.
-        if self.win_appdata.exists():
-            app_backup = self.backup_root / "AppData"
-            if not app_backup.exists():
-                shutil.copytree(self.win_appdata, app_backup)
-                print(f"[+] AppData backup complete: {app_backup}")
-            else:
-                print(f"[-] AppData backup already exists: {app_backup}")
-
+        print(f"[+] Backup snapshot complete: {snapshot}")
 
     def deploy_mo2_profile(self):
         """Injects MO2 profile configuration (INIs & Plugins) into the Windows system."""
@@ -2,9 +2,12 @@ import json
 import sys
 from pathlib import Path
 from datetime import datetime
+from conflict_graph import CONFLICT_GRAPH_FILENAME, load_conflict_graph
+from link_strategy import LINK_STRATEGY_FILENAME, load_link_strategy
+from manifest_io import find_manifest
 
 class ReportGenerator:
-    def __init__(self, manifest_path=None, report_path=None, output_html=None):
+    def __init__(self, manifest_path=None, report_path=None, output_html=None, conflict_graph_path=None, link_strategy_path=None):
         # Determine Base Path (EXE vs Script)
         if getattr(sys, 'frozen', False):
             base_path = Path(sys.executable).parent
@@ -14,9 +17,108 @@ class ReportGenerator:
         # Default paths relative to the 'output' folder
         output_dir = base_path / "output"
         
-        self.manifest_path = Path(manifest_path) if manifest_path else output_dir / "mapping_manifest.json"
+        self.manifest_path = Path(manifest_path) if manifest_path else find_manifest(output_dir)
         self.report_path = Path(report_path) if report_path else output_dir / "execution_report.json"
         self.output_html = Path(output_html) if output_html else output_dir / "report_builder.html"
+        # The scanner writes the conflict graph next to the manifest
+        self.conflict_graph_path = Path(conflict_graph_path) if conflict_graph_path else self.manifest_path.with_name(CONFLICT_GRAPH_FILENAME)
+        # The linker writes its per-device decisions next to the execution report
+        self.link_strategy_path = Path(link_strategy_path) if link_strategy_path else self.report_path.with_name(LINK_STRATEGY_FILENAME)
+
+    def _link_strategy_section(self):
+        """HTML block with the hardlink/copy decision of every source device."""
+        if not self.link_strategy_path.exists():
+            return ""
+        try:
+            decisions = load_link_strategy(self.link_strategy_path)
+        except Exception as e:
+            print(f"[!] Warning: Could not read link strategy: {e}")
+            return ""
+        if not decisions:
+            return ""
+
+        chunks = ['<div class="header" style="border-left-color: #9b59b6;"><h2>Link Strategy</h2>']
+        chunks.append("""
+            <table>
+                <thead>
+                    <tr>
+                        <th style="width: 30%;">Layer: Source Device -> Target Device</th>
+                        <th style="width: 20%;">Method</th>
+                        <th style="width: 20%;">Reason</th>
+                        <th style="width: 15%;">Files</th>
+                        <th style="width: 15%;">Fallbacks / Policy Copies</th>
+                    </tr>
+                </thead>
+                <tbody>
+""")
+        for item in decisions:
+            chunks.append(f"""
+                    <tr>
+                        <td title="{item.get('probe', '')}">{item.get('layer', 'mods')}: {item['source_device']} -> {item['target_device']}</td>
+                        <td><span class="method-tag">{item['method']}</span></td>
+                        <td>{item.get('reason') or '-'}</td>
+                        <td>{item.get('files', 0)}</td>
+                        <td>{item.get('fallbacks', 0)} / {item.get('policy_copies', 0)}</td>
+                    </tr>
+""")
+        chunks.append("</tbody></table></div>")
+        return "".join(chunks)
+
+    def _conflict_graph_section(self, max_edges=25):
+        """HTML block with the heaviest mod overrides and the mods that contribute nothing."""
+        if not self.conflict_graph_path.exists():
+            return ""
+        try:
+            graph = load_conflict_graph(self.conflict_graph_path)
+        except Exception as e:
+            print(f"[!] Warning: Could not read conflict graph: {e}")
+            return ""
+
+        edges = graph.get("edges", [])
+        hidden = graph.get("hidden_mods", [])
+        empty = graph.get("empty_mods", [])
+        size_note = "" if graph.get("bytes_complete", True) else " (sizes of overridden files were not measured in this scan)"
+
+        chunks = ['<div class="header" style="border-left-color: #3498db;"><h2>Mod Conflict Graph</h2>']
+        chunks.append(f"<p>{len(edges)} mod pairs override each other. {len(hidden)} mod(s) are fully hidden and "
+                      f"{len(empty)} mod(s) provide no deployable files{size_note}.</p>")
+
+        if hidden or empty:
+            chunks.append('<div class="warning-box"><strong>Dead mods (pruning candidates):</strong><ul>')
+            for m in hidden:
+                chunks.append(f"<li>{m['mod']} &mdash; all {m['files']} file(s), {m['bytes'] / 1024 / 1024:.2f} MB, "
+                              f"overridden by {', '.join(m['hidden_by'])}</li>")
+            for name in empty:
+                chunks.append(f"<li>{name} &mdash; no deployable files</li>")
+            chunks.append('</ul></div>')
+
+        if edges:
+            chunks.append("""
+            <table>
+                <thead>
+                    <tr>
+                        <th style="width: 35%;">Winner</th>
+                        <th style="width: 35%;">Overrides</th>
+                        <th style="width: 15%;">Files</th>
+                        <th style="width: 15%;">Hidden MB</th>
+                    </tr>
+                </thead>
+                <tbody>
+""")
+            for edge in edges[:max_edges]:
+                chunks.append(f"""
+                    <tr>
+                        <td title="{edge['winner']}">{edge['winner']}</td>
+                        <td title="{edge['loser']}">{edge['loser']}</td>
+                        <td>{edge['files']}</td>
+                        <td>{edge['bytes'] / 1024 / 1024:.2f}</td>
+                    </tr>
+""")
+            chunks.append("</tbody></table>")
+            if len(edges) > max_edges:
+                chunks.append(f"<p>... and {len(edges) - max_edges} more pairs in {self.conflict_graph_path.name}.</p>")
+        chunks.append('</div>')
+        return "".join(chunks)
 
     def generate(self, verification_results=None, show_deployment=True):
         execution = {}
@@ -37,6 +139,11 @@ class ReportGenerator:
         
         hardlinks = 0
         copies = 0
+        reflinks = 0
+        symlinks = 0
+        unchanged = 0
+        dirlinked = 0
+        dirlink_folders = set()
         
         print(">>> Processing statistics...")
         for target, data in execution.items():
@@ -47,6 +154,12 @@ class ReportGenerator:
                 success_list.append((target, data))
                 if method == 'hardlink': hardlinks += 1
                 elif method == 'copy': copies += 1
+                elif method == 'reflink': reflinks += 1
+                elif method == 'symlink': symlinks += 1
+                elif method == 'unchanged': unchanged += 1
+                elif method == 'dirlink':
+                    dirlinked += 1
+                    dirlink_folders.add(data.get('dirlink'))
             else:
                 failed_list.append((target, data))
 
@@ -79,7 +192,7 @@ class ReportGenerator:
         body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #1a1a1a; color: #e0e0e0; margin: 20px; }}
         .container {{ max-width: 1200px; margin: auto; }}
         .header {{ background: #2d2d2d; padding: 20px; border-radius: 8px; border-left: 5px solid #4CAF50; margin-bottom: 20px; }}
-        .stats-grid {{ display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px; margin-bottom: 20px; }}
+        .stats-grid {{ display: grid; grid-template-columns: repeat(7, 1fr); gap: 15px; margin-bottom: 20px; }}
         .stat-card {{ background: #2d2d2d; padding: 15px; border-radius: 8px; text-align: center; box-shadow: 0 4px 6px rgba(0,0,0,0.3); }}
         .stat-card h3 {{ margin: 0; font-size: 14px; color: #888; }}
         .stat-card p {{ margin: 10px 0 0; font-size: 24px; font-weight: bold; color: #4CAF50; }}
@@ -114,6 +227,9 @@ class ReportGenerator:
             <div class="stat-card"><h3>Success</h3><p>{total_success}</p></div>
             <div class="stat-card"><h3>Hardlinks</h3><p>{hardlinks}</p></div>
             <div class="stat-card"><h3>Copies</h3><p>{copies}</p></div>
+            <div class="stat-card"><h3>Reflinks (CoW)</h3><p>{reflinks}</p></div>
+            <div class="stat-card"><h3>Symlinks</h3><p>{symlinks}</p></div>
+            <div class="stat-card"><h3>Unchanged</h3><p>{unchanged}</p></div>
         </div>
 """)
 
@@ -121,12 +237,13 @@ class ReportGenerator:
         if verification_results:
             missing = verification_results.get("missing_files", [])
             zeros = verification_results.get("zero_byte_files", [])
+            mismatched = verification_results.get("hash_mismatch", [])
             configs = verification_results.get("config_mismatch", [])
             saves = verification_results.get("save_issues", [])
             quarantined = verification_results.get("quarantined_items", [])
             has_historic = verification_results.get("has_historic_quarantine", False)
             
-            has_issues = any([missing, zeros, configs, saves])
+            has_issues = any([missing, zeros, mismatched, configs, saves])
             
             if has_issues:
                 html_chunks.append('<div class="error-box"><h3>⚠️ Post-Deployment Verification Warnings</h3><ul>')
@@ -142,6 +259,11 @@ class ReportGenerator:
                 
                 if zeros:
                     html_chunks.append(f"<li><strong>Zero-Byte Files:</strong> {len(zeros)} files have 0 bytes size.</li>")
+
+                if mismatched:
+                    html_chunks.append(f"<li><strong>Hash Mismatch:</strong> {len(mismatched)} copied files no longer match the hash recorded at deployment.</li>")
+                    for m in mismatched[:5]: html_chunks.append(f"<li>&nbsp;&nbsp;&bull; {m['file']} ({m['mod']})</li>")
+                    if len(mismatched) > 5: html_chunks.append(f"<li>&nbsp;&nbsp;&bull; ... and {len(mismatched)-5} more.</li>")
                 
                 if saves:
                      html_chunks.append(f"<li><strong>Save Sync Issue:</strong> {len(saves)} issue(s) with save files.</li>")
@@ -166,6 +288,19 @@ class ReportGenerator:
             if not has_issues and not quarantined and not has_historic:
                  html_chunks.append('<div class="success-box"><strong>✅ Verification Passed:</strong> All manifest files present, configs synced, and saves verified.</div>')
 
+        if show_deployment and dirlink_folders:
+            operations = total - dirlinked + len(dirlink_folders)
+            html_chunks.append(f"""
+        <div class="success-box">
+            <strong>Directory Links:</strong> {len(dirlink_folders)} single-mod folders provide {dirlinked} files through one directory symlink each.
+            Filesystem operations: <strong>{operations}</strong> instead of {total} file links ({(1 - operations / total) * 100 if total else 0:.1f}% fewer).
+        </div>
+""")
+
+        if show_deployment:
+            html_chunks.append(self._link_strategy_section())
+            html_chunks.append(self._conflict_graph_section())
+
         if is_truncated:
             html_chunks.append(f"""
         <div class="warning-box">
@@ -183,6 +318,11 @@ class ReportGenerator:
                 <button class="filter-btn" onclick="filterTable('FAILED', this)">Failures</button>
                 <button class="filter-btn" onclick="filterTable('hardlink', this)">Hardlinks</button>
                 <button class="filter-btn" onclick="filterTable('copy', this)">Copies</button>
+                <button class="filter-btn" onclick="filterTable('reflink', this)">Reflinks</button>
+                <button class="filter-btn" onclick="filterTable('symlink', this)">Symlinks</button>
+                <button class="filter-btn" onclick="filterTable('dirlink', this)">Dir Links</button>
+                <button class="filter-btn" onclick="filterTable('unchanged', this)">Unchanged</button>
+                <button class="filter-btn" onclick="filterTable('vanilla', this)">Vanilla</button>
             </div>
             
             <table id="reportTable">
@@ -201,10 +341,11 @@ class ReportGenerator:
                 mod_origin = data.get('mod', 'Unknown')
                 status = data.get('status', 'N/A')
                 method = data.get('method', 'N/A')
+                origin = data.get('origin', 'mod')
                 status_class = "status-success" if "SUCCESS" in status else "status-failed"
                 
                 html_chunks.append(f"""
-                    <tr data-status="{status}" data-method="{method}">
+                    <tr data-status="{status}" data-method="{method}" data-origin="{origin}">
                         <td title="{target}">{target}</td>
                         <td title="{mod_origin}">{mod_origin}</td>
                         <td class="{status_class}">{status}</td>
@@ -244,6 +385,7 @@ class ReportGenerator:
             rows.forEach(row => {
                 let status = row.getAttribute('data-status');
                 let method = row.getAttribute('data-method');
+                let origin = row.getAttribute('data-origin');
                 let text = row.textContent.toLowerCase();
                 
                 let matchesSearch = text.includes(search);
@@ -251,8 +393,10 @@ class ReportGenerator:
                 
                 if (currentFilter === 'FAILED') {
                     matchesFilter = status.includes('FAILED');
-                } else if (currentFilter === 'hardlink' || currentFilter === 'copy') {
+                } else if (currentFilter === 'hardlink' || currentFilter === 'copy' || currentFilter === 'reflink' || currentFilter === 'symlink' || currentFilter === 'dirlink' || currentFilter === 'unchanged') {
                     matchesFilter = (method === currentFilter);
+                } else if (currentFilter === 'vanilla') {
+                    matchesFilter = (origin === 'vanilla');
                 }
                 
                 row.style.display = (matchesSearch && matchesFilter) ? '' : 'none';
@@ -0,0 +1,243 @@
+"""Compiled include/exclude rules that decide which mod files the scanner deploys.
+
+Rules come from scan_rules.json (next to the tool) or from the built-in defaults, which
+reproduce the original hard-coded blacklist. Config layout:
+
+    {
+        "rules": [
+            {"name": "mo2-metadata", "action": "exclude", "files": ["meta.ini"]},
+            {"name": "keep-esp-docs", "action": "include", "globs": ["docs/*.esp"]},
+            {"name": "documentation", "action": "exclude", "dirs": ["docs"], "extensions": [".pdf"]}
+        ],
+        "mods": {
+            "Some Mod": [{"name": "no-psd", "action": "exclude", "regex": ["\\\\.psd$"]}]
+        }
+    }
+
+Rule keys:
+    files       exact file names
+    extensions  last file extension ('.pdf')
+    dirs        folder names at any depth (the whole folder and everything in it)
+    paths       paths relative to the mod folder; matches that folder/file and everything below it
+    globs       fnmatch patterns on the file path relative to the mod folder ('*' also matches '/')
+    regex       regular expressions searched in the file path relative to the mod folder
+
+All matching is case-insensitive and paths use '/' separators. Precedence is first match wins:
+the rules of the mod (from "mods") come first, then the global rules, each in file order.
+Files and folders that match no rule are included. An include rule therefore only matters
+when it is listed before an exclude rule that would otherwise match. This also holds inside
+excluded folders: such a folder is skipped without being listed unless an earlier include rule
+could match below it (like 'docs/*.esp' above); then it is walked and each of its files gets
+the first rule that matches it, the folder's rule included.
+"""
+import os
+import re
+import json
+import fnmatch
+import hashlib
+
+SCAN_RULES_FILENAME = "scan_rules.json"
+
+RULE_KEYS = ("files", "extensions", "dirs", "paths", "globs", "regex")
+
+DEFAULT_RULES = [
+    {
+        "name": "mod-metadata",
+        "action": "exclude",
+        "files": ['meta.ini', 'mo2_separator.txt', 'thumbs.db', 'desktop.ini',
+                  'readme.txt', 'credits.txt', 'changelog.txt', 'license.txt',
+                  'readme.md', 'credits.md', 'changelog.md']
+    },
+    {
+        "name": "documentation-dirs",
+        "action": "exclude",
+        "dirs": ['.hidden', 'fomod', 'readmes', 'readme', 'docs', 'documents',
+                 'credits', 'changelog', 'licenses']
+    },
+    {
+        "name": "office-documents",
+        "action": "exclude",
+        "extensions": ['.pdf', '.docx', '.xlsx', '.pptx', '.doc', '.xls', '.ppt']
+    }
+]
+
+_END = ""  # Trie key holding the rule index of a complete path ('' is never a path component)
+
+def _glob_may_match_below(glob_parts, dir_parts):
+    """False only when no file below the folder can match the glob (both split on '/', lowercase)."""
+    for depth, part in enumerate(dir_parts):
+        if depth >= len(glob_parts) - 1:
+            # The last glob part matches the file name; a wildcard in it may also span folders
+            return any(c in glob_parts[-1] for c in "*?")
+        if any(c in glob_parts[depth] for c in "*?"):
+            return True  # fnmatch wildcards also match '/', so anything below may follow
+        if not fnmatch.fnmatchcase(part, glob_parts[depth]):
+            return False
+    return True
+
+class CompiledRules:
+    """One ordered rule list compiled into dict lookups, a path trie and one combined regex."""
+
+    def __init__(self, rules):
+        self.names = [rule["name"] for rule in rules]
+        self.actions = [rule["action"] for rule in rules]
+        self.file_names = {}
+        self.extensions = {}
+        self.dir_names = {}
+        self.path_trie = {}
+        self._group_rules = {}
+        # (index, glob parts, path parts) of the include rules; parts are None when the rule can match anywhere
+        self._includes = []
+
+        patterns = []
+        for index, rule in enumerate(rules):
+            # setdefault keeps the first (highest precedence) rule for every key
+            for name in rule.get("files", []):
+                self.file_names.setdefault(name.lower(), index)
+            for ext in rule.get("extensions", []):
+                ext = ext.lower()
+                self.extensions.setdefault(ext if ext.startswith(".") else "." + ext, index)
+            for name in rule.get("dirs", []):
+                self.dir_names.setdefault(name.lower(), index)
+            for path in rule.get("paths", []):
+                node = self.path_trie
+                for part in path.replace("\\", "/").strip("/").lower().split("/"):
+                    node = node.setdefault(part, {})
+                node.setdefault(_END, index)
+
+            for glob in rule.get("globs", []):
+                patterns.append((index, fnmatch.translate(glob.replace("\\", "/"))))
+            for regex in rule.get("regex", []):
+                patterns.append((index, f".*?(?:{regex})"))
+
+            if rule["action"] == "include":
+                if any(key in rule for key in ("files", "extensions", "dirs", "regex")):
+                    self._includes.append((index, None, None))
+                else:
+                    self._includes.append((index,
+                                           [glob.replace("\\", "/").lower().split("/") for glob in rule.get("globs", [])],
+                                           [path.replace("\\", "/").strip("/").lower().split("/") for path in rule.get("paths", [])]))
+
+        # Alternatives are tried left to right, so the first matching group is the earliest rule
+        groups = []
+        for number, (index, pattern) in enumerate(patterns):
+            group = f"rule{number}"
+            self._group_rules[group] = index
+            groups.append(f"(?P<{group}>{pattern})")
+        self.pattern = re.compile("|".join(groups), re.IGNORECASE | re.DOTALL) if groups else None
+
+    def _decide(self, index):
+        """Name of the excluding rule, or None when the file is included."""
+        if index is None or self.actions[index] != "exclude":
+            return None
+        return self.names[index]
+
+    def child_node(self, node, lower_name):
+        """Trie node of a sub-folder (None once the path has left the trie)."""
+        return node.get(lower_name) if node else None
+
+    def match_dir(self, lower_name, node, rel_path, inherited=None):
+        """Decides a sub-folder: (name of the rule skipping it or None, rule index its contents inherit or None).
+
+        node is the folder's own trie node, rel_path its path relative to the mod folder and
+        inherited what its parent folder passed down. An excluded folder is only skipped when no
+        earlier include rule could match below it; otherwise it is walked and passes its rule down.
+        """
+        index = self.dir_names.get(lower_name)
+        if node:
+            path_index = node.get(_END)
+            if path_index is not None and (index is None or path_index < index):
+                index = path_index
+        if inherited is not None and (index is None or inherited < index):
+            index = inherited
+        if self._decide(index) is None:
+            return None, None
+        if self._include_below(rel_path, index):
+            return None, index
+        return self.names[index], None
+
+    def _include_below(self, rel_path, limit):
+        """True when an include rule before rule limit could match a file below folder rel_path."""
+        dir_parts = rel_path.lower().split("/")
+        for index, globs, paths in self._includes:
+            if index >= limit:
+                break
+            if globs is None:
+                return True  # file names, extensions, folder names and regexes can match at any depth
+            if any(_glob_may_match_below(glob_parts, dir_parts) for glob_parts in globs):
+                return True
+            if any(len(parts) > len(dir_parts) and parts[:len(dir_parts)] == dir_parts for parts in paths):
+                return True
+        return False
+
+    def match_file(self, lower_name, rel_path, parent_node, inherited=None):
+        """Name of the rule excluding a file, or None.
+
+        rel_path is the file path relative to the mod folder, parent_node the trie node of its folder
+        and inherited the rule index match_dir passed down to the folder.
+        """
+        index = self.file_names.get(lower_name)
+        if inherited is not None and (index is None or inherited < index):
+            index = inherited
+        ext_index = self.extensions.get(os.path.splitext(lower_name)[1])
+        if ext_index is not None and (index is None or ext_index < index):
+            index = ext_index
+        if parent_node:
+            node = parent_node.get(lower_name)
+            path_index = node.get(_END) if node else None
+            if path_index is not None and (index is None or path_index < index):
+                index = path_index
+        if self.pattern is not None and (index is None or index > 0):
+            m = self.pattern.match(rel_path)
+            if m:
+                regex_index = self._group_rules[m.lastgroup]
+                if index is None or regex_index < index:
+                    index = regex_index
+        return self._decide(index)
+
+class ScanRules:
+    """Global rules plus per-mod overrides; compiled rule sets are cached per mod."""
+
+    def __init__(self, rules=None, mod_rules=None):
+        self.rules = [self._validate(rule) for rule in (DEFAULT_RULES if rules is None else rules)]
+        self.mod_rules = {mod: [self._validate(rule) for rule in items] for mod, items in (mod_rules or {}).items()}
+        self.global_rules = CompiledRules(self.rules)
+        self._compiled = {}
+        self.signature = hashlib.sha1(json.dumps([self.rules, self.mod_rules], sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _validate(rule):
+        if rule.get("action") not in ("include", "exclude"):
+            raise ValueError(f"Scan rule {rule.get('name')!r}: action must be 'include' or 'exclude'.")
+        if not any(key in rule for key in RULE_KEYS):
+            raise ValueError(f"Scan rule {rule.get('name')!r} has none of: {', '.join(RULE_KEYS)}.")
+        for regex in rule.get("regex", []):
+            try:
+                re.compile(regex)
+            except re.error as e:
+                raise ValueError(f"Scan rule {rule.get('name')!r}: invalid regex {regex!r} ({e})")
+        rule = dict(rule)
+        rule.setdefault("name", f"{rule['action']}:{','.join(k for k in RULE_KEYS if k in rule)}")
+        return rule
+
+    @classmethod
+    def load(cls, config_path):
+        """Reads a rules config; the built-in defaults are used when the file does not exist."""
+        if not config_path.exists():
+            return cls()
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except Exception as e:
+            raise ValueError(f"Could not read scan rules from {config_path}: {e}")
+        print(f"[*] Using scan rules from: {config_path}")
+        return cls(config.get("rules"), config.get("mods"))
+
+    def for_mod(self, mod_name):
+        """Compiled rules for one mod (its own rules first, then the global rules)."""
+        if mod_name not in self.mod_rules:
+            return self.global_rules
+        compiled = self._compiled.get(mod_name)
+        if compiled is None:
+            compiled = self._compiled[mod_name] = CompiledRules(self.mod_rules[mod_name] + self.rules)
+        return compiled
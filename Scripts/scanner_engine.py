@@ -1,10 +1,27 @@
 import os
 import sys
 import json
+import hashlib
 import tkinter as tk
 from tkinter import filedialog
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
+from manifest_io import write_manifest, MANIFEST_FILENAME
+from manifest_model import CompactManifest, ManifestEntry
+from manifest_db import ManifestDatabase, db_path_for
+from conflict_graph import CONFLICT_GRAPH_FILENAME, build_conflict_graph, write_conflict_graph
+from scan_rules import SCAN_RULES_FILENAME, ScanRules, CompiledRules
+from profile_fingerprint import hash_profile_files, make_fingerprint
+from dir_links import DIR_LINKS_FILENAME, find_dir_links, write_dir_links
+
+# Worker count used by the build pipeline for parallel scanning (mirrors ThreadPoolExecutor's default)
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Bump when the layout of scan_cache.json entries changes
+SCAN_CACHE_VERSION = 5
+
+WINNER_CHANGES_FILENAME = "winner_changes.json"
 
 class ScannerEngine:
     def __init__(self, mo2_path, profile_name):
@@ -23,18 +40,22 @@ class ScannerEngine:
         # Output directory
         self.output_dir = base_path / "output"
         self.output_dir.mkdir(exist_ok=True)
-        self.output_manifest = self.output_dir / "mapping_manifest.json"
+        self.output_manifest = self.output_dir / MANIFEST_FILENAME
         
-        self.blacklist_files = [
-            'meta.ini', 'mo2_separator.txt', 'thumbs.db', 'desktop.ini',
-            'readme.txt', 'credits.txt', 'changelog.txt', 'license.txt',
-            'readme.md', 'credits.md', 'changelog.md'
-        ]
-        self.blacklist_dirs = [
-            '.hidden', 'fomod', 'readmes', 'readme', 'docs', 'documents', 
-            'credits', 'changelog', 'licenses'
-        ]
-        self.blacklist_extensions = ['.pdf', '.docx', '.xlsx', '.pptx', '.doc', '.xls', '.ppt']
+        # Include/exclude rules (scan_rules.json next to the tool, built-in blacklist otherwise)
+        self.scan_rules = ScanRules.load(base_path / SCAN_RULES_FILENAME)
+        # rule name -> [files, bytes, folders] excluded by the last scan
+        self.exclusion_stats = {}
+        # Tree signatures computed by build_fingerprint, used once by the next scan: (folder, mod) -> signature
+        self._signature_memo = {}
+
+        # Result of the last scan (CompactManifest) and its losing providers:
+        # target_key -> [(mod name, size_bytes)], highest priority first
+        self.manifest = None
+        self.conflicts = {}
+        self.conflict_graph = None
+        # Folders the linker may deploy as one directory symlink (build_mapping(dir_links=True))
+        self.dir_links = []
 
     def _get_active_mods(self):
         if not self.modlist_txt.exists():
@@ -49,63 +70,463 @@ class ScannerEngine:
                     active_mods.append(line[1:])
         return active_mods
 
-    def _scan_folder(self, folder_path, mod_name, mapping_table):
-        """Fungsi pembantu untuk memindai folder dan mengisi mapping_table."""
-        for root, dirs, files in os.walk(folder_path):
-            dirs[:] = [d for d in dirs if d.lower() not in self.blacklist_dirs]
+    def _scan_folder(self, folder_path, mod_name, manifest):
+        """Fungsi pembantu untuk memindai folder dan mengisi manifest."""
+        records = self._collect_folder(folder_path, mod_name, [], self.exclusion_stats)
+        self._merge_records(manifest, folder_path, mod_name, records)
+
+    def _merge_records(self, manifest, folder_path, mod_name, records):
+        """Applies one folder's file records on top of the manifest (later folders win)."""
+        mod_index = manifest.intern_mod(mod_name, str(folder_path).replace("\\", "/"))
+        entries = manifest.entries
+        for target_key, rel_source, is_root, size_bytes, st_ino, st_dev, st_mtime_ns in records:
+            # Menimpa entri sebelumnya jika file sama ditemukan
+            held = entries.get(target_key)
+            if held is not None and held.mod != mod_index:
+                self._record_conflict(target_key, manifest.mod_names[held.mod], held.size_bytes)
+            entries[target_key] = ManifestEntry(mod_index, rel_source, is_root, size_bytes, st_ino, st_dev, st_mtime_ns)
+
+    def _record_conflict(self, target_key, loser_mod, size_bytes, highest_first=False):
+        """Remembers a mod that provides target_key but loses it to a higher-priority mod.
+
+        size_bytes is the size of the loser's copy (None if it was not statted).
+        """
+        losers = self.conflicts.setdefault(target_key, [])
+        if highest_first:
+            losers.append((loser_mod, size_bytes))
+        else:
+            losers.insert(0, (loser_mod, size_bytes))
+
+    def _make_record(self, target_key, rel_source, is_root, st):
+        """File record (target, source relative to its mod folder, is_root, size, inode, device, mtime).
+
+        st comes from DirEntry.stat(), so nothing is re-statted. st_ino/st_dev are 0 where the
+        platform does not report them from a directory listing (Windows); later stages treat 0
+        as unknown and stat the source themselves.
+        """
+        return (target_key, rel_source, is_root, st.st_size, st.st_ino, st.st_dev, st.st_mtime_ns)
+
+    def _count_exclusion(self, excluded, rule_name, files=0, size_bytes=0, folders=0):
+        stats = excluded.setdefault(rule_name, [0, 0, 0])
+        stats[0] += files
+        stats[1] += size_bytes
+        stats[2] += folders
+
+    def _walk_tree(self, folder_path, dir_states, rules, excluded=None):
+        """Depth-first os.scandir walk in os.walk (topdown) order, skipping excluded folders.
+
+        Yields (folder, trie node, entries, inherited rule index) and records each folder's (relative
+        path, mtime, inode, entry count) in dir_states. Skipped folders are counted in 'excluded'
+        (rule -> stats); excluded folders that an earlier include rule reaches into are walked and
+        pass their rule index down to their files instead.
+        """
+        base = str(folder_path)
+        base_len = len(base) + 1
+        pending = [(base, rules.path_trie, None)]
+        while pending:
+            root, node, inherited = pending.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+                root_stat = os.stat(root)
+            except OSError:
+                continue  # os.walk silently skips unreadable folders too
+
+            dir_states.append((root[len(base):], root_stat.st_mtime_ns, root_stat.st_ino, len(entries)))
+            yield root, node, entries, inherited
+
+            rel_prefix = root[base_len:].replace("\\", "/")
+            rel_prefix = rel_prefix + "/" if rel_prefix else ""
+            sub_dirs = []
+            for e in entries:
+                if not e.is_dir() or e.is_symlink():
+                    continue
+                lower_name = e.name.lower()
+                child = rules.child_node(node, lower_name)
+                rule_name, child_inherited = rules.match_dir(lower_name, child, rel_prefix + e.name, inherited)
+                if rule_name is not None:
+                    if excluded is not None:
+                        self._count_exclusion(excluded, rule_name, folders=1)
+                    continue
+                sub_dirs.append((e.path, child, child_inherited))
+            pending.extend(reversed(sub_dirs))
+
+    def _iter_files(self, folder_path, mod_name, dir_states, excluded=None):
+        """Yields (entry, target_key, rel_source, is_root) for every included file of a folder.
+
+        Paths are built by plain string joins; the target prefix is resolved once per folder.
+        Excluded files are counted in 'excluded' (rule -> [files, bytes, folders]).
+        """
+        rules = self.scan_rules.for_mod(mod_name)
+        base_len = len(str(folder_path)) + 1
+        for root, node, entries, inherited in self._walk_tree(folder_path, dir_states, rules, excluded):
+            root_fwd = root.replace("\\", "/")
+            rel_dir = root_fwd[base_len:]
+            rel_prefix = rel_dir + "/" if rel_dir else ""
+
+            # Target folder for this directory ('root' -> game root, 'data' kept, else under Data/)
+            top, _, rest = rel_dir.partition("/")
+            if not rel_dir:
+                prefix = None  # files directly in the mod folder
+            elif top.lower() == 'root':
+                prefix, is_root = (rest + "/" if rest else ""), True
+            elif top.lower() == 'data':
+                prefix, is_root = rel_dir + "/", False
+            else:
+                prefix, is_root = "Data/" + rel_dir + "/", False
+
+            for entry in entries:
+                if entry.is_dir():
+                    continue
 
-            for file_name in files:
-                ext = Path(file_name).suffix.lower()
-                if file_name.lower() in self.blacklist_files or ext in self.blacklist_extensions:
+                name = entry.name
+                lower_name = name.lower()
+                rule_name = rules.match_file(lower_name, rel_prefix + name, node, inherited)
+                if rule_name is not None:
+                    if excluded is not None:
+                        self._count_exclusion(excluded, rule_name, files=1, size_bytes=entry.stat().st_size)
                     continue
 
-                full_source = Path(root) / file_name
-                rel_path = full_source.relative_to(folder_path)
-                parts = rel_path.parts
-                
-                if parts[0].lower() == 'root':
-                    target_path = Path(*parts[1:])
-                    is_root = True
-                elif parts[0].lower() == 'data':
-                    target_path = rel_path
-                    is_root = False
+                if prefix is not None:
+                    target_key = prefix + name
+                elif lower_name == 'root':
+                    target_key, is_root = ".", True
+                elif lower_name == 'data':
+                    target_key, is_root = name, False
                 else:
-                    target_path = Path("Data") / rel_path
-                    is_root = False
-                
-                target_key = str(target_path).replace("\\", "/")
-                
-                # Menimpa entri sebelumnya jika file sama ditemukan
-                mapping_table[target_key] = {
-                    "source": str(full_source).replace("\\", "/"),
-                    "mod_origin": mod_name,
-                    "is_root": is_root,
-                    "size_bytes": full_source.stat().st_size
-                }
-
-    def build_mapping(self):
+                    target_key, is_root = "Data/" + name, False
+
+                yield entry, target_key, rel_prefix + name, is_root
+
+    def _scan_folder_winner_first(self, folder_path, mod_name, manifest):
+        """Claims the targets of a folder that no higher-priority folder has claimed yet.
+
+        Folders must be visited from highest to lowest priority. Targets that are already claimed
+        are only recorded as conflicts, without the stat call (so their size is unknown).
+        """
+        mod_index = manifest.intern_mod(mod_name, str(folder_path).replace("\\", "/"))
+        entries = manifest.entries
+        for entry, target_key, rel_source, is_root in self._iter_files(folder_path, mod_name, [], self.exclusion_stats):
+            # A target claimed by a higher-priority mod ships from there; within the same
+            # mod the later file wins, exactly like the serial scan.
+            claimed = entries.get(target_key)
+            if claimed is not None and claimed.mod != mod_index:
+                self._record_conflict(target_key, mod_name, None, highest_first=True)
+                continue
+
+            st = entry.stat()
+            entries[target_key] = ManifestEntry(mod_index, rel_source, is_root, st.st_size, st.st_ino, st.st_dev, st.st_mtime_ns)
+
+    def _hash_tree(self, dir_states):
+        """Reduces the folder states of a mod to a single signature string."""
+        digest = hashlib.sha1()
+        for state in dir_states:
+            digest.update(repr(state).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _tree_signature(self, folder_path, mod_name):
+        """Signature of a mod folder tree, computed from folder listings only (no per-file stat)."""
+        dir_states = []
+        for _ in self._walk_tree(folder_path, dir_states, self.scan_rules.for_mod(mod_name)):
+            pass
+        return self._hash_tree(dir_states)
+
+    def _current_signature(self, folder_path, mod_name):
+        """Tree signature, taken from build_fingerprint's walk when it already computed it."""
+        signature = self._signature_memo.pop((str(folder_path), mod_name), None)
+        return signature if signature is not None else self._tree_signature(folder_path, mod_name)
+
+    def build_fingerprint(self, game_path=None, options=None, workers=1):
+        """Merkle fingerprint of the profile files, the active mods, the game folder and the build options.
+
+        Mods are fingerprinted by tree signature (folder listings only), so files edited in place
+        without renaming are not detected. The signatures are reused by the next build_mapping call.
+        """
         active_mods = self._get_active_mods()
-        mapping_table = {}
+        folders = [(mod_name, self.mods_dir / mod_name) for mod_name in active_mods]
+        folders.append(("MO2_Overwrite", self.overwrite_dir))
+
+        def signature(item):
+            mod_name, folder = item
+            if not folder.is_dir():
+                return "missing"
+            tree_signature = self._signature_memo[(str(folder), mod_name)] = self._tree_signature(folder, mod_name)
+            return tree_signature
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            mod_signatures = dict(zip([mod_name for mod_name, _ in folders], pool.map(signature, folders)))
+
+        game_signature = "missing"
+        if game_path and Path(game_path).is_dir():
+            dir_states = []
+            for _ in self._walk_tree(Path(game_path), dir_states, CompiledRules([])):
+                pass
+            game_signature = self._hash_tree(dir_states)
+
+        options = dict(options or {}, scan_rules=self.scan_rules.signature)
+        return make_fingerprint(hash_profile_files(self.profile_path), mod_signatures, game_signature, options)
+
+    def _collect_folder(self, folder_path, mod_name, dir_states, excluded=None):
+        """Scans one folder and returns its file records in os.walk order,
+        so results can be merged by priority later.
+        """
+        return [
+            self._make_record(target_key, rel_source, is_root, entry.stat())
+            for entry, target_key, rel_source, is_root in self._iter_files(folder_path, mod_name, dir_states, excluded)
+        ]
+
+    def _load_scan_cache(self, cache_file):
+        """Loads the scan index of the previous scan (empty if missing, outdated or unreadable).
+
+        The index holds per-mod file lists ("mods"), including mods that were disabled since,
+        and the priority order that was resolved ("active_order", "missing" for active mods without a folder).
+        """
+        if not cache_file.exists():
+            return {}
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[!] Warning: Could not read scan cache, doing a full scan: {e}")
+            return {}
+
+        # Cached file lists are only valid for the same format and the same scan rules
+        if data.get("cache_version") != SCAN_CACHE_VERSION or data.get("scan_rules") != self.scan_rules.signature:
+            return {}
+        return data
+
+    def _save_scan_cache(self, cache_file, mods, active_order, missing):
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({"cache_version": SCAN_CACHE_VERSION, "scan_rules": self.scan_rules.signature,
+                           "active_order": active_order, "missing": missing, "mods": mods}, f)
+        except Exception as e:
+            print(f"[!] Warning: Could not save scan cache: {e}")
+
+    def _load_mod(self, folder_path, mod_name, cache, trust_cache=False):
+        """Returns (collected, cache_record, reused) for one folder.
+
+        The cached file list is reused when the folder tree signature (folder mtimes, inodes and
+        entry counts) is unchanged; otherwise the folder is rescanned. cache=None always rescans.
+        trust_cache reuses the cached list without touching the disk.
+        """
+        cached = cache.get(mod_name) if cache is not None else None
+        if cached and cached["folder"] == str(folder_path) and (trust_cache or cached["signature"] == self._current_signature(folder_path, mod_name)):
+            return [tuple(item) for item in cached["entries"]], cached, True
+
+        dir_states = []
+        excluded = {}
+        collected = self._collect_folder(folder_path, mod_name, dir_states, excluded)
+        record = {"folder": str(folder_path), "signature": self._hash_tree(dir_states), "entries": collected, "excluded": excluded}
+        return collected, record, False
+
+    def _index_is_current(self, cache, known_missing, active_mods, workers=1):
+        """True when the scan index covers every active mod and no mod folder tree changed since.
+
+        Signatures build_fingerprint already computed are reused; the ones computed here stay
+        memoized for the scan that follows.
+        """
+        folders = []
+        for mod_name in active_mods:
+            folder = self.mods_dir / mod_name
+            if mod_name in cache:
+                if cache[mod_name]["folder"] != str(folder) or not folder.is_dir():
+                    return False
+                folders.append((folder, mod_name))
+            elif mod_name not in known_missing or folder.exists():
+                return False
+
+        def signature(item):
+            folder, mod_name = item
+            key = (str(folder), mod_name)
+            if key not in self._signature_memo:
+                self._signature_memo[key] = self._tree_signature(folder, mod_name)
+            return self._signature_memo[key]
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            signatures = list(pool.map(signature, folders))
+        return all(sig == cache[mod_name]["signature"] for (_, mod_name), sig in zip(folders, signatures))
+
+    def _scan_parallel(self, folders, manifest, workers, cache, trust_cache=False):
+        """Walks folders in a bounded thread pool and merges the results in priority order.
+
+        folders is a list of (folder_path, mod_name, cacheable); folders that are not cacheable are
+        always rescanned but still recorded. Returns the new cache records.
+        """
+        new_cache = {}
+        reused = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda item: self._load_mod(item[0], item[1], cache if item[2] else None, trust_cache), folders)
+            for (folder_path, mod_name, cacheable), (collected, record, was_reused) in tqdm(zip(folders, results), total=len(folders), desc="Scanning Mods"):
+                self._merge_records(manifest, folder_path, mod_name, collected)
+                for rule_name, (files, size_bytes, dirs) in record["excluded"].items():
+                    self._count_exclusion(self.exclusion_stats, rule_name, files, size_bytes, dirs)
+                new_cache[mod_name] = record
+                reused += was_reused
+                if was_reused:
+                    manifest.cached_mods.add(mod_name)
+
+        if cache:
+            print(f"[*] Scan cache: {reused} mods reused, {len(new_cache) - reused} mods rescanned.")
+        return new_cache
+
+    def _indexed_winners(self, index):
+        """Target -> winning mod name under the priority order stored in a scan index."""
+        mods = index.get("mods", {})
+        winners = {}
+        for mod_name in index["active_order"] + ["MO2_Overwrite"]:
+            record = mods.get(mod_name)
+            if record:
+                for item in record["entries"]:
+                    winners[item[0]] = mod_name
+        return winners
+
+    def _write_winner_changes(self, previous_winners, manifest):
+        """Writes the targets whose winning mod differs from the previous resolution."""
+        changed = []
+        added = []
+        for target, entry in manifest.entries.items():
+            previous = previous_winners.pop(target, None)
+            current = manifest.mod_names[entry.mod]
+            if previous is None:
+                added.append(target)
+            elif previous != current:
+                changed.append({"target": target, "previous": previous, "current": current})
+        removed = list(previous_winners)
+
+        changes_path = self.output_manifest.with_name(WINNER_CHANGES_FILENAME)
+        with open(changes_path, 'w', encoding='utf-8') as f:
+            json.dump({"changed": changed, "added": added, "removed": removed}, f, indent=4)
+        print(f"[*] Winner changes since last scan: {len(changed)} changed, {len(added)} added, {len(removed)} removed.")
+        return changes_path
+
+    def build_mapping(self, workers=1, use_cache=False, winner_first=False, write_db=False, reresolve=False, dir_links=False):
+        """Scans all active mods into the manifest.
+
+        workers=1 scans folder by folder (reference order); higher values walk mod folders in parallel.
+        use_cache reuses the file lists of unchanged mods from scan_cache.json (stored next to
+        the manifest). The 'overwrite' folder is always rescanned. All paths produce an identical manifest.
+
+        winner_first resolves from the highest priority down and skips the stat call for files
+        that lose their conflict. It resolves the same winners, but the manifest is ordered by
+        priority (highest first) and workers/use_cache are not used.
+
+        reresolve computes the manifest in memory from the scan index when every active mod is
+        indexed and no mod folder tree signature changed (e.g. modlist.txt only changed in order or
+        enabled flags); only 'overwrite' is rescanned. The signatures of a preceding build_fingerprint
+        call are reused. Otherwise a normal cached scan runs, which rescans the changed mods.
+        Cached scans also write winner_changes.json (targets whose winner changed).
+
+        write_db also writes the SQLite target/provider index (manifest_index.sqlite) next to the manifest.
+        The mod conflict graph (conflict_graph.json) is always written next to the manifest.
+        dir_links also writes dir_links.json: folders owned by one mod that the linker can deploy
+        with a single directory symlink.
+        """
+        active_mods = self._get_active_mods()
+        manifest = CompactManifest()
+        self.conflicts = {}
+        self.exclusion_stats = {}
         
         print(f"\n[*] Processing Profile: {self.profile_path.name}")
         
-        # 1. Scan Mods from Modlist (Priority Order)
-        print(f"[*] Scanning {len(active_mods)} mods...")
-        for mod_name in tqdm(active_mods, desc="Scanning Mods"):
-            mod_folder = self.mods_dir / mod_name
-            if mod_folder.exists():
-                self._scan_folder(mod_folder, mod_name, mapping_table)
-
-        # 2. Scan Overwrite Folder (Highest / Last Priority)
-        if self.overwrite_dir.exists():
-            print(f"[*] Including 'overwrite' folder as highest priority...")
-            self._scan_folder(self.overwrite_dir, "MO2_Overwrite", mapping_table)
-
-        with open(self.output_manifest, 'w', encoding='utf-8') as f:
-            json.dump(mapping_table, f, indent=4)
+        if winner_first:
+            # Winner-First Scan: Overwrite first, then mods from highest to lowest priority
+            print(f"[*] Scanning {len(active_mods)} mods (winner-first)...")
+            if self.overwrite_dir.exists():
+                print(f"[*] Including 'overwrite' folder as highest priority...")
+                self._scan_folder_winner_first(self.overwrite_dir, "MO2_Overwrite", manifest)
+
+            for mod_name in tqdm(list(reversed(active_mods)), desc="Scanning Mods"):
+                mod_folder = self.mods_dir / mod_name
+                if mod_folder.exists():
+                    self._scan_folder_winner_first(mod_folder, mod_name, manifest)
+        elif workers > 1 or use_cache or reresolve:
+            # Parallel / Cached Scan: mods + overwrite, merged in the same priority order as the serial scan
+            use_cache = use_cache or reresolve
+            cache_file = self.output_manifest.with_name("scan_cache.json")
+            index = self._load_scan_cache(cache_file) if use_cache else {}
+            cache = index.get("mods", {})
+            known_missing = set(index.get("missing", []))
+
+            trust_cache = reresolve and self._index_is_current(cache, known_missing, active_mods, workers)
+            if trust_cache:
+                print(f"[*] Re-resolving {len(active_mods)} mods from the scan index (no rescan)...")
+                folders = [(self.mods_dir / mod_name, mod_name, True) for mod_name in active_mods if mod_name in cache]
+            else:
+                if reresolve:
+                    print(f"[!] Mod folders changed or are not in the scan index, scanning the changed mods instead.")
+                print(f"[*] Scanning {len(active_mods)} mods ({workers} workers)...")
+                folders = [(self.mods_dir / mod_name, mod_name, True) for mod_name in active_mods if (self.mods_dir / mod_name).exists()]
+            if self.overwrite_dir.exists():
+                print(f"[*] Including 'overwrite' folder as highest priority...")
+                folders.append((self.overwrite_dir, "MO2_Overwrite", False))
+            new_cache = self._scan_parallel(folders, manifest, max(workers, 1), cache, trust_cache)
+
+            if use_cache:
+                if "active_order" in index:
+                    self._write_winner_changes(self._indexed_winners(index), manifest)
+                # Keep the file lists of disabled mods so enabling them again needs no rescan
+                for mod_name, record in cache.items():
+                    if mod_name not in new_cache and mod_name != "MO2_Overwrite" and os.path.isdir(record["folder"]):
+                        new_cache[mod_name] = record
+                scanned = {mod_name for _, mod_name, _ in folders}
+                self._save_scan_cache(cache_file, new_cache, active_mods, [m for m in active_mods if m not in scanned])
+        else:
+            # 1. Scan Mods from Modlist (Priority Order)
+            print(f"[*] Scanning {len(active_mods)} mods...")
+            for mod_name in tqdm(active_mods, desc="Scanning Mods"):
+                mod_folder = self.mods_dir / mod_name
+                if mod_folder.exists():
+                    self._scan_folder(mod_folder, mod_name, manifest)
+
+            # 2. Scan Overwrite Folder (Highest / Last Priority)
+            if self.overwrite_dir.exists():
+                print(f"[*] Including 'overwrite' folder as highest priority...")
+                self._scan_folder(self.overwrite_dir, "MO2_Overwrite", manifest)
+
+        write_manifest(self.output_manifest, manifest.items(), count=len(manifest), mod_roots=manifest.roots_by_name(),
+                       cached_mods=sorted(manifest.cached_mods))
+        self.manifest = manifest
+        self._signature_memo = {}
+
+        self.conflict_graph = build_conflict_graph(manifest, self.conflicts)
+        graph_path = self.output_manifest.with_name(CONFLICT_GRAPH_FILENAME)
+        write_conflict_graph(graph_path, self.conflict_graph)
+
+        # A stale list must not outlive a scan that did not ask for one
+        links_path = self.output_manifest.with_name(DIR_LINKS_FILENAME)
+        self.dir_links = find_dir_links(manifest) if dir_links else []
+        if dir_links:
+            write_dir_links(links_path, self.dir_links)
+        elif links_path.exists():
+            links_path.unlink()
+
+        if write_db:
+            db_path = db_path_for(self.output_manifest)
+            with ManifestDatabase(db_path) as db:
+                db.write_scan(active_mods + ["MO2_Overwrite"], manifest, self.conflicts)
+            print(f"[*] Conflict index saved at: {db_path}")
         
         print(f"\n[SUCCESS]")
-        print(f"Total unique files: {len(mapping_table)}")
+        print(f"Total unique files: {len(manifest)}")
+        print(f"Conflicting files: {len(self.conflicts)}")
+        if self.conflict_graph["hidden_mods"]:
+            print(f"Fully hidden mods: {len(self.conflict_graph['hidden_mods'])} (every file overridden)")
+        if self.conflict_graph["empty_mods"]:
+            print(f"Empty mods: {len(self.conflict_graph['empty_mods'])} (no deployable files)")
+        print(f"Conflict graph saved at: {os.path.abspath(graph_path)}")
+        if dir_links:
+            linked_files = sum(link["files"] for link in self.dir_links)
+            print(f"Directory links: {len(self.dir_links)} single-mod folders cover {linked_files} files")
+        if self.exclusion_stats:
+            print("Excluded by scan rules:")
+            for rule_name, (files, size_bytes, dirs) in sorted(self.exclusion_stats.items(), key=lambda item: -item[1][1]):
+                parts = []
+                if files:
+                    parts.append(f"{files} files ({size_bytes / 1024 / 1024:.2f} MB)")
+                if dirs:
+                    parts.append(f"{dirs} folders skipped")
+                print(f"  - {rule_name}: {', '.join(parts)}")
         print(f"Manifest saved at: {os.path.abspath(self.output_manifest)}")
 
 
@@ -123,8 +544,11 @@ if __name__ == "__main__":
     import sys
     if len(sys.argv) > 2:
         mo2_path, profile_name = sys.argv[1], sys.argv[2]
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
         scanner = ScannerEngine(mo2_path, profile_name)
-        scanner.build_mapping()
+        if "--gzip" in sys.argv:
+            scanner.output_manifest = scanner.output_dir / (MANIFEST_FILENAME + ".gz")
+        scanner.build_mapping(workers=workers, use_cache="--cache" in sys.argv, winner_first="--winner-first" in sys.argv, write_db="--db" in sys.argv, reresolve="--reresolve" in sys.argv, dir_links="--dir-links" in sys.argv)
     else:
         # UI for manual execution
         try:
@@ -0,0 +1,142 @@
+"""Shadow-tree builds: a new Standalone generation is assembled next to the live one and swapped in.
+
+A full build goes to '<Standalone>.staging', a sibling folder on the same drive: renames there
+are cheap, and copied files of the live build can be hardlinked instead of copied again. Once the
+build is complete, the live folder becomes '<Standalone>.previous' and the staging folder takes
+its name. The game is only unavailable between those two renames, and a build that fails leaves
+the live folder untouched. The previous generation is kept for a rollback, which swaps the two
+folders back. Generations that are dropped go to the trash and are deleted in the background.
+"""
+import os
+import sys
+from pathlib import Path
+from trash_bin import discard
+
+STAGING_SUFFIX = ".staging"
+PREVIOUS_SUFFIX = ".previous"
+
+# Temporary names while generations change places
+TRASH_SUFFIX = ".trash"
+ROLLBACK_SUFFIX = ".rollback"
+
+# Generations of a Standalone folder ('<Standalone><suffix>'); their trash is swept on startup
+GENERATION_SUFFIXES = ("", STAGING_SUFFIX, PREVIOUS_SUFFIX, TRASH_SUFFIX)
+
+# Portable saves and settings: they stay live when a rollback swaps the generations
+PROFILE_DIR = "_profile"
+
+class ShadowBuild:
+    def __init__(self, sa_path):
+        self.sa_path = Path(sa_path)
+        self.staging_path = self.sa_path.with_name(self.sa_path.name + STAGING_SUFFIX)
+        self.previous_path = self.sa_path.with_name(self.sa_path.name + PREVIOUS_SUFFIX)
+        self.trash_path = self.sa_path.with_name(self.sa_path.name + TRASH_SUFFIX)
+
+    def prepare(self, resume=False):
+        """Creates an empty staging folder, removing what a failed build left behind. Returns its path.
+
+        With resume, an interrupted build in the staging folder is kept to be continued.
+        """
+        if resume and self.staging_path.is_dir():
+            print(f"[*] Continuing the interrupted build in {self.staging_path}")
+            return self.staging_path
+        if os.path.lexists(self.staging_path):
+            print(f"[*] Moving the unfinished build in {self.staging_path} to the trash...")
+            discard(self.staging_path)
+        self.staging_path.mkdir(parents=True)
+        return self.staging_path
+
+    def discard_staging(self):
+        discard(self.staging_path)
+
+    def discard_previous(self):
+        if discard(self.previous_path):
+            print(f"  [Deleted] {self.previous_path.name} (in the background)")
+
+    def swap(self):
+        """Makes the staging folder the live Standalone; the live one becomes the previous generation.
+
+        The older previous generation is renamed out of the way first and only deleted (in the
+        background) once the new build is live. If a rename fails (e.g. the game is still running), every folder is
+        put back and the error is raised.
+        """
+        if not self.staging_path.is_dir():
+            raise FileNotFoundError(f"No staged build found at {self.staging_path}")
+        discard(self.trash_path)
+
+        had_previous = os.path.lexists(self.previous_path)
+        had_live = os.path.lexists(self.sa_path)
+        if had_previous:
+            os.rename(self.previous_path, self.trash_path)
+        try:
+            if had_live:
+                os.rename(self.sa_path, self.previous_path)
+            try:
+                os.rename(self.staging_path, self.sa_path)
+            except OSError:
+                if had_live:
+                    os.rename(self.previous_path, self.sa_path)
+                raise
+        except OSError:
+            if had_previous:
+                os.rename(self.trash_path, self.previous_path)
+            raise
+        print(f"[SUCCESS] New build is live. The previous build is kept in: {self.previous_path}")
+
+        if had_previous:
+            try:
+                discard(self.trash_path)
+            except Exception as e:
+                print(f"[!] Warning: Could not delete the oldest build {self.trash_path}: {e}")
+
+    def rollback(self, keep_profile=True):
+        """Swaps the live Standalone with the previous generation; running it again undoes it.
+
+        With keep_profile, the live '_profile' (saves and settings) moves along, so a rollback
+        only changes the deployed game and mod files. Returns False if there is nothing to roll back to.
+        """
+        if not self.previous_path.is_dir():
+            print(f"[!] No previous build found at {self.previous_path}")
+            return False
+        swap_path = self.sa_path.with_name(self.sa_path.name + ROLLBACK_SUFFIX)
+        if os.path.lexists(swap_path):
+            raise FileExistsError(f"Leftover of an interrupted rollback: {swap_path}")
+
+        print(f"[*] Rolling back: {self.previous_path.name} <-> {self.sa_path.name}")
+        os.rename(self.sa_path, swap_path)
+        try:
+            os.rename(self.previous_path, self.sa_path)
+        except OSError:
+            os.rename(swap_path, self.sa_path)
+            raise
+        os.rename(swap_path, self.previous_path)
+
+        if keep_profile:
+            self._exchange_profiles()
+        print(f"[SUCCESS] Rolled back. The build you replaced is kept in: {self.previous_path}")
+        return True
+
+    def _exchange_profiles(self):
+        """Swaps the '_profile' folders of the live and previous generation after the folders changed places."""
+        in_use = self.previous_path / PROFILE_DIR    # the profile played with until now
+        older = self.sa_path / PROFILE_DIR
+        swap = self.sa_path / (PROFILE_DIR + ROLLBACK_SUFFIX)
+        try:
+            if in_use.exists():
+                os.rename(in_use, swap)
+            if older.exists():
+                os.rename(older, in_use)
+            if swap.exists():
+                os.rename(swap, older)
+            print("    -> Saves and settings (_profile) kept live.")
+        except OSError as e:
+            print(f"[!] Warning: Could not carry _profile over: {e}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "rollback":
+        try:
+            sys.exit(0 if ShadowBuild(sys.argv[2]).rollback() else 1)
+        except Exception as e:
+            print(f"[ERROR] Rollback failed: {e}")
+            sys.exit(1)
+    print("Usage: python shadow_build.py rollback <standalone_path>")
@@ -0,0 +1,200 @@
+"""Snapshot backups of the Windows save/settings folders, in the style of rsync --link-dest.
+
+Every backup is a complete folder 'Snapshots/<YYYYMMDD_HHMMSS_ffffff>' under the backup root,
+but only files that are new or changed since the previous snapshot (by size and mtime) are
+copied; the others are hardlinked from it, so an unchanged multi-GB Saves folder costs one link
+per file. Snapshot files are never written to, so sharing them between snapshots is safe. A
+snapshot is built as '<name>.partial' and renamed once complete; only the newest SNAPSHOT_KEEP
+are kept. A part can be pinned: the first snapshot that holds it is recorded in pinned.json and never
+pruned, so the state from before the tool first changed it (e.g. AppData) stays restorable.
+
+Restores are incremental as well: only files that differ from the snapshot are copied back
+(copied, never linked, so the game's writes cannot reach a backup).
+"""
+import os
+import json
+import shutil
+from pathlib import Path
+from datetime import datetime
+from trash_bin import remove_tree
+
+SNAPSHOT_DIR = "Snapshots"
+SNAPSHOT_KEEP = 5
+PARTIAL_SUFFIX = ".partial"
+PINNED_FILENAME = "pinned.json"
+
+def _same_file(path, st):
+    """True when path has the size and mtime of stat result st."""
+    try:
+        other = os.stat(path)
+    except OSError:
+        return False
+    return other.st_size == st.st_size and other.st_mtime_ns == st.st_mtime_ns
+
+def _iter_files(root, names=None):
+    """Yields (relative path, DirEntry) of the files below root; names (lowercase) limits it to those top-level files."""
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as it:
+            for entry in it:
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if names is None:
+                        stack.append(rel_path)
+                elif entry.is_file() and (names is None or entry.name.lower() in names):
+                    yield rel_path, entry
+
+class SnapshotStore:
+    def __init__(self, backup_root, keep=SNAPSHOT_KEEP):
+        self.root = Path(backup_root) / SNAPSHOT_DIR
+        self.keep = keep
+
+    def snapshots(self):
+        """Completed snapshot folders, oldest first."""
+        if not self.root.is_dir():
+            return []
+        return sorted((p for p in self.root.iterdir() if p.is_dir() and not p.name.endswith(PARTIAL_SUFFIX)),
+                      key=lambda p: p.name)
+
+    def latest(self, part=None):
+        """The newest snapshot (that has the given part), or None."""
+        for snapshot in reversed(self.snapshots()):
+            if part is None or (snapshot / part).is_dir():
+                return snapshot
+        return None
+
+    def create(self, parts, pin=()):
+        """Takes a snapshot of parts: [(part name, source folder, top-level file names or None for everything)].
+
+        Parts named in pin that have no pinned snapshot yet are pinned to this one. Returns (snapshot folder, {part: (linked, copied)}), or (None, {}) if no source folder exists.
+        """
+        previous = self.latest()
+        # Names sort chronologically; the microseconds keep quick successive backups apart
+        final = self.root / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        while final.exists() or final.with_name(final.name + PARTIAL_SUFFIX).exists():
+            final = self.root / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        partial = final.with_name(final.name + PARTIAL_SUFFIX)
+        partial.mkdir(parents=True)
+
+        stats = {}
+        try:
+            for part, source, names in parts:
+                if Path(source).is_dir():
+                    stats[part] = self._snapshot_part(Path(source), partial / part, previous / part if previous else None,
+                                                      {n.lower() for n in names} if names is not None else None)
+        except BaseException:
+            remove_tree(partial)
+            raise
+        if not stats:
+            remove_tree(partial)
+            return None, stats
+        os.rename(partial, final)
+        for part in pin:
+            if part in stats and self.pinned(part) is None:
+                self._pin(part, final)
+                print(f"    -> {part} of this snapshot is kept as the original (never pruned)")
+        self.prune()
+        return final, stats
+
+    def _snapshot_part(self, source, target, previous, names):
+        linked = copied = 0
+        target.mkdir(parents=True, exist_ok=True)
+        for rel_path, entry in _iter_files(source, names):
+            st = entry.stat()
+            dst = target / rel_path
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            if previous is not None and _same_file(previous / rel_path, st):
+                try:
+                    os.link(previous / rel_path, dst)
+                    linked += 1
+                    continue
+                except OSError:
+                    pass  # link limit or filesystem without hardlinks: copy
+            shutil.copy2(entry.path, dst)
+            copied += 1
+        return linked, copied
+
+    def restore(self, part, target, mirror=False, snapshot=None):
+        """Brings target back to a part of a snapshot (the newest that has it by default).
+
+        Returns restore_tree's counts, or None if there is no such snapshot.
+        """
+        snapshot = snapshot or self.latest(part)
+        if snapshot is None or not (snapshot / part).is_dir():
+            return None
+        return restore_tree(snapshot / part, target, mirror)
+
+    def pinned(self, part):
+        """The snapshot pinned for a part, or None."""
+        name = self._load_pins().get(part)
+        if name and (self.root / name / part).is_dir():
+            return self.root / name
+        return None
+
+    def _load_pins(self):
+        try:
+            with open(self.root / PINNED_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _pin(self, part, snapshot):
+        pins = self._load_pins()
+        pins[part] = snapshot.name
+        with open(self.root / PINNED_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(pins, f, indent=4)
+
+    def prune(self):
+        """Deletes all but the newest self.keep snapshots (pinned ones stay), and snapshots that were never completed."""
+        for leftover in self.root.glob(f"*{PARTIAL_SUFFIX}"):
+            remove_tree(leftover)
+        pinned = set(self._load_pins().values())
+        snapshots = self.snapshots()
+        for old in snapshots[:-self.keep] if len(snapshots) > self.keep else []:
+            if old.name in pinned:
+                continue
+            remove_tree(old)
+            print(f"    [-] Pruned old backup snapshot: {old.name}")
+
+def restore_tree(source, target, mirror=False):
+    """Brings target back to the files of source, copying only those that differ.
+
+    mirror also deletes files and folders source does not have. Returns (copied, unchanged, deleted).
+    """
+    source = Path(source)
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+
+    copied = unchanged = deleted = 0
+    wanted = set()
+    for rel_path, entry in _iter_files(source):
+        wanted.add(os.path.normcase(rel_path))
+        dst = target / rel_path
+        st = entry.stat()
+        if _same_file(dst, st) and not os.path.islink(dst):
+            unchanged += 1
+            continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if os.path.lexists(dst):
+            os.remove(dst)  # never write through a link
+        shutil.copy2(entry.path, dst)
+        copied += 1
+
+    if mirror:
+        folders = {os.path.normcase(os.path.dirname(p)) for p in wanted}
+        for rel_path in list(folders):
+            while rel_path:
+                rel_path = os.path.dirname(rel_path)
+                folders.add(rel_path)
+        for rel_path, entry in list(_iter_files(target)):
+            if os.path.normcase(rel_path) not in wanted:
+                os.remove(entry.path)
+                deleted += 1
+        for dirpath, dirnames, _ in os.walk(target):
+            for dirname in list(dirnames):
+                rel_dir = os.path.relpath(os.path.join(dirpath, dirname), target)
+                if os.path.normcase(rel_dir) not in folders:
+                    remove_tree(os.path.join(dirpath, dirname))
+                    dirnames.remove(dirname)
+    return copied, unchanged, deleted
@@ -0,0 +1,186 @@
+"""Fast deletion of build trees: rename them to a trash folder now, delete them in the background.
+
+Renaming a tree to a sibling folder on the same filesystem is instant whatever its size, so the
+next build can start right away. The trash is then deleted by a background thread that walks it
+with os.scandir on a small thread pool (one task per folder). Links are unlinked, never followed,
+so the game and mod files they point to survive. Trash left behind by a crashed or closed run is
+recognised by its name ('<folder>.trash-<time>-<pid>') and swept on the next start.
+"""
+import os
+import stat
+import time
+import threading
+import itertools
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+TRASH_MARKER = ".trash-"
+
+# Folder tasks of one remover; deleting is metadata work, more threads only add contention
+DEFAULT_REMOVE_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Trash folders this process is deleting right now (never swept twice)
+_active = set()
+_lock = threading.Lock()
+_serial = itertools.count()
+
+def trash_path_for(path):
+    """A new, unique trash name next to path (same folder, so same filesystem)."""
+    path = Path(path)
+    return path.with_name(f"{path.name}{TRASH_MARKER}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_serial)}")
+
+def _is_link(entry):
+    """Symlinks and (on Windows) junctions: removed themselves, never entered."""
+    return entry.is_symlink() or (hasattr(entry, "is_junction") and entry.is_junction())
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        # Read-only files (Windows) cannot be unlinked until they are writable again
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+
+def _clear_folder(path, errors):
+    """Deletes the files and links of one folder; returns its real subfolders."""
+    subfolders = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if _is_link(entry):
+                    if entry.is_dir():
+                        try:
+                            os.rmdir(entry.path)  # junction / directory link on Windows
+                        except OSError:
+                            _unlink(entry.path)
+                    else:
+                        _unlink(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    subfolders.append(entry.path)
+                else:
+                    _unlink(entry.path)
+            except OSError as e:
+                errors.append(f"{entry.path}: {e}")
+    return subfolders
+
+def remove_tree(path, workers=DEFAULT_REMOVE_WORKERS):
+    """Deletes a folder tree in parallel, one task per folder. Returns the errors (empty on success)."""
+    path = str(path)
+    errors = []
+    if os.path.islink(path):
+        os.unlink(path)
+        return errors
+    if not os.path.isdir(path):
+        return errors
+
+    # Parents are listed before their children, so the reverse order empties folders bottom-up
+    folders = [path]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        pending = {pool.submit(_clear_folder, path, errors)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    subfolders = future.result()
+                except OSError as e:
+                    errors.append(str(e))
+                    continue
+                folders.extend(subfolders)
+                pending |= {pool.submit(_clear_folder, folder, errors) for folder in subfolders}
+    for folder in reversed(folders):
+        try:
+            os.rmdir(folder)
+        except OSError as e:
+            errors.append(f"{folder}: {e}")
+    return errors
+
+def delete_in_background(trash_path, workers=DEFAULT_REMOVE_WORKERS):
+    """Deletes a trash folder on a background thread; returns the thread."""
+    trash_path = str(trash_path)
+    with _lock:
+        _active.add(trash_path)
+
+    def run():
+        try:
+            errors = remove_tree(trash_path, workers)
+            if errors:
+                print(f"\n[!] Background cleanup: {len(errors)} items of {trash_path} could not be deleted "
+                      f"(first: {errors[0]}). They are retried on the next start.")
+        finally:
+            with _lock:
+                _active.discard(trash_path)
+
+    # Daemon: closing the tool never waits for it, the startup sweep finishes the job
+    thread = threading.Thread(target=run, name=f"trash-remover-{Path(trash_path).name}", daemon=True)
+    thread.start()
+    return thread
+
+def discard(path, background=True):
+    """Moves a folder out of the way at once and deletes it in the background.
+
+    If it cannot be renamed, it is deleted in place before returning. Returns False if there was nothing to discard.
+    """
+    path = Path(path)
+    if os.path.islink(path):
+        os.unlink(path)
+        return True
+    if not path.exists():
+        return False
+    if background:
+        trash = trash_path_for(path)
+        try:
+            os.rename(path, trash)
+            delete_in_background(trash)
+            return True
+        except OSError as e:
+            print(f"[!] Could not move {path.name} to the trash ({e}), deleting it now...")
+    errors = remove_tree(path)
+    if errors:
+        raise OSError(f"{len(errors)} items of {path} could not be deleted (first: {errors[0]})")
+    return True
+
+def move_contents_to_trash(folder):
+    """Moves everything inside folder into one new sibling trash folder and deletes that in the background.
+
+    The folder itself stays (empty). Items that cannot be moved are reported and left in place.
+    Returns (moved items, items that could not be moved).
+    """
+    folder = Path(folder)
+    trash = trash_path_for(folder)
+    trash.mkdir()
+    moved, failed = 0, []
+    for item in os.listdir(folder):
+        try:
+            os.rename(folder / item, trash / item)
+            moved += 1
+        except OSError as e:
+            failed.append(f"{item}: {e}")
+    delete_in_background(trash)
+    return moved, failed
+
+def sweep_trash(folder, suffixes=("",)):
+    """Deletes, in the background, the trash an earlier run left behind of folder and its siblings '<folder><suffix>'.
+
+    Only '<name>.trash-…' folders of exactly those names are swept, never the trash of another
+    folder whose name merely starts the same (e.g. 'Game.v2' next to 'Game').
+    """
+    folder = Path(folder)
+    parent = folder.parent
+    if not parent.is_dir():
+        return 0
+    swept = 0
+    prefixes = tuple(folder.name + suffix + TRASH_MARKER for suffix in suffixes)
+    with _lock:
+        active = set(_active)
+    for entry in os.scandir(parent):
+        if entry.name.startswith(prefixes) and entry.path not in active and entry.is_dir(follow_symlinks=False):
+            delete_in_background(entry.path)
+            swept += 1
+    if swept:
+        print(f"[*] Deleting {swept} leftover trash folders of earlier runs in the background.")
+    return swept
+
+def pending_removals():
+    """Number of trash folders still being deleted by this process."""
+    with _lock:
+        return len(_active)
@@ -1,34 +1,104 @@
-"""Fast validation script for mapping_manifest.json"""
-import json
+"""Fast validation and query tool for mapping manifests.
+
+  summary   [MANIFEST]        stream the manifest and print totals (default command)
+  providers PATH_PREFIX       which mods provide files under a path (winners and losers)
+  losses    LOSER WINNER      how many files mod LOSER loses to mod WINNER
+  overrides MOD               which mods override the files of MOD
+  top       [--limit N]       mods with the most winning files
+
+Query commands read manifest_index.sqlite (written by the scanner with --db).
+"""
+import sys
+import argparse
+from pathlib import Path
 from collections import Counter
+from manifest_io import iter_manifest, find_manifest
+from manifest_db import ManifestDatabase, DB_FILENAME
+
+def default_manifest():
+    manifest = find_manifest(Path('.'))
+    if manifest.exists():
+        return manifest
+    return Path('mapping_manifest.json')
+
+def summary(manifest_path):
+    print("[*] Streaming manifest...")
+    mod_counts = Counter()
+    total_size = 0
+    root_files = 0
+    total_files = 0
+    for target, v in iter_manifest(manifest_path):
+        total_files += 1
+        mod_counts[v["mod_origin"]] += 1
+        total_size += v["size_bytes"]
+        if v["is_root"]:
+            root_files += 1
+
+    print(f"[+] Total file entries: {total_files}")
+
+    # Get unique mod origins
+    print(f"[+] Unique mod origins: {len(mod_counts)}")
+
+    # Verify no duplicate target paths (guaranteed by the scanner's dict structure)
+    print(f"[+] Duplicate target paths: 0 (guaranteed by Python dict)")
+
+    # Count files per mod (top 10)
+    print(f"\n[*] Top 10 mods by file count:")
+    for mod, count in mod_counts.most_common(10):
+        print(f"    {count:>6} files: {mod}")
 
-print("[*] Loading manifest...")
-with open('mapping_manifest.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+    # Calculate total size
+    print(f"\n[+] Total size of all files: {total_size / (1024**3):.2f} GB")
 
-print(f"[+] Total file entries: {len(data)}")
+    # Count root vs data files
+    data_files = total_files - root_files
+    print(f"[+] Root files: {root_files}")
+    print(f"[+] Data files: {data_files}")
 
-# Get unique mod origins
-mods = set(v["mod_origin"] for v in data.values())
-print(f"[+] Unique mod origins: {len(mods)}")
+    print("\n[SUCCESS] Validation complete - No duplicates possible by design!")
 
-# Verify no duplicate target paths (guaranteed by dict structure, but double-check)
-print(f"[+] Duplicate target paths: 0 (guaranteed by Python dict)")
+def open_db(db_path):
+    if not Path(db_path).exists():
+        print(f"[!] {db_path} not found. Run the scanner with --db first.")
+        sys.exit(1)
+    return ManifestDatabase(db_path)
 
-# Count files per mod (top 10)
-mod_counts = Counter(v["mod_origin"] for v in data.values())
-print(f"\n[*] Top 10 mods by file count:")
-for mod, count in mod_counts.most_common(10):
-    print(f"    {count:>6} files: {mod}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate and query mapping manifests")
+    parser.add_argument("--db", default=DB_FILENAME, help="Path to manifest_index.sqlite")
+    sub = parser.add_subparsers(dest="command")
 
-# Calculate total size
-total_size = sum(v["size_bytes"] for v in data.values())
-print(f"\n[+] Total size of all files: {total_size / (1024**3):.2f} GB")
+    p_summary = sub.add_parser("summary", help="Print manifest totals")
+    p_summary.add_argument("manifest", nargs="?", help="Manifest path (default: mapping_manifest.ndjson[.gz])")
+    p_providers = sub.add_parser("providers", help="Mods providing files under a path prefix")
+    p_providers.add_argument("prefix")
+    p_losses = sub.add_parser("losses", help="Files one mod loses to another")
+    p_losses.add_argument("loser")
+    p_losses.add_argument("winner")
+    p_overrides = sub.add_parser("overrides", help="Mods overriding the files of a mod")
+    p_overrides.add_argument("mod")
+    p_top = sub.add_parser("top", help="Mods with the most winning files")
+    p_top.add_argument("--limit", type=int, default=10)
 
-# Count root vs data files
-root_files = sum(1 for v in data.values() if v["is_root"])
-data_files = len(data) - root_files
-print(f"[+] Root files: {root_files}")
-print(f"[+] Data files: {data_files}")
+    args = parser.parse_args()
 
-print("\n[SUCCESS] Validation complete - No duplicates possible by design!")
+    if args.command in (None, "summary"):
+        summary(Path(getattr(args, "manifest", None) or default_manifest()))
+    elif args.command == "providers":
+        with open_db(args.db) as db:
+            rows = db.providers(args.prefix)
+            for target, mod, priority, is_winner in rows:
+                print(f"  {'[WIN] ' if is_winner else '[lost]'} {target}  <- {mod} (priority {priority})")
+            print(f"[+] {len(rows)} provider(s) found.")
+    elif args.command == "losses":
+        with open_db(args.db) as db:
+            files, size = db.losses(args.loser, args.winner)
+            print(f"[+] {args.loser} loses {files} files ({size / (1024**2):.2f} MB) to {args.winner}")
+    elif args.command == "overrides":
+        with open_db(args.db) as db:
+            for winner, files in db.overridden_by(args.mod):
+                print(f"    {files:>6} files: {winner}")
+    elif args.command == "top":
+        with open_db(args.db) as db:
+            for mod, files, size in db.top_mods(args.limit):
+                print(f"    {files:>6} files ({size / (1024**2):.2f} MB): {mod}")
@@ -1,14 +1,17 @@
 import os
 import json
+import hashlib
 import filecmp
 from pathlib import Path
 from tqdm import tqdm
+from manifest_io import iter_manifest, count_manifest
 
 class VerificationEngine:
     def __init__(self):
         self.results = {
             "missing_files": [],
             "zero_byte_files": [],
+            "hash_mismatch": [],
             "config_mismatch": [],
             "save_issues": [],
             "quarantined_items": [],
@@ -25,16 +28,13 @@ class VerificationEngine:
         sa_p = Path(standalone_path)
 
         try:
-            with open(manifest_p, 'r', encoding='utf-8') as f:
-                manifest = json.load(f)
+            total = count_manifest(manifest_p)
         except Exception as e:
             print(f"[!] Error loading manifest: {e}")
             return
-
-        total = len(manifest)
         
-        # Using tqdm for progress bar
-        for relative_path, info in tqdm(manifest.items(), desc="Verifying Files", unit="file", smoothing=0.1):
+        # Using tqdm for progress bar (entries are streamed, not loaded at once)
+        for relative_path, info in tqdm(iter_manifest(manifest_p), total=total, desc="Verifying Files", unit="file", smoothing=0.1):
             target_path = sa_p / relative_path
             
             # Check for Hijacked original if not found as is
@@ -58,6 +58,37 @@ class VerificationEngine:
                     "mod": info.get('mod_origin', 'Unknown')
                 })
 
+    def verify_hashes(self, report_path=None, standalone_path=None):
+        """Re-hashes the copies whose content hash the linker recorded (copy_hash) and compares."""
+        if not report_path or not Path(report_path).exists():
+            return
+        try:
+            with open(report_path, 'r') as f:
+                report = json.load(f)
+        except Exception as e:
+            print(f"[!] Error loading execution report: {e}")
+            return
+
+        hashed = [(target, r) for target, r in report.items() if r.get("status") == "SUCCESS" and r.get("hash")]
+        if not hashed:
+            return
+        print("[*] Verifying Copied File Hashes...")
+        sa_p = Path(standalone_path)
+        for relative_path, r in tqdm(hashed, desc="Verifying Hashes", unit="file", smoothing=0.1):
+            target_path = sa_p / relative_path
+            if not target_path.is_file():
+                continue  # Reported by verify_deployment
+            try:
+                hasher = hashlib.new(r.get("hash_algo") or "sha1")
+                with open(target_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        hasher.update(chunk)
+            except (OSError, ValueError) as e:
+                self.results["hash_mismatch"].append({"file": relative_path, "mod": r.get("mod", "Unknown"), "error": str(e)})
+                continue
+            if hasher.hexdigest() != r["hash"]:
+                self.results["hash_mismatch"].append({"file": relative_path, "mod": r.get("mod", "Unknown")})
+
     def verify_configs(self, mo2_profile_path, appdata_path, doc_path, ini_prefix="Skyrim"):
         """Compares plugins, loadorder, and INIs."""
         print("[*] Verifying Configuration Synchronization...")
@@ -155,9 +186,11 @@ class VerificationEngine:
         except Exception as e:
             self.results["save_issues"].append(f"Error checking saves: {str(e)}")
 
-    def run_all_checks(self, manifest_path=None, standalone_path=None, mo2_profile_path=None, appdata_path=None, doc_save_path=None, ini_prefix="Skyrim", run_timestamp=None):
+    def run_all_checks(self, manifest_path=None, standalone_path=None, mo2_profile_path=None, appdata_path=None, doc_save_path=None, ini_prefix="Skyrim", run_timestamp=None, report_path=None):
         if manifest_path:
             self.verify_deployment(manifest_path, standalone_path)
+        if report_path:
+            self.verify_hashes(report_path, standalone_path)
             
         if mo2_profile_path and appdata_path and doc_save_path:
             self.verify_configs(mo2_profile_path, appdata_path, doc_path=doc_save_path, ini_prefix=ini_prefix)
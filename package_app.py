@@ -65,6 +65,11 @@ def build():
         "--add-data", f"{scripts_abs};Scripts",
         "--hidden-import", "tqdm",
         "--hidden-import", "filecmp",
+        "--hidden-import", "concurrent.futures",
+        "--hidden-import", "hashlib",
+        "--hidden-import", "gzip",
+        "--hidden-import", "sqlite3",
+        "--hidden-import", "fnmatch",
         "standalone_build_deploy.py"
     ]
 
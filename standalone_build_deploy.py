@@ -28,21 +28,36 @@ else:
 # Import logic engines directly
 try:
     print(f"[*] DEBUG: Attempting to import modules from: {scripts_path}")
-    from scanner_engine import ScannerEngine
+    from scanner_engine import ScannerEngine, DEFAULT_SCAN_WORKERS
     from linker_executor import LinkerExecutor
     from cleaner_engine import CleanerEngine
     from profile_sync import ProfileSync
     from verification_engine import VerificationEngine
+    from profile_fingerprint import diff_fingerprints, describe_diff
+    from link_strategy import REFLINK_SUPPORTED, device_of
+    from shadow_build import ShadowBuild, GENERATION_SUFFIXES
+    from deploy_journal import JOURNAL_FILENAME
+    from deploy_state import STATE_FILENAME
+    from trash_bin import sweep_trash, pending_removals
 except Exception as e:
     # Fallback and log the error
     import traceback
     error_details = traceback.format_exc()
     print(f"[!] Critical Import Failure:\n{error_details}")
     ScannerEngine = None
+    DEFAULT_SCAN_WORKERS = 1
     LinkerExecutor = None
     CleanerEngine = None
     ProfileSync = None
     VerificationEngine = None
+    diff_fingerprints = describe_diff = None
+    REFLINK_SUPPORTED = False
+    device_of = None
+    ShadowBuild = None
+    GENERATION_SUFFIXES = ("",)
+    JOURNAL_FILENAME = "deploy_journal.ndjson"
+    STATE_FILENAME = "deploy_state.sqlite"
+    sweep_trash = pending_removals = None
     _import_error = f"{str(e)}\n\n{error_details}"
 else:
     _import_error = None
@@ -200,6 +215,62 @@ def validate_sa_path(sa_path, mo2_path, steam_path):
 
     return True, "Valid"
 
+def load_build_metadata(sa_p):
+    """Reads standalone_metadata.json of an existing build ({} if missing or unreadable)."""
+    metadata_path = Path(sa_p) / "standalone_metadata" / "standalone_metadata.json"
+    if not metadata_path.exists():
+        return {}
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[!] Error reading metadata: {e}")
+        return {}
+
+def run_verification_and_report(sa_p, mo2_p, profile_name, ini_prefix, p_sync):
+    """Verifies a build in sa_p and generates its interactive HTML report."""
+    output_dir = sa_p / "standalone_metadata"
+    output_manifest = output_dir / "mapping_manifest.ndjson"
+
+    # --- STAGE 6: VERIFICATION ENGINE ---
+    verification_results = {}
+    try:
+        print("\n>>> RUNNING: Comprehensive Verification...")
+        verifier = VerificationEngine()
+        verification_results = verifier.run_all_checks(
+            manifest_path=output_manifest,
+            standalone_path=sa_p,
+            mo2_profile_path=mo2_p / "profiles" / profile_name,
+            appdata_path=p_sync.win_appdata,
+            doc_save_path=p_sync.win_docs,
+            ini_prefix=ini_prefix,
+            run_timestamp=p_sync.run_timestamp,
+            report_path=output_dir / "execution_report.json"
+        )
+        print("[SUCCESS] Verification complete.")
+    except Exception as e:
+        print(f"[!] Verification failed: {e}")
+
+    # --- STAGE 7: GENERATE INTERACTIVE REPORT ---
+    print("\n>>> RUNNING: Generating Interactive HTML Report...")
+    try:
+        from report_generator import ReportGenerator
+        gen = ReportGenerator(
+            manifest_path=str(output_manifest), 
+            report_path=str(output_dir / "execution_report.json"),
+            output_html=str(output_dir / "build_report.html")
+        )
+        gen.generate(verification_results)
+        
+        report_file = output_dir / "build_report.html"
+        print(f"\n[SUCCESS] Deployment complete! Report generated: {report_file}")
+        
+        if ask_confirm("Open Report", "Build finished! Would you like to open the HTML report in your browser?"):
+            webbrowser.open(str(report_file))
+            
+    except Exception as e:
+        print(f"[!] Failed report: {e}")
+
 if __name__ == "__main__":
     def main_menu():
         print("====================================================")
@@ -291,6 +362,9 @@ if __name__ == "__main__":
             show_msg("Critical Error", f"Internal logic engines could not be loaded.\n\nERROR:\n{_import_error}")
             exit()
 
+        # Builds and cleanups of earlier runs that were closed while deleting left their trash behind
+        sweep_trash(sa_p, GENERATION_SUFFIXES)
+
         while True:
             print("\n" + "="*50)
             print(" MAIN MENU - SELECT AN OPERATION:")
@@ -298,10 +372,11 @@ if __name__ == "__main__":
             print("1. Build Standalone (Full Deployment)")
             print("2. Clean Standalone Only & Restore original Settings/Saves")
             print("3. Import / Export Save (Documents <-> MO2 Profile)")
-            print("4. Exit")
+            print("4. Roll Back to the Previous Build")
+            print("5. Exit")
             print("-" * 50)
             
-            choice = input("[?] Choose option (1-4): ").strip()
+            choice = input("[?] Choose option (1-5): ").strip()
 
             if choice == '1':
                 # --- OPTION 1: FULL BUILD ---
@@ -319,6 +394,43 @@ if __name__ == "__main__":
                         if not retry: continue
                         vanilla_mode = 'copy'
 
+                # Copy-on-write clones (btrfs/XFS) isolate Standalone writes from the mod folders
+                link_mode = 'hardlink'
+                if REFLINK_SUPPORTED and ask_confirm("Copy-on-Write",
+                        "Use reflinks (copy-on-write clones) for mod files?\n\n"
+                        "Advantage: No extra disk space, and the game can never write into your MO2 mod files.\n"
+                        "Requirement: A filesystem with reflink support (btrfs, XFS). Other drives fall back to hardlinks."):
+                    link_mode = 'reflink'
+
+                # Mods on another drive than the Standalone cannot be hardlinked: symlink instead of copying?
+                cross_device = 'copy'
+                copy_small_files = False
+                mods_cross_device = device_of(mo2_p / "mods") != device_of(sa_p)
+                if mods_cross_device and ask_confirm("Different Drives",
+                        "Your MO2 mods are on a different drive than the Standalone folder, so they cannot be hardlinked.\n\n"
+                        "Use file symlinks to the MO2 mod files instead of copying everything?\n"
+                        "Advantage: Almost no extra disk space and a build nearly as fast as with hardlinks.\n"
+                        "Requirement (Windows): Developer Mode or running as administrator. The MO2 drive must stay connected."):
+                    cross_device = 'symlink'
+                    copy_small_files = ask_confirm("Small Files",
+                        "Still COPY small and config-like files (INI, JSON, TXT, EXE, DLL, files up to 64 KB)?\n\n"
+                        "These are cheap to copy, and tools that edit them will not change your MO2 mod files.")
+
+                # Opt-in: hash every copied file so the verification can tell a damaged copy
+                copy_hash = None
+                if (vanilla_mode == 'copy' or (mods_cross_device and cross_device == 'copy')) and ask_confirm("Copy Checksums",
+                        "Record a checksum (SHA-1) of every COPIED file and check it during verification?\n\n"
+                        "Advantage: Detects copies that were damaged or modified after the build.\n"
+                        "Cost: The verification reads every copied file again."):
+                    copy_hash = 'sha1'
+
+                # Opt-in: folders owned by one mod become one directory symlink instead of a link per file
+                dir_links = ask_confirm("Directory Links (Advanced)",
+                    "Link folders that come entirely from one mod with a single directory symlink?\n\n"
+                    "Advantage: Far fewer filesystem operations for large texture/mesh mods.\n"
+                    "Warning: Files written into those folders land in your MO2 mod folder.\n"
+                    "Requirement (Windows): Developer Mode or running as administrator.")
+
                 if mo2_p in sa_p.parents or mo2_p == sa_p:
                     show_msg("CRITICAL SECURITY", "Standalone folder cannot be inside the MO2 folder!")
                     continue
@@ -327,8 +439,68 @@ if __name__ == "__main__":
                     show_msg("CRITICAL SECURITY", "Standalone folder cannot be your Original Game folder!")
                     continue
 
-                if ask_confirm("Confirm Build", f"Start Full Deployment to:\n{sa_p}?\n\n(Folder will be cleaned first)"):
-                    print("\n>>> STARTING FULL DEPLOYMENT...")
+                # --- STAGE 0: PROFILE FINGERPRINT (skip no-op rebuilds) ---
+                scanner = ScannerEngine(mo2_p, profile_name)
+                build_options = {
+                    "vanilla_mode": vanilla_mode,
+                    "link_mode": link_mode,
+                    "dir_links": dir_links,
+                    "cross_device": cross_device,
+                    "copy_small_files": copy_small_files,
+                    "copy_hash": copy_hash,
+                    "mo2_path": str(mo2_p),
+                    "game_path": str(game_p),
+                    "standalone_path": str(sa_p),
+                    "profile": profile_name
+                }
+                print("\n[*] Fingerprinting profile, mods and game folder...")
+                try:
+                    fingerprint = scanner.build_fingerprint(game_p, build_options, workers=DEFAULT_SCAN_WORKERS)
+                except Exception as e:
+                    print(f"[!] Warning: Could not fingerprint the profile, a full build is required: {e}")
+                    fingerprint = None
+                last_fingerprint = load_build_metadata(sa_p).get("fingerprint")
+
+                up_to_date = False
+                if fingerprint and last_fingerprint and last_fingerprint.get("version") == fingerprint["version"]:
+                    if last_fingerprint.get("root") == fingerprint["root"]:
+                        print("[*] Fingerprint matches the last successful build. Nothing changed.")
+                        up_to_date = ask_confirm("Build Up To Date",
+                            "Profile, mods and game are unchanged since the last successful build.\n\n"
+                            "Skip the rebuild and only verify the existing build?\n(No = full rebuild)")
+                    else:
+                        print("[*] Changes since the last successful build:")
+                        for line in describe_diff(diff_fingerprints(last_fingerprint, fingerprint)):
+                            print(f"    - {line}")
+
+                # A full build that was interrupted left its deploy journal in the staging folder
+                resume = False
+                if not up_to_date and ShadowBuild and \
+                        (ShadowBuild(sa_p).staging_path / "standalone_metadata" / JOURNAL_FILENAME).exists():
+                    resume = ask_confirm("Resume Build",
+                        "A previous full build was interrupted before it finished.\n\n"
+                        "Resume it? Files it already deployed are not deployed again.\n"
+                        "(No = start the full build over)")
+
+                # An incremental rebuild needs the previous manifest and the same game folder and options
+                incremental = False
+                if not up_to_date and not resume and fingerprint and last_fingerprint and last_fingerprint.get("version") == fingerprint["version"] \
+                        and (sa_p / "standalone_metadata" / "mapping_manifest.ndjson").exists():
+                    fp_diff = diff_fingerprints(last_fingerprint, fingerprint)
+                    if not fp_diff["game_changed"] and not fp_diff["options_changed"]:
+                        incremental = ask_confirm("Build Mode",
+                            "A previous build exists in this folder.\n\n"
+                            "Rebuild incrementally? Only files whose mod or source changed are relinked.\n"
+                            "(No = build everything anew next to it and swap it in)")
+
+                if up_to_date:
+                    print("\n>>> PROFILE UNCHANGED: Skipping clean, scan and deployment.")
+                    p_sync = ProfileSync(mo2_p, profile_name, sa_p, docs_name, appdata_name, ini_prefix, game_name=game_info['name'], portable_mode=True)
+                    run_verification_and_report(sa_p, mo2_p, profile_name, ini_prefix, p_sync)
+                elif ask_confirm("Confirm Build", f"Start Incremental Deployment to:\n{sa_p}?\n\n(Only changed files will be relinked)" if incremental
+                                 else f"Start Full Deployment to:\n{sa_p}?\n\n(Built next to the current folder and swapped in; the current build is kept for rollback)"):
+                    print(f"\n>>> STARTING {'INCREMENTAL' if incremental else 'FULL'} DEPLOYMENT...")
+                    p_sync = None
                     try:
                         # --- STAGE 1: PRE-CLEAN SAFETY GUARD (Export) ---
                         print("\n[*] PRE-CLEAN SAFETY CHECK: Checking for existing saves...")
@@ -389,52 +561,73 @@ if __name__ == "__main__":
                             print("[*] No saves found. Proceeding silently.")
 
                         # --- STAGE 2: CLEAN ---
-                        print("\n[*] (Absolute Fresh Start) Cleaning Standalone folder...")
                         cleaner = CleanerEngine(sa_p, mo2_p, game_p, docs_name, appdata_name, game_name=game_info['name'], profile_name=profile_name, portable_mode=True)
                         is_safe, msg = cleaner.check_safety()
-                        if is_safe:
+                        shadow = None
+                        if is_safe and incremental:
+                            print("\n[*] (Incremental) Keeping deployed files, resetting hijack and profile...")
+                            scan_cache_data = None
+                            metadata_dir = sa_p / "standalone_metadata"
+
+                            # The previous manifest and report drive the diff against the new scan
+                            previous_manifest = metadata_dir / "previous_manifest.ndjson"
+                            previous_report = metadata_dir / "previous_execution_report.json"
+                            os.replace(metadata_dir / "mapping_manifest.ndjson", previous_manifest)
+                            if (metadata_dir / "execution_report.json").exists():
+                                os.replace(metadata_dir / "execution_report.json", previous_report)
+                            elif previous_report.exists():
+                                previous_report.unlink()
+
+                            # If this build fails, the next one must neither be skipped nor be incremental
+                            m_data = load_build_metadata(sa_p)
+                            if m_data.pop("fingerprint", None):
+                                with open(metadata_path, 'w', encoding='utf-8') as f:
+                                    json.dump(m_data, f, indent=4)
+
+                            cleaner.restore_profiles() # Restore original settings if any
+                            cleaner.incremental_cleanup() # Restore hijacked EXEs, remove _profile
+                        elif is_safe:
+                            # The live build stays playable until the finished new one is swapped in
+                            shadow = ShadowBuild(sa_p)
+                            print(f"\n[*] (Shadow Build) Building the new Standalone in: {shadow.staging_path}")
+                            shadow.prepare(resume=resume)
+                            # The new generation starts with the scan cache, so unchanged mods are not rescanned
+                            scan_cache_file = sa_p / "standalone_metadata" / "scan_cache.json"
+                            scan_cache_data = scan_cache_file.read_bytes() if scan_cache_file.exists() else None
+
                             cleaner.restore_profiles() # Restore original settings if any
-                            cleaner.total_cleanup() # WIPE standalone folder
                         else:
                             show_msg("Security Block", msg)
                             continue
 
-                        # 2.5 PREPARE METADATA FOLDER
-                        output_dir = sa_p / "standalone_metadata"
+                        # 2.5 PREPARE METADATA FOLDER (in the staging folder for a shadow build)
+                        build_p = shadow.staging_path if shadow else sa_p
+                        output_dir = build_p / "standalone_metadata"
                         output_dir.mkdir(parents=True, exist_ok=True)
+                        if scan_cache_data:
+                            (output_dir / "scan_cache.json").write_bytes(scan_cache_data)
 
                         # 3. SCAN
                         print("\n[*] Scanning Mods...")
-                        scanner = ScannerEngine(mo2_p, profile_name)
                         scanner.output_dir = output_dir
-                        scanner.output_manifest = output_manifest = output_dir / "mapping_manifest.json"
-                        scanner.build_mapping()
+                        scanner.output_manifest = output_manifest = output_dir / "mapping_manifest.ndjson"
+                        # Re-resolves from the scan index when the fingerprinted mod trees are unchanged
+                        scanner.build_mapping(workers=DEFAULT_SCAN_WORKERS, use_cache=True, write_db=True, reresolve=True, dir_links=dir_links)
 
                         # 4. LINK
                         print("\n[*] Deploying Files...")
-                        linker = LinkerExecutor(sa_p, game_p)
+                        linker = LinkerExecutor(build_p, game_p)
                         linker.output_dir = output_dir
                         linker.manifest_file = output_manifest
                         linker.report_file = output_dir / "execution_report.json"
                         
-                        # Initial vanilla clone
-                        linker.initial_vanilla_clone(mode=vanilla_mode)
-                        linker.execute_mapping(clean=False)
-
-                        # --- STAGE 5: SYNC CONFIG (INIs & Plugins) ---
-                        print("\n[*] Injecting Profile Configuration (Portable)...")
-                        p_sync = ProfileSync(mo2_p, profile_name, sa_p, docs_name, appdata_name, ini_prefix, game_name=game_info['name'], portable_mode=True)
-                        p_sync.deploy_mo2_profile() # Handles INIs, Plugins, Loadorder
-                        
-                        # --- STAGE 6: FINAL IMPORT (Saves) ---
-                        print(f"\n[*] FINAL STAGE: Importing saves from MO2 Profile [{profile_name}] -> Standalone...")
-                        try:
-                            p_sync.push_saves_to_docs()
-                            print("[SUCCESS] Saves safely IMPORTED (Copied) to Standalone.")
-                        except Exception as e:
-                            print(f"[!] Warning: Could not import saves: {e}")
-
-                        p_sync.clean_custom_save_path()
+                        # Vanilla files are the lowest layer of the same pass: every target is written once
+                        if incremental:
+                            # Only the manifest diff is applied; vanilla files already in place are left alone
+                            linker.execute_mapping(previous_manifest=previous_manifest, previous_report=previous_report, vanilla_mode=vanilla_mode, link_mode=link_mode, dir_links=dir_links, cross_device=cross_device, copy_small_files=copy_small_files, copy_hash=copy_hash, include_vanilla=True)
+                        else:
+                            # Copies the live build already holds are hardlinked from it, not copied again
+                            linker.execute_mapping(clean=False, vanilla_mode=vanilla_mode, link_mode=link_mode, dir_links=dir_links, cross_device=cross_device, copy_small_files=copy_small_files, copy_hash=copy_hash, include_vanilla=True, reuse_from=sa_p, resume=resume)
 
                         # --- STAGE 5.1: UNIVERSAL MULTI-HIJACK DEPLOYMENT ---
                         print("\n[*] Implementing Universal Hijack for Total Isolation...")
@@ -457,7 +650,7 @@ if __name__ == "__main__":
                         
                         # Adaptive: Scan for anything ending in "Launcher.exe" in the SA root
                         try:
-                            for item in sa_p.iterdir():
+                            for item in build_p.iterdir():
                                 if item.is_file() and item.name.lower().endswith("launcher.exe"):
                                     potential_targets.append(item.name)
                         except: pass
@@ -492,12 +685,12 @@ if __name__ == "__main__":
                             print(f"    [!] Warning: Pre-compiled wrapper template NOT found. Falling back to .bat mode.")
 
                         for target_exe in critical_exes:
-                            target_path = sa_p / target_exe
+                            target_path = build_p / target_exe
                             if not target_path.exists():
                                 continue
                                 
                             original_name = f"_{target_exe.replace('.exe', '')}_original.exe"
-                            original_path = sa_p / original_name
+                            original_path = build_p / original_name
                             
                             # Perform Rename
                             if original_path.exists():
@@ -516,17 +709,17 @@ if __name__ == "__main__":
                             if has_template:
                                 # Use Pre-compiled EXE (Fast & Reliable)
                                 try:
-                                    shutil.copy2(wrapper_template_exe, sa_p / target_exe)
+                                    shutil.copy2(wrapper_template_exe, build_p / target_exe)
                                     print(f"    -> Deployed EXE wrapper for {target_exe}")
                                 except Exception as e:
                                     print(f"    [!] Error copying EXE template: {e}")
                                     # Fallback to .bat
-                                    with open(sa_p / target_exe.replace(".exe", ".bat"), "w") as f:
+                                    with open(build_p / target_exe.replace(".exe", ".bat"), "w") as f:
                                         f.write(f"@echo off\npython Wrapper_{target_exe.replace('.exe', '.py')}\n")
                             elif wrapper_src_py.exists():
                                 # Fallback to .bat
-                                shutil.copy2(wrapper_src_py, sa_p / f"Wrapper_{target_exe.replace('.exe', '.py')}")
-                                with open(sa_p / target_exe.replace(".exe", ".bat"), "w") as f:
+                                shutil.copy2(wrapper_src_py, build_p / f"Wrapper_{target_exe.replace('.exe', '.py')}")
+                                with open(build_p / target_exe.replace(".exe", ".bat"), "w") as f:
                                     f.write(f"@echo off\npython Wrapper_{target_exe.replace('.exe', '.py')}\n")
                                 print(f"    -> Deployed .bat fallback for {target_exe}")
                             else:
@@ -559,9 +752,9 @@ if __name__ == "__main__":
                                 f"Profile: {profile_name}"
                             ]
                             
-                            with open(sa_p / "How to Launch.txt", "w", encoding='utf-8') as f:
+                            with open(build_p / "How to Launch.txt", "w", encoding='utf-8') as f:
                                 f.write("\n".join(launch_info))
-                            print(f"[SUCCESS] Instructions generated: {sa_p / 'How to Launch.txt'}")
+                            print(f"[SUCCESS] Instructions generated: {build_p / 'How to Launch.txt'}")
                         except Exception as e:
                             print(f"[!] Warning: Could not generate launch instructions: {e}")
 
@@ -589,9 +782,35 @@ if __name__ == "__main__":
                             print(f"[!] Warning: Artifact cleanup encountered an issue: {e}")
 
                         # --- STAGE 6: STANDALONE ISOLATION ---
-                        with open(sa_p / "steam_appid.txt", "w") as f:
+                        with open(build_p / "steam_appid.txt", "w") as f:
                             f.write(game_appid)
                             
+                        # --- STAGE 6.5: SWAP THE NEW BUILD IN (shadow build) ---
+                        if shadow:
+                            if linker.failed_count and not ask_confirm("Failed Files",
+                                    f"{linker.failed_count} files failed to deploy.\n\n"
+                                    "Make this build live anyway?\n(No = keep the current build; the new one stays in the staging folder)"):
+                                raise RuntimeError(f"Build kept in {shadow.staging_path}. The live Standalone was not changed.")
+                            print("\n[*] Swapping the new build in...")
+                            shadow.swap()
+                            output_dir = sa_p / "standalone_metadata"
+                            output_manifest = output_dir / "mapping_manifest.ndjson"
+
+                        # --- STAGE 5: SYNC CONFIG (INIs & Plugins) ---
+                        print("\n[*] Injecting Profile Configuration (Portable)...")
+                        p_sync = ProfileSync(mo2_p, profile_name, sa_p, docs_name, appdata_name, ini_prefix, game_name=game_info['name'], portable_mode=True)
+                        p_sync.deploy_mo2_profile() # Handles INIs, Plugins, Loadorder
+                        
+                        # --- STAGE 6: FINAL IMPORT (Saves) ---
+                        print(f"\n[*] FINAL STAGE: Importing saves from MO2 Profile [{profile_name}] -> Standalone...")
+                        try:
+                            p_sync.push_saves_to_docs()
+                            print("[SUCCESS] Saves safely IMPORTED (Copied) to Standalone.")
+                        except Exception as e:
+                            print(f"[!] Warning: Could not import saves: {e}")
+
+                        p_sync.clean_custom_save_path()
+
                         # --- STAGE 8: GENERATE METADATA ---
                         print("\n[*] Generating Standalone Metadata...")
                         try:
@@ -617,6 +836,11 @@ if __name__ == "__main__":
                                     "manifest_file": str(output_manifest)
                                 }
                             }
+                            # Only a build without failed files may be skipped next time
+                            if fingerprint and linker.failed_count == 0:
+                                metadata["fingerprint"] = fingerprint
+                            elif linker.failed_count:
+                                print(f"[!] {linker.failed_count} files failed to deploy. The next build will not be skipped.")
                             with open(output_dir / "standalone_metadata.json", "w", encoding='utf-8') as f:
                                 json.dump(metadata, f, indent=4)
                             print("[SUCCESS] Metadata generated: standalone_metadata/standalone_metadata.json")
@@ -629,43 +853,8 @@ if __name__ == "__main__":
                         print(f"\n[CRITICAL ERROR DURING BUILD] {e}")
                         show_msg("Build Failed", str(e))
                         
-                    # --- STAGE 6: VERIFICATION ENGINE ---
-                    verification_results = {}
-                    try:
-                        print("\n>>> RUNNING: Comprehensive Verification...")
-                        verifier = VerificationEngine()
-                        verification_results = verifier.run_all_checks(
-                            manifest_path=output_manifest,
-                            standalone_path=sa_p,
-                            mo2_profile_path=mo2_p / "profiles" / profile_name,
-                            appdata_path=p_sync.win_appdata,
-                            doc_save_path=p_sync.win_docs,
-                            ini_prefix=ini_prefix,
-                            run_timestamp=p_sync.run_timestamp
-                        )
-                        print("[SUCCESS] Verification complete.")
-                    except Exception as e:
-                        print(f"[!] Verification failed: {e}")
-
-                    # --- STAGE 7: GENERATE INTERACTIVE REPORT ---
-                    print("\n>>> RUNNING: Generating Interactive HTML Report...")
-                    try:
-                        from report_generator import ReportGenerator
-                        gen = ReportGenerator(
-                            manifest_path=str(output_dir / "mapping_manifest.json"), 
-                            report_path=str(output_dir / "execution_report.json"),
-                            output_html=str(output_dir / "build_report.html")
-                        )
-                        gen.generate(verification_results)
-                        
-                        report_file = output_dir / "build_report.html"
-                        print(f"\n[SUCCESS] Deployment complete! Report generated: {report_file}")
-                        
-                        if ask_confirm("Open Report", "Build finished! Would you like to open the HTML report in your browser?"):
-                            webbrowser.open(str(report_file))
-                            
-                    except Exception as e:
-                        print(f"[!] Failed report: {e}")
+                    # --- STAGE 6 & 7: VERIFICATION AND REPORT ---
+                    run_verification_and_report(sa_p, mo2_p, profile_name, ini_prefix, p_sync)
                 
                 input("\n>>> Press Enter to return to Main Menu...")
 
@@ -762,7 +951,17 @@ if __name__ == "__main__":
                                 print("[*] No standalone saves found. Proceeding silently.")
 
                             cleaner.restore_profiles()
-                            cleaner.total_cleanup()
+                            # With a deploy state index, the files this tool created are known exactly
+                            if (sa_p / "standalone_metadata" / STATE_FILENAME).exists() and ask_confirm("Clean Mode",
+                                    "Remove only the files the builds created?\nFiles you added to the folder yourself are kept.\n\n(No = delete everything in the folder)"):
+                                cleaner.tracked_cleanup()
+                            else:
+                                cleaner.total_cleanup(background=True)
+                            shadow = ShadowBuild(sa_p)
+                            shadow.discard_staging()
+                            if shadow.previous_path.exists() and ask_confirm("Previous Build",
+                                    f"Also delete the previous build kept for rollback?\n{shadow.previous_path}"):
+                                shadow.discard_previous()
                             print("\n[SUCCESS] Cleanup and Restore complete.")
                             show_msg("Success", "Standalone folder cleaned and original settings restored.")
                         else:
@@ -851,6 +1050,24 @@ if __name__ == "__main__":
                         show_msg("Sync Error", f"Operation failed: {str(e)}")
 
             elif choice == '4':
+                # --- OPTION 4: ROLLBACK ---
+                shadow = ShadowBuild(sa_p)
+                if not shadow.previous_path.is_dir():
+                    show_msg("Rollback", f"No previous build found.\n\nA full build keeps the replaced build in:\n{shadow.previous_path}")
+                elif ask_confirm("Confirm Rollback",
+                        f"Swap the live Standalone with the previous build?\n\nLive: {sa_p}\nPrevious: {shadow.previous_path}\n\n"
+                        "Your saves and settings (_profile) stay live. Rolling back again undoes this."):
+                    try:
+                        shadow.rollback()
+                        show_msg("Success", "Rolled back to the previous build.")
+                    except Exception as e:
+                        print(f"[!] Rollback failed: {e}")
+                        show_msg("Rollback Failed", f"{e}\n\nClose the game and any program using the Standalone folder, then try again.")
+                input("\n>>> Press Enter to return to Main Menu...")
+
+            elif choice == '5':
+                if pending_removals():
+                    print("[*] Old files are still being deleted; the rest is removed on the next start.")
                 print("[!] Exiting...")
                 sys.exit(0)
             else:
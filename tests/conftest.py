@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The engines are imported flat from Scripts/, as standalone_build_deploy.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Scripts"))
+# Backups go to %LOCALAPPDATA%; keep the tests away from the real one
+os.environ.setdefault("LOCALAPPDATA", tempfile.mkdtemp(prefix="localappdata-"))
@@ -0,0 +1,79 @@
+import os
+import json
+import hashlib
+
+from scanner_engine import ScannerEngine
+from linker_executor import LinkerExecutor
+from verification_engine import VerificationEngine
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+def _deploy(mo2, game, out, sa, incremental=False):
+    if incremental:
+        os.replace(out / "mapping_manifest.ndjson", out / "previous_manifest.ndjson")
+        os.replace(out / "execution_report.json", out / "previous_execution_report.json")
+    scanner = ScannerEngine(str(mo2), "Default")
+    scanner.output_dir = out
+    scanner.output_manifest = out / "mapping_manifest.ndjson"
+    scanner.build_mapping()
+    linker = LinkerExecutor(sa, game)
+    linker.output_dir = out
+    linker.manifest_file = out / "mapping_manifest.ndjson"
+    linker.report_file = out / "execution_report.json"
+    kwargs = {}
+    if incremental:
+        kwargs = {"previous_manifest": out / "previous_manifest.ndjson",
+                  "previous_report": out / "previous_execution_report.json"}
+    linker.execute_mapping(vanilla_mode='copy', copy_hash='sha1', include_vanilla=True, **kwargs)
+    with open(linker.report_file) as f:
+        return json.load(f)
+
+def test_copies_are_hashed_and_verified(tmp_path):
+    mo2, game, out, sa = tmp_path / "MO2", tmp_path / "Game", tmp_path / "out", tmp_path / "SA"
+    for path in (out, sa):
+        path.mkdir(parents=True)
+    _write(game / "Data" / "Vanilla.esm", "vanilla")
+    _write(mo2 / "mods" / "A" / "a.esp", "a")
+    _write(mo2 / "profiles" / "Default" / "modlist.txt", "+A\n")
+
+    report = _deploy(mo2, game, out, sa)
+    vanilla = report["Data/Vanilla.esm"]
+    assert vanilla["method"] == "copy" and vanilla["hash_algo"] == "sha1"
+    assert vanilla["hash"] == hashlib.sha1(b"vanilla").hexdigest()
+
+    # Left alone by the next run: the recorded hash is kept
+    report = _deploy(mo2, game, out, sa, incremental=True)
+    assert report["Data/Vanilla.esm"]["hash"] == vanilla["hash"]
+
+    verifier = VerificationEngine()
+    verifier.verify_hashes(out / "execution_report.json", sa)
+    assert verifier.results["hash_mismatch"] == []
+
+    (sa / "Data" / "Vanilla.esm").write_text("damaged")
+    verifier = VerificationEngine()
+    verifier.verify_hashes(out / "execution_report.json", sa)
+    assert [m["file"] for m in verifier.results["hash_mismatch"]] == ["Data/Vanilla.esm"]
+
+def test_copy_reused_from_the_live_build_keeps_its_hash(tmp_path):
+    mo2, game, live, shadow = tmp_path / "MO2", tmp_path / "Game", tmp_path / "SA", tmp_path / "SA.staging"
+    _write(game / "Data" / "Vanilla.esm", "vanilla")
+    _write(mo2 / "mods" / "A" / "a.esp", "a")
+    _write(mo2 / "profiles" / "Default" / "modlist.txt", "+A\n")
+    for sa in (live, shadow):
+        (sa / "standalone_metadata").mkdir(parents=True)
+    live_report = _deploy(mo2, game, live / "standalone_metadata", live)
+    assert live_report["Data/Vanilla.esm"]["hash"] == hashlib.sha1(b"vanilla").hexdigest()
+
+    # Full shadow build: no previous report of its own, the copy is hardlinked from the live build
+    out = shadow / "standalone_metadata"
+    linker = LinkerExecutor(shadow, game)
+    linker.output_dir = out
+    linker.manifest_file = live / "standalone_metadata" / "mapping_manifest.ndjson"
+    linker.report_file = out / "execution_report.json"
+    linker.execute_mapping(vanilla_mode='copy', copy_hash='sha1', include_vanilla=True, reuse_from=live)
+    with open(linker.report_file) as f:
+        vanilla = json.load(f)["Data/Vanilla.esm"]
+    assert vanilla["reused"] and vanilla["method"] == "copy"
+    assert vanilla["hash"] == live_report["Data/Vanilla.esm"]["hash"] and vanilla["hash_algo"] == "sha1"
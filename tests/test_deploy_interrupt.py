@@ -0,0 +1,88 @@
+import os
+import time
+import signal
+import threading
+
+import pytest
+
+import linker_executor
+from copy_engine import CopyEngine
+from deploy_journal import DeployJournal, JOURNAL_FILENAME
+from linker_executor import LinkerExecutor
+from scanner_engine import ScannerEngine
+
+def _interrupt_main():
+    """Ctrl+C as the main thread gets it, while it waits for the workers."""
+    signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+    time.sleep(0.2)  # Let the main thread handle it before this worker goes on
+
+@pytest.mark.parametrize("interrupt_at", [2, 300])
+def test_copy_map_stops_and_yields_completed_items_on_interrupt(interrupt_at):
+    engine = CopyEngine(small_workers=2)
+    calls = []
+
+    def func(item):
+        calls.append(item)
+        if len(calls) == interrupt_at:
+            _interrupt_main()
+        time.sleep(0.001)
+        return item
+
+    yielded = []
+    with pytest.raises(KeyboardInterrupt):
+        for result in engine.map(func, [(1, i) for i in range(2560)]):
+            yielded.append(result)
+    # Queued tasks were dropped, and everything that ran was handed to the caller
+    assert len(calls) < interrupt_at + 2 * 64
+    assert sorted(yielded) == sorted(calls)
+
+def test_interrupted_deploy_is_journaled_and_resumed(tmp_path, monkeypatch):
+    mo2, game, out, sa = tmp_path / "MO2", tmp_path / "Game", tmp_path / "out", tmp_path / "SA"
+    for path in (game, out, sa):
+        path.mkdir(parents=True)
+    for i in range(20):
+        (mo2 / "mods" / "A" / "textures").mkdir(parents=True, exist_ok=True)
+        (mo2 / "mods" / "A" / "textures" / f"{i:02}.dds").write_text(str(i))
+    (mo2 / "profiles" / "Default").mkdir(parents=True)
+    (mo2 / "profiles" / "Default" / "modlist.txt").write_text("+A\n")
+    scanner = ScannerEngine(str(mo2), "Default")
+    scanner.output_dir = out
+    scanner.output_manifest = out / "mapping_manifest.ndjson"
+    scanner.build_mapping()
+
+    def linker():
+        executor = LinkerExecutor(sa, game)
+        executor.output_dir = out
+        executor.manifest_file = out / "mapping_manifest.ndjson"
+        executor.report_file = out / "execution_report.json"
+        return executor
+
+    deployed = []
+    original = LinkerExecutor._deploy_one
+
+    def deploy_one(self, item, skip_unchanged=True):
+        result = original(self, item, skip_unchanged)
+        deployed.append(os.path.relpath(item[1], sa).replace(os.sep, "/"))
+        if len(deployed) == 5 and interrupt:
+            _interrupt_main()
+        return result
+
+    monkeypatch.setattr(linker_executor, "DEPLOY_BATCH_SIZE", 2)
+    monkeypatch.setattr(LinkerExecutor, "_deploy_one", deploy_one)
+    interrupt = True
+    with pytest.raises(KeyboardInterrupt):
+        linker().execute_mapping(workers=1)
+    # Queued batches were dropped; every operation that completed is in the journal
+    journaled = set(DeployJournal(out / JOURNAL_FILENAME, sa).load())
+    assert journaled == set(deployed) and len(journaled) == 5
+    assert not (out / "execution_report.json").exists()
+
+    deployed.clear()
+    interrupt = False
+    executor = linker()
+    executor.execute_mapping(workers=1, resume=True)
+    everything = {f"Data/textures/{i:02}.dds" for i in range(20)}
+    assert set(deployed) == everything - journaled
+    assert executor.failed_count == 0
+    assert all((sa / target).exists() for target in everything)
+    assert not (out / JOURNAL_FILENAME).exists()
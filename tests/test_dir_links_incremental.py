@@ -0,0 +1,56 @@
+import os
+import json
+from pathlib import Path
+
+from scanner_engine import ScannerEngine
+from linker_executor import LinkerExecutor
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+def _scan_and_deploy(mo2, game, out, sa, incremental=False):
+    if incremental:
+        os.replace(out / "mapping_manifest.ndjson", out / "previous_manifest.ndjson")
+        os.replace(out / "execution_report.json", out / "previous_execution_report.json")
+    scanner = ScannerEngine(str(mo2), "Default")
+    scanner.output_dir = out
+    scanner.output_manifest = out / "mapping_manifest.ndjson"
+    scanner.build_mapping(workers=2, dir_links=True)
+    linker = LinkerExecutor(sa, game)
+    linker.output_dir = out
+    linker.manifest_file = out / "mapping_manifest.ndjson"
+    linker.report_file = out / "execution_report.json"
+    kwargs = {}
+    if incremental:
+        kwargs = {"previous_manifest": out / "previous_manifest.ndjson",
+                  "previous_report": out / "previous_execution_report.json"}
+    linker.execute_mapping(dir_links=True, **kwargs)
+    with open(linker.report_file) as f:
+        return json.load(f)
+
+def test_folder_going_from_single_mod_to_multi_mod(tmp_path):
+    mo2, game, out, sa = tmp_path / "MO2", tmp_path / "Game", tmp_path / "out", tmp_path / "SA"
+    for path in (game / "Data", out, sa):
+        path.mkdir(parents=True)
+    _write(mo2 / "mods" / "Z" / "textures" / "big" / "a.dds", "a")
+    _write(mo2 / "mods" / "Z" / "textures" / "big" / "b.dds", "b")
+    _write(mo2 / "mods" / "Y" / "meshes" / "y.nif", "y")
+    _write(mo2 / "profiles" / "Default" / "modlist.txt", "+Y\n+Z\n")
+
+    report = _scan_and_deploy(mo2, game, out, sa)
+    assert report["Data/textures/big/a.dds"]["method"] == "dirlink"
+    assert os.path.islink(sa / "Data" / "textures" / "big")
+
+    # Y now adds a file to the folder: it has two providers and cannot stay a directory link
+    _write(mo2 / "mods" / "Y" / "textures" / "big" / "c.dds", "c")
+    report = _scan_and_deploy(mo2, game, out, sa, incremental=True)
+
+    big = sa / "Data" / "textures" / "big"
+    assert not os.path.islink(big)
+    for name in ("a.dds", "b.dds", "c.dds"):
+        assert report[f"Data/textures/big/{name}"]["status"] == "SUCCESS"
+        assert report[f"Data/textures/big/{name}"]["method"] not in ("dirlink", "unchanged")
+        assert (big / name).is_file(), name
+    # The mod's own folder was never touched through the old link
+    assert sorted(os.listdir(mo2 / "mods" / "Z" / "textures" / "big")) == ["a.dds", "b.dds"]
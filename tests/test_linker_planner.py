@@ -0,0 +1,58 @@
+from manifest_model import CompactManifest, ManifestEntry
+from linker_executor import LinkerExecutor
+
+def _manifest(files):
+    """files: {target: (mod, size, mtime)}; sources are '<mod>/<file name>' below /mods."""
+    manifest = CompactManifest()
+    for target, (mod, size, mtime) in files.items():
+        index = manifest.intern_mod(mod, f"/mods/{mod}")
+        manifest.entries[target] = ManifestEntry(index, target.rsplit("/", 1)[-1], False, size, 1, 1, mtime)
+    return manifest
+
+def _ok(method="hardlink"):
+    return {"status": "SUCCESS", "method": method}
+
+def _todo_targets(plan):
+    return [plan["planned"][index][0] for index, _ in plan["todo"]]
+
+def test_incremental_plan_keeps_only_unchanged_successes(tmp_path):
+    linker = LinkerExecutor(tmp_path / "SA", tmp_path / "Game")
+    previous = _manifest({"Data/a.esp": ("A", 1, 10), "Data/b.esp": ("A", 1, 10), "Data/f.esp": ("A", 1, 10),
+                          "Data/big/d.dds": ("B", 1, 10), "Data/gone.esp": ("A", 1, 10)})
+    manifest = _manifest({"Data/a.esp": ("A", 1, 10), "Data/b.esp": ("A", 1, 11), "Data/f.esp": ("A", 1, 10),
+                          "Data/big/d.dds": ("B", 1, 10), "Data/c.esp": ("A", 1, 10)})
+    results = {"Data/a.esp": _ok(), "Data/b.esp": _ok(), "Data/f.esp": {"status": "FAILED"},
+               "Data/big/d.dds": _ok("dirlink"), "Data/gone.esp": _ok()}
+
+    plan = linker._plan_targets(manifest, previous=previous, previous_results=results)
+    assert [plan["planned"][index][0] for index in plan["kept"]] == ["Data/a.esp"]
+    # Changed source, failed last time, provided by a directory link last time, new
+    assert _todo_targets(plan) == ["Data/b.esp", "Data/f.esp", "Data/big/d.dds", "Data/c.esp"]
+    assert dict(plan["todo"])[1] == "/mods/A/b.esp"
+    assert linker._stale_targets(previous, manifest) == ["Data/gone.esp"]
+
+def test_plan_without_previous_build_deploys_everything(tmp_path):
+    linker = LinkerExecutor(tmp_path / "SA", tmp_path / "Game")
+    manifest = _manifest({"Data/a.esp": ("A", 1, 10)})
+    plan = linker._plan_targets(manifest, previous_results={"Data/a.esp": _ok()})
+    assert plan["kept"] == set() and _todo_targets(plan) == ["Data/a.esp"]
+
+def test_plan_of_links_vanilla_and_resumed_targets(tmp_path):
+    sa = tmp_path / "SA"
+    (sa / "Data").mkdir(parents=True)
+    (sa / "Data" / "r.esp").write_text("r")
+    linker = LinkerExecutor(sa, tmp_path / "Game")
+    previous = _manifest({"Data/big/x.dds": ("B", 1, 10), "Data/big/old.dds": ("B", 1, 10)})
+    manifest = _manifest({"Data/big/x.dds": ("B", 1, 10), "Data/r.esp": ("A", 1, 10), "Data/s.esp": ("A", 1, 10)})
+    vanilla = [("Data/Skyrim.esm", ManifestEntry(-1, "/game/Data/Skyrim.esm", False, 5, 2, 2, 20))]
+    linked = {"data/big": "Data/big"}
+    journaled = {"Data/r.esp": ("/mods/A/r.esp", 1, 10, "hardlink", None),
+                 "Data/s.esp": ("/mods/A/other.esp", 1, 10, "hardlink", None)}
+
+    plan = linker._plan_targets(manifest, vanilla, linked, journaled=journaled)
+    assert plan["dirlinked"] == {0: "Data/big"}
+    assert plan["resumed"] == {1: ("hardlink", None)}
+    # Journaled from another source: deployed again; vanilla files come after the manifest
+    assert plan["todo"] == [(2, "/mods/A/s.esp"), (3, "/game/Data/Skyrim.esm")]
+    # A target inside a directory link belongs to the mod: never deleted as stale
+    assert linker._stale_targets(previous, manifest, linked) == []
@@ -0,0 +1,18 @@
+import os
+
+from manifest_io import MANIFEST_FILENAME, find_manifest, write_manifest, iter_manifest
+
+def test_find_manifest_prefers_newer_or_only_gzip(tmp_path):
+    plain = tmp_path / MANIFEST_FILENAME
+    compressed = tmp_path / (MANIFEST_FILENAME + ".gz")
+    assert find_manifest(tmp_path) == plain
+
+    write_manifest(compressed, [("Data/a.esp", {"mod": "A"})], count=1)
+    assert find_manifest(tmp_path) == compressed
+    assert [target for target, _ in iter_manifest(find_manifest(tmp_path))] == ["Data/a.esp"]
+
+    write_manifest(plain, [], count=0)
+    os.utime(compressed, ns=(1, 1))
+    assert find_manifest(tmp_path) == plain
+    os.utime(plain, ns=(0, 0))
+    assert find_manifest(tmp_path) == compressed
@@ -0,0 +1,64 @@
+import os
+import shutil
+
+from manifest_model import CompactManifest, ManifestEntry
+from scanner_engine import ScannerEngine
+from linker_executor import LinkerExecutor
+
+def _scan(mo2, out):
+    scanner = ScannerEngine(str(mo2), "Default")
+    scanner.output_dir = out
+    scanner.output_manifest = out / "mapping_manifest.ndjson"
+    scanner.build_mapping(workers=2, use_cache=True)
+    return CompactManifest.load(scanner.output_manifest)
+
+def test_manifest_lists_mods_taken_from_the_scan_cache(tmp_path):
+    mo2, out = tmp_path / "MO2", tmp_path / "out"
+    (mo2 / "mods" / "A").mkdir(parents=True)
+    (mo2 / "mods" / "A" / "a.esp").write_text("a")
+    (mo2 / "profiles" / "Default").mkdir(parents=True)
+    (mo2 / "profiles" / "Default" / "modlist.txt").write_text("+A\n")
+    out.mkdir()
+
+    assert _scan(mo2, out).cached_mods == set()
+    assert _scan(mo2, out).cached_mods == {"A"}
+
+def test_copy_of_a_cached_mod_is_checked_against_the_real_source(tmp_path):
+    source, target = tmp_path / "a.esp", tmp_path / "SA" / "a.esp"
+    source.write_text("old")
+    target.parent.mkdir()
+    shutil.copy2(source, target)
+    st = source.stat()
+    entry = ManifestEntry(0, "a.esp", False, st.st_size, st.st_ino, st.st_dev, st.st_mtime_ns)
+
+    # Edited in place (same size) after the scan cache recorded it
+    source.write_text("new")
+    os.utime(source, ns=(st.st_mtime_ns + 10**9, st.st_mtime_ns + 10**9))
+
+    linker = LinkerExecutor(tmp_path / "SA", tmp_path / "Game")
+    assert linker._is_in_place(str(target), str(source), "copy", entry)
+    linker.cached_mods = {0}
+    assert not linker._is_in_place(str(target), str(source), "copy", entry)
+    shutil.copy2(source, target)
+    assert linker._is_in_place(str(target), str(source), "copy", entry)
+
+def test_reresolve_rescans_a_mod_that_changed_since_the_last_scan(tmp_path):
+    mo2, out = tmp_path / "MO2", tmp_path / "out"
+    for mod_name in ("A", "B"):
+        (mo2 / "mods" / mod_name).mkdir(parents=True)
+        (mo2 / "mods" / mod_name / f"{mod_name}.esp").write_text(mod_name)
+    (mo2 / "profiles" / "Default").mkdir(parents=True)
+    (mo2 / "profiles" / "Default" / "modlist.txt").write_text("+B\n+A\n")
+    out.mkdir()
+    _scan(mo2, out)
+
+    (mo2 / "mods" / "A" / "new.esp").write_text("new")
+    scanner = ScannerEngine(str(mo2), "Default")
+    scanner.output_dir = out
+    scanner.output_manifest = out / "mapping_manifest.ndjson"
+    scanner.build_fingerprint()
+    scanner.build_mapping(reresolve=True)
+    manifest = CompactManifest.load(scanner.output_manifest)
+    assert "Data/new.esp" in manifest.entries
+    # Only the changed mod was rescanned
+    assert manifest.cached_mods == {"B"}
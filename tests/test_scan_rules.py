@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from scan_rules import ScanRules
+from scanner_engine import ScannerEngine
+
+# The example of the scan_rules docstring
+EXAMPLE_RULES = [
+    {"name": "mo2-metadata", "action": "exclude", "files": ["meta.ini"]},
+    {"name": "keep-esp-docs", "action": "include", "globs": ["docs/*.esp"]},
+    {"name": "documentation", "action": "exclude", "dirs": ["docs"], "extensions": [".pdf"]},
+]
+
+def _write(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+def _deployed(tmp_path, rules, files):
+    mod = tmp_path / "MO2" / "mods" / "M"
+    for rel_path in files:
+        _write(mod / rel_path)
+    (tmp_path / "MO2" / "profiles" / "Default").mkdir(parents=True)
+    scanner = ScannerEngine(str(tmp_path / "MO2"), "Default")
+    scanner.scan_rules = ScanRules(rules)
+    excluded = {}
+    deployed = {rel_source for _, _, rel_source, _ in scanner._iter_files(mod, "M", [], excluded)}
+    return deployed, excluded
+
+def test_include_glob_reaches_into_excluded_folder(tmp_path):
+    deployed, excluded = _deployed(tmp_path, EXAMPLE_RULES, [
+        "docs/keep.esp", "docs/manual.txt", "docs/sub/other.esp", "docs/guide.pdf", "plugin.esp", "meta.ini"])
+    # fnmatch's '*' also matches '/', so the glob reaches sub-folders too
+    assert deployed == {"docs/keep.esp", "docs/sub/other.esp", "plugin.esp"}
+    # The folder was walked, so its other files are excluded (and counted) one by one
+    assert excluded["documentation"] == [2, 0, 0]
+    assert excluded["mo2-metadata"][0] == 1
+
+def test_excluded_folder_is_skipped_when_no_include_reaches_it(tmp_path):
+    rules = EXAMPLE_RULES[:1] + [{"name": "keep-esp-textures", "action": "include", "globs": ["textures/*.esp"]}] + EXAMPLE_RULES[2:]
+    deployed, excluded = _deployed(tmp_path, rules, ["docs/keep.esp", "docs/manual.txt", "textures/a.esp"])
+    assert deployed == {"textures/a.esp"}
+    assert excluded["documentation"] == [0, 0, 1]
+
+def test_include_after_the_exclude_does_not_matter(tmp_path):
+    rules = [EXAMPLE_RULES[2], EXAMPLE_RULES[1]]
+    deployed, excluded = _deployed(tmp_path, rules, ["docs/keep.esp"])
+    assert deployed == set()
+    assert excluded["documentation"] == [0, 0, 1]
@@ -0,0 +1,43 @@
+from snapshot_backup import SnapshotStore, SNAPSHOT_KEEP
+from cleaner_engine import CleanerEngine
+
+def test_first_appdata_snapshot_is_pinned_and_restored(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "local"))
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    appdata = tmp_path / "appdata"
+    appdata.mkdir()
+    (appdata / "plugins.txt").write_text("original")
+
+    cleaner = CleanerEngine(tmp_path / "SA", tmp_path / "MO2", appdata_name="Game", game_name="G")
+    store = SnapshotStore(cleaner.backup_root)
+    first, _ = store.create([("AppData", appdata, None)], pin=("AppData",))
+    # Later backups see what earlier builds injected
+    for run in range(SNAPSHOT_KEEP + 2):
+        (appdata / "plugins.txt").write_text(f"injected {run}")
+        store.create([("AppData", appdata, None)], pin=("AppData",))
+
+    snapshots = store.snapshots()
+    assert first in snapshots
+    assert len(snapshots) == SNAPSHOT_KEEP + 1
+    assert store.pinned("AppData") == first
+
+    cleaner.win_appdata.mkdir(parents=True)
+    (cleaner.win_appdata / "plugins.txt").write_text("deployed by the tool")
+    (cleaner.win_appdata / "loadorder.txt").write_text("deployed by the tool")
+    cleaner.restore_profiles()
+    assert (cleaner.win_appdata / "plugins.txt").read_text() == "original"
+    assert not (cleaner.win_appdata / "loadorder.txt").exists()
+
+def test_unchanged_files_are_linked_from_the_previous_snapshot(tmp_path):
+    saves = tmp_path / "Saves"
+    saves.mkdir()
+    (saves / "a.ess").write_text("a")
+    (saves / "b.ess").write_text("b")
+    store = SnapshotStore(tmp_path / "backups")
+    first, stats = store.create([("Saves", saves, None)])
+    assert stats["Saves"] == (0, 2)
+    (saves / "b.ess").write_text("bb")
+    second, stats = store.create([("Saves", saves, None)])
+    assert stats["Saves"] == (1, 1)
+    assert (first / "Saves" / "a.ess").stat().st_ino == (second / "Saves" / "a.ess").stat().st_ino
+    assert (second / "Saves" / "b.ess").read_text() == "bb"
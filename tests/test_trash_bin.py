@@ -0,0 +1,25 @@
+import threading
+
+import trash_bin
+from shadow_build import GENERATION_SUFFIXES
+
+def _join_removers():
+    for thread in threading.enumerate():
+        if thread.name.startswith("trash-remover"):
+            thread.join()
+
+def test_sweep_trash_only_takes_the_folders_own_trash(tmp_path):
+    sa = tmp_path / "Game"
+    sa.mkdir()
+    own = [trash_bin.trash_path_for(sa), tmp_path / "Game.staging.trash-1", tmp_path / "Game.previous.trash-2",
+           tmp_path / "Game.trash.trash-3"]
+    foreign = [tmp_path / "Game.v2.trash-4", tmp_path / "Game2.trash-5", tmp_path / "Game.v2.staging.trash-6"]
+    for path in own + foreign:
+        (path / "sub").mkdir(parents=True)
+        (path / "sub" / "file").write_text("x")
+
+    assert trash_bin.sweep_trash(sa, GENERATION_SUFFIXES) == len(own)
+    _join_removers()
+    assert not any(path.exists() for path in own)
+    assert all((path / "sub" / "file").exists() for path in foreign)
+    assert sa.is_dir()